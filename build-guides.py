@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Build the Driveby Africa guide PDFs into public/guides."""
+
+import argparse
+import os
+import sys
+
+import guidelib
+from guidelib.build import add_build_arguments, build_argv, build_options, cover_name
+from guidelib.compact import compact_name
+from guidelib.draft import draft_name
+from guidelib.html import html_path, write_html
+from guidelib.knowledge import knowledge_path
+from guidelib.lint import check as dry_run
+from guidelib.mobile import mobile_name
+from guidelib.publish import publish
+from guidelib.reproducible import check
+from guidelib.search import search_path
+from guidelib.sections import sections_dir
+from guidelib.thumbnails import thumbnails_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('guides', nargs='*', help='guide scripts to build (default: all six)')
+    parser.add_argument('--out', default=guidelib.OUTPUT_DIR, help='output directory')
+    parser.add_argument('--cover', action='store_true',
+                        help='also write each cover alone as <guide>-cover.pdf')
+    parser.add_argument('--publish', action='store_true',
+                        help='write only changed guides, with .br/.gz variants and manifest.json')
+    parser.add_argument('--check-reproducible', action='store_true',
+                        help='build each guide twice in separate processes and compare the bytes')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='lay each guide out without writing it and report overflowing cells')
+    parser.add_argument('--verbose', action='store_true',
+                        help='report how many paragraph fragments the guides shared')
+    add_build_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.draft and args.publish:
+        parser.error('drafts are previews, they are not published')
+
+    if args.check_reproducible:
+        differing = check(args.guides or guidelib.GUIDE_SCRIPTS, build_argv(args))
+        return 1 if differing else 0
+    if args.dry_run:
+        return 1 if dry_run(args.guides or guidelib.GUIDE_SCRIPTS) else 0
+
+    os.makedirs(args.out, exist_ok=True)
+    builds = {}
+    for script in args.guides or guidelib.GUIDE_SCRIPTS:
+        guide = guidelib.load_guide(script)
+        options = build_options(args)
+        if args.sections:
+            options['sections'] = sections_dir(args.out, guide.OUTPUT_NAME)
+        if args.search:
+            options['search'] = search_path(args.out, guide.OUTPUT_NAME)
+        if args.knowledge:
+            options['knowledge'] = knowledge_path(args.out, guide.OUTPUT_NAME)
+        if args.mobile:
+            options['mobile'] = os.path.join(args.out, mobile_name(guide.OUTPUT_NAME))
+        if args.compact:
+            options['compact'] = os.path.join(args.out, compact_name(guide.OUTPUT_NAME))
+        if args.thumbnails:
+            options['thumbnails'] = thumbnails_dir(args.out, guide.OUTPUT_NAME)
+        if args.publish:
+            # kept in memory: unchanged guides are not rewritten
+            builds[guide.OUTPUT_NAME] = guidelib.render_bytes(guide, **options)
+        else:
+            name = draft_name(guide.OUTPUT_NAME) if args.draft else guide.OUTPUT_NAME
+            guide.build_guide(os.path.join(args.out, name), **options)
+        if args.html:
+            write_html(html_path(args.out, guide.OUTPUT_NAME), guide)
+        if args.cover:
+            guide.COVER.render(os.path.join(args.out, cover_name(guide.OUTPUT_NAME)))
+    if args.publish:
+        for name, changes in publish(args.out, builds).items():
+            print('%s: %s' % (name, 'unchanged, skipped' if changes is None else '; '.join(changes)))
+    if args.verbose:
+        print(guidelib.FRAGMENTS.stats(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
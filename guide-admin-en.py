@@ -1,24 +1,30 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Admin Guide PDF - English Version."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 
-MANDARIN = HexColor('#E85D04')
-COD_GRAY = HexColor('#1a1a1a')
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
+
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Admin-Driveby-Africa-EN.pdf'
+LANGUAGE = 'en'
 
 styles = {
     'h1': ParagraphStyle('h1', fontName='Helvetica-Bold', fontSize=22, textColor=MANDARIN, spaceBefore=20, spaceAfter=12, leading=28),
@@ -44,20 +50,11 @@ def make_tip_box(text, box_type='tip'):
     else:
         bg, border, icon = HexColor('#E3F2FD'), HexColor('#2196F3'), 'INFO'
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
-    data = [[Paragraph(f'<b>{icon}:</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, -1), bg), ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14), ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10), ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4])]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon}:</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (0, 0), MANDARIN), ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'), ('ROUNDEDCORNERS', [12, 12, 12, 12])]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
     content = [Paragraph(title, styles['step_title'])]
     if description:
         content.append(Paragraph(description, styles['step_desc']))
@@ -87,66 +84,34 @@ def make_table(header, rows, col_widths=None):
     return t
 
 
+COVER = guidelib.CoverPage(
+    'Administrator Guide',
+    ('Platform Management', 'and Full Administration'),
+    version='Version 2.0 - February 2026',
+    notice='Internal document - For Driveby Africa administrators only',
+)
+
+
 def draw_cover(c, doc):
-    c.saveState()
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 30)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, 'Administrator Guide')
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont('Helvetica', 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, 'Platform Management')
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, 'and Full Administration')
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
-    c.setFillColor(HexColor('#888888'))
-    c.setFont('Helvetica', 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, 'Version 2.0 - February 2026')
-    c.setFillColor(HexColor('#666666'))
-    c.setFont('Helvetica', 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, 'Internal document - For Driveby Africa administrators only')
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
-    c.restoreState()
+    COVER.draw(c, doc)
+
+
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - Administrator Guide',
+    'Confidential document',
+)
 
 
 def header_footer(c, doc):
-    c.saveState()
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - Administrator Guide')
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, 1 * cm, 'Confidential document')
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'Page {doc.page}')
-    c.restoreState()
+    CHROME.draw(c, f'Page {doc.page}', doc)
 
 
 def bullet(text):
     return Paragraph(f'&bull; {text}', ParagraphStyle('list', parent=styles['body'], leftIndent=15))
 
 
-def build_guide():
-    output_path = '/Users/user/Downloads/drivebyafrica-main/public/guides/Guide-Admin-Driveby-Africa-EN.pdf'
-    doc = SimpleDocTemplate(output_path, pagesize=A4, topMargin=2.2 * cm, bottomMargin=2 * cm, leftMargin=2 * cm, rightMargin=2 * cm)
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     story.append(Spacer(1, 1))
@@ -155,34 +120,12 @@ def build_guide():
     # TOC
     story.append(Paragraph('Table of Contents', styles['h1']))
     story.append(Spacer(1, 8))
-    toc = [
-        ('1.', 'Login and Roles'),
-        ('2.', 'Dashboard and KPIs'),
-        ('3.', 'Vehicle Management'),
-        ('4.', 'Source Synchronization'),
-        ('5.', 'Order Management'),
-        ('6.', 'Quote Management'),
-        ('7.', 'Vehicle Reassignment'),
-        ('8.', 'User Management'),
-        ('9.', 'Shipping Routes and Costs'),
-        ('10.', 'Shipping Partners (Freight Forwarders)'),
-        ('11.', 'Currency Management'),
-        ('12.', 'Vehicle Batches'),
-        ('13.', 'Notifications and Messages'),
-        ('14.', 'Platform Settings'),
-        ('15.', 'Analytics and Profits'),
-    ]
-    for num, title in toc:
-        data = [[Paragraph(f'<b>{num}</b>', ParagraphStyle('n', parent=styles['toc_item'], textColor=MANDARIN)),
-                 Paragraph(title, styles['toc_item'])]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'MIDDLE'), ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2), ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE'))]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
     story.append(PageBreak())
 
     # S1
-    story.append(Paragraph('1. Login and Roles', styles['h1']))
+    story.append(Paragraph('<a name="login-and-roles"/>1. Login and Roles', styles['h1']))
     story.append(Paragraph("The admin portal is accessible at <b>/admin/login</b>. Only users with the <b>admin</b> or <b>super_admin</b> role can access it.", styles['body']))
     story.append(Spacer(1, 6))
     story.append(Paragraph('Available Roles', styles['h2']))
@@ -196,7 +139,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S2
-    story.append(Paragraph('2. Dashboard and KPIs', styles['h1']))
+    story.append(Paragraph('<a name="dashboard"/>2. Dashboard and KPIs', styles['h1']))
     story.append(Paragraph("The dashboard displays real-time key performance indicators for the platform.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Main Indicators', styles['h2']))
@@ -220,7 +163,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S3
-    story.append(Paragraph('3. Vehicle Management', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-management"/>3. Vehicle Management', styles['h1']))
     story.append(Paragraph("The Vehicles section has three tabs: <b>Statistics</b>, <b>Vehicles</b> and <b>Synchronization</b>.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Statistics', styles['h2']))
@@ -240,7 +183,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S4
-    story.append(Paragraph('4. Source Synchronization', styles['h1']))
+    story.append(Paragraph('<a name="source-sync"/>4. Source Synchronization', styles['h1']))
     story.append(Paragraph("The Sync tab imports vehicles from external APIs: <b>Encar</b> (Korea), <b>CHE168/Dongchedi</b> (China), <b>Dubicars</b> (Dubai).", styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['Mode', 'Description', 'Usage'],
@@ -257,7 +200,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S5
-    story.append(Paragraph('5. Order Management', styles['h1']))
+    story.append(Paragraph('<a name="order-management"/>5. Order Management', styles['h1']))
     story.append(Paragraph("Order management follows a 14-step workflow (same as collaborator guide). Admins have additional capabilities.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Summary Cards', styles['h2']))
@@ -276,7 +219,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S6
-    story.append(Paragraph('6. Quote Management', styles['h1']))
+    story.append(Paragraph('<a name="quote-management"/>6. Quote Management', styles['h1']))
     story.append(Paragraph("The Quotes page displays the complete pipeline with real-time statistics.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Quote Pipeline', styles['h2']))
@@ -297,7 +240,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S7
-    story.append(Paragraph('7. Vehicle Reassignment', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-reassignment"/>7. Vehicle Reassignment', styles['h1']))
     story.append(Paragraph("When a vehicle is no longer available (sold, unavailable, priority conflict), you can reassign the quote to a similar vehicle.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_numbered_step(1, 'Select the reason', 'Sold, unavailable, priority conflict, price change, other.'))
@@ -308,7 +251,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S8
-    story.append(Paragraph('8. User Management', styles['h1']))
+    story.append(Paragraph('<a name="user-management"/>8. User Management', styles['h1']))
     story.append(Paragraph("The Users page displays all accounts with their statistics.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Displayed Information', styles['h2']))
@@ -326,7 +269,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S9
-    story.append(Paragraph('9. Shipping Routes and Costs', styles['h1']))
+    story.append(Paragraph('<a name="shipping-routes"/>9. Shipping Routes and Costs', styles['h1']))
     story.append(Paragraph("The Shipping section manages 65+ African destinations and their shipping costs.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Route Management', styles['h2']))
@@ -342,7 +285,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S10
-    story.append(Paragraph('10. Shipping Partners', styles['h1']))
+    story.append(Paragraph('<a name="shipping-partners"/>10. Shipping Partners', styles['h1']))
     story.append(Paragraph("The Freight Forwarders page manages logistics partners.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['Field', 'Description'],
@@ -360,7 +303,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S11
-    story.append(Paragraph('11. Currency Management', styles['h1']))
+    story.append(Paragraph('<a name="currency-management"/>11. Currency Management', styles['h1']))
     story.append(Paragraph("The Currencies page configures exchange rates and active currencies.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(bullet('<b>Exchange rates</b>: edit rate relative to USD'))
@@ -373,7 +316,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S12
-    story.append(Paragraph('12. Vehicle Batches', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-batches"/>12. Vehicle Batches', styles['h1']))
     story.append(Paragraph("The Batches section manages batch submissions from collaborators.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Validation Workflow', styles['h2']))
@@ -388,7 +331,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S13
-    story.append(Paragraph('13. Notifications and Messages', styles['h1']))
+    story.append(Paragraph('<a name="notifications"/>13. Notifications and Messages', styles['h1']))
     story.append(Spacer(1, 6))
     story.append(Paragraph('Notifications', styles['h2']))
     story.append(Paragraph("The Notifications panel centralizes all platform events.", styles['body']))
@@ -407,7 +350,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S14
-    story.append(Paragraph('14. Platform Settings', styles['h1']))
+    story.append(Paragraph('<a name="platform-settings"/>14. Platform Settings', styles['h1']))
     story.append(Paragraph("The Settings page configures the platform.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['Category', 'Options'],
@@ -420,7 +363,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S15
-    story.append(Paragraph('15. Analytics and Profits', styles['h1']))
+    story.append(Paragraph('<a name="analytics"/>15. Analytics and Profits', styles['h1']))
     story.append(Paragraph("The Analytics page offers a detailed view of profitability and performance.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('Profit Analysis', styles['h2']))
@@ -449,9 +392,22 @@ def build_guide():
         ('ROUNDEDCORNERS', [6, 6, 6, 6])]))
     story.append(t)
 
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
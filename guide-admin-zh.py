@@ -1,29 +1,35 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Admin Guide PDF - Chinese Version."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
+
 pdfmetrics.registerFont(UnicodeCIDFont('STSong-Light'))
 CJK = 'STSong-Light'
 
-MANDARIN = HexColor('#E85D04')
-COD_GRAY = HexColor('#1a1a1a')
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Admin-Driveby-Africa-ZH.pdf'
+LANGUAGE = 'zh'
 
 styles = {
     'h1': ParagraphStyle('h1', fontName=CJK, fontSize=22, textColor=MANDARIN, spaceBefore=20, spaceAfter=12, leading=30),
@@ -49,20 +55,11 @@ def make_tip_box(text, box_type='tip'):
     else:
         bg, border, icon = HexColor('#E3F2FD'), HexColor('#2196F3'), '\u4fe1\u606f'
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
-    data = [[Paragraph(f'<b>{icon}\uff1a</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, -1), bg), ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14), ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10), ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4])]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon}\uff1a</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (0, 0), MANDARIN), ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'), ('ROUNDEDCORNERS', [12, 12, 12, 12])]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
     content = [Paragraph(title, styles['step_title'])]
     if description:
         content.append(Paragraph(description, styles['step_desc']))
@@ -91,66 +88,38 @@ def make_table(header, rows, col_widths=None):
     return t
 
 
+COVER = guidelib.CoverPage(
+    '\u7ba1\u7406\u5458\u6307\u5357',
+    ('\u5e73\u53f0\u7ba1\u7406', '\u4e0e\u5168\u9762\u7ba1\u7406'),
+    version='\u7248\u672c 2.0 - 2026\u5e742\u6708',
+    notice='\u5185\u90e8\u6587\u4ef6 - \u4ec5\u4f9b Driveby Africa \u7ba1\u7406\u5458\u4f7f\u7528',
+    font=CJK,
+    title_font=CJK,
+    title_size=28,
+)
+
+
 def draw_cover(c, doc):
-    c.saveState()
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-    c.setFillColor(white)
-    c.setFont(CJK, 28)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, '\u7ba1\u7406\u5458\u6307\u5357')
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont(CJK, 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, '\u5e73\u53f0\u7ba1\u7406')
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, '\u4e0e\u5168\u9762\u7ba1\u7406')
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
-    c.setFillColor(HexColor('#888888'))
-    c.setFont(CJK, 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, '\u7248\u672c 2.0 - 2026\u5e742\u6708')
-    c.setFillColor(HexColor('#666666'))
-    c.setFont(CJK, 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, '\u5185\u90e8\u6587\u4ef6 - \u4ec5\u4f9b Driveby Africa \u7ba1\u7406\u5458\u4f7f\u7528')
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
-    c.restoreState()
+    COVER.draw(c, doc)
+
+
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - \u7ba1\u7406\u5458\u6307\u5357',
+    '\u673a\u5bc6\u6587\u4ef6',
+    font=CJK,
+)
 
 
 def header_footer(c, doc):
-    c.saveState()
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont(CJK, 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - \u7ba1\u7406\u5458\u6307\u5357')
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont(CJK, 8)
-    c.drawString(2 * cm, 1 * cm, '\u673a\u5bc6\u6587\u4ef6')
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'\u7b2c {doc.page} \u9875')
-    c.restoreState()
+    CHROME.draw(c, f'\u7b2c {doc.page} \u9875', doc)
 
 
 def bullet(text):
     return Paragraph(f'\u2022 {text}', ParagraphStyle('list', parent=styles['body'], leftIndent=15))
 
 
-def build_guide():
-    output_path = '/Users/user/Downloads/drivebyafrica-main/public/guides/Guide-Admin-Driveby-Africa-ZH.pdf'
-    doc = SimpleDocTemplate(output_path, pagesize=A4, topMargin=2.2 * cm, bottomMargin=2 * cm, leftMargin=2 * cm, rightMargin=2 * cm)
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     story.append(Spacer(1, 1))
@@ -159,34 +128,12 @@ def build_guide():
     # TOC
     story.append(Paragraph('\u76ee\u5f55', styles['h1']))
     story.append(Spacer(1, 8))
-    toc = [
-        ('1.', '\u767b\u5f55\u548c\u89d2\u8272'),
-        ('2.', '\u4eea\u8868\u677f\u548cKPI'),
-        ('3.', '\u8f66\u8f86\u7ba1\u7406'),
-        ('4.', '\u6e90\u540c\u6b65'),
-        ('5.', '\u8ba2\u5355\u7ba1\u7406'),
-        ('6.', '\u62a5\u4ef7\u7ba1\u7406'),
-        ('7.', '\u8f66\u8f86\u91cd\u65b0\u5206\u914d'),
-        ('8.', '\u7528\u6237\u7ba1\u7406'),
-        ('9.', '\u8fd0\u8f93\u8def\u7ebf\u548c\u8d39\u7528'),
-        ('10.', '\u8fd0\u8f93\u5408\u4f5c\u4f19\u4f34\uff08\u8d27\u8fd0\u4ee3\u7406\uff09'),
-        ('11.', '\u8d27\u5e01\u7ba1\u7406'),
-        ('12.', '\u8f66\u8f86\u6279\u6b21'),
-        ('13.', '\u901a\u77e5\u548c\u6d88\u606f'),
-        ('14.', '\u5e73\u53f0\u8bbe\u7f6e'),
-        ('15.', '\u5206\u6790\u548c\u5229\u6da6'),
-    ]
-    for num, title in toc:
-        data = [[Paragraph(f'<b>{num}</b>', ParagraphStyle('n', parent=styles['toc_item'], textColor=MANDARIN)),
-                 Paragraph(title, styles['toc_item'])]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'MIDDLE'), ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2), ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE'))]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
     story.append(PageBreak())
 
     # S1
-    story.append(Paragraph('1. \u767b\u5f55\u548c\u89d2\u8272', styles['h1']))
+    story.append(Paragraph('<a name="login-and-roles"/>1. \u767b\u5f55\u548c\u89d2\u8272', styles['h1']))
     story.append(Paragraph('\u7ba1\u7406\u5458\u95e8\u6237\u53ef\u901a\u8fc7 <b>/admin/login</b> \u8bbf\u95ee\u3002\u53ea\u6709\u62e5\u6709 <b>admin</b> \u6216 <b>super_admin</b> \u89d2\u8272\u7684\u7528\u6237\u624d\u80fd\u8bbf\u95ee\u3002', styles['body']))
     story.append(Spacer(1, 6))
     story.append(Paragraph('\u53ef\u7528\u89d2\u8272', styles['h2']))
@@ -200,7 +147,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S2
-    story.append(Paragraph('2. \u4eea\u8868\u677f\u548cKPI', styles['h1']))
+    story.append(Paragraph('<a name="dashboard"/>2. \u4eea\u8868\u677f\u548cKPI', styles['h1']))
     story.append(Paragraph('\u4eea\u8868\u677f\u5b9e\u65f6\u663e\u793a\u5e73\u53f0\u7684\u5173\u952e\u7ee9\u6548\u6307\u6807\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u4e3b\u8981\u6307\u6807', styles['h2']))
@@ -224,7 +171,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S3
-    story.append(Paragraph('3. \u8f66\u8f86\u7ba1\u7406', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-management"/>3. \u8f66\u8f86\u7ba1\u7406', styles['h1']))
     story.append(Paragraph('\u8f66\u8f86\u90e8\u5206\u5305\u542b\u4e09\u4e2a\u9009\u9879\u5361\uff1a<b>\u7edf\u8ba1</b>\u3001<b>\u8f66\u8f86</b>\u548c<b>\u540c\u6b65</b>\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u7edf\u8ba1', styles['h2']))
@@ -242,7 +189,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S4
-    story.append(Paragraph('4. \u6e90\u540c\u6b65', styles['h1']))
+    story.append(Paragraph('<a name="source-sync"/>4. \u6e90\u540c\u6b65', styles['h1']))
     story.append(Paragraph('\u540c\u6b65\u9009\u9879\u5361\u4ece\u5916\u90e8API\u5bfc\u5165\u8f66\u8f86\uff1a<b>Encar</b>\uff08\u97e9\u56fd\uff09\u3001<b>CHE168/Dongchedi</b>\uff08\u4e2d\u56fd\uff09\u3001<b>Dubicars</b>\uff08\u8fea\u62dc\uff09\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['\u6a21\u5f0f', '\u63cf\u8ff0', '\u7528\u9014'],
@@ -258,7 +205,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S5
-    story.append(Paragraph('5. \u8ba2\u5355\u7ba1\u7406', styles['h1']))
+    story.append(Paragraph('<a name="order-management"/>5. \u8ba2\u5355\u7ba1\u7406', styles['h1']))
     story.append(Paragraph('\u8ba2\u5355\u7ba1\u7406\u9075\u5faa14\u6b65\u5de5\u4f5c\u6d41\u7a0b\uff08\u4e0e\u534f\u4f5c\u8005\u6307\u5357\u76f8\u540c\uff09\u3002\u7ba1\u7406\u5458\u62e5\u6709\u989d\u5916\u529f\u80fd\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u6982\u89c8\u5361\u7247', styles['h2']))
@@ -276,7 +223,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S6
-    story.append(Paragraph('6. \u62a5\u4ef7\u7ba1\u7406', styles['h1']))
+    story.append(Paragraph('<a name="quote-management"/>6. \u62a5\u4ef7\u7ba1\u7406', styles['h1']))
     story.append(Paragraph('\u62a5\u4ef7\u9875\u9762\u663e\u793a\u5b8c\u6574\u7684\u6d41\u7a0b\u7ebf\u548c\u5b9e\u65f6\u7edf\u8ba1\u6570\u636e\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u62a5\u4ef7\u6d41\u7a0b', styles['h2']))
@@ -297,7 +244,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S7
-    story.append(Paragraph('7. \u8f66\u8f86\u91cd\u65b0\u5206\u914d', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-reassignment"/>7. \u8f66\u8f86\u91cd\u65b0\u5206\u914d', styles['h1']))
     story.append(Paragraph('\u5f53\u8f66\u8f86\u4e0d\u518d\u53ef\u7528\uff08\u5df2\u552e\u3001\u4e0d\u53ef\u7528\u3001\u4f18\u5148\u7ea7\u51b2\u7a81\uff09\u65f6\uff0c\u60a8\u53ef\u4ee5\u5c06\u62a5\u4ef7\u91cd\u65b0\u5206\u914d\u7ed9\u7c7b\u4f3c\u8f66\u8f86\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_numbered_step(1, '\u9009\u62e9\u539f\u56e0', '\u5df2\u552e\u3001\u4e0d\u53ef\u7528\u3001\u4f18\u5148\u7ea7\u51b2\u7a81\u3001\u4ef7\u683c\u53d8\u52a8\u3001\u5176\u4ed6\u3002'))
@@ -308,7 +255,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S8
-    story.append(Paragraph('8. \u7528\u6237\u7ba1\u7406', styles['h1']))
+    story.append(Paragraph('<a name="user-management"/>8. \u7528\u6237\u7ba1\u7406', styles['h1']))
     story.append(Paragraph('\u7528\u6237\u9875\u9762\u663e\u793a\u6240\u6709\u8d26\u6237\u53ca\u5176\u7edf\u8ba1\u6570\u636e\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u663e\u793a\u7684\u4fe1\u606f', styles['h2']))
@@ -325,7 +272,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S9
-    story.append(Paragraph('9. \u8fd0\u8f93\u8def\u7ebf\u548c\u8d39\u7528', styles['h1']))
+    story.append(Paragraph('<a name="shipping-routes"/>9. \u8fd0\u8f93\u8def\u7ebf\u548c\u8d39\u7528', styles['h1']))
     story.append(Paragraph('\u8fd0\u8f93\u90e8\u5206\u7ba1\u740665+\u4e2a\u975e\u6d32\u76ee\u7684\u5730\u53ca\u5176\u8fd0\u8f93\u8d39\u7528\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(bullet('<b>\u641c\u7d22</b>\u6309\u76ee\u7684\u5730\u6216\u56fd\u5bb6'))
@@ -339,7 +286,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S10
-    story.append(Paragraph('10. \u8fd0\u8f93\u5408\u4f5c\u4f19\u4f34', styles['h1']))
+    story.append(Paragraph('<a name="shipping-partners"/>10. \u8fd0\u8f93\u5408\u4f5c\u4f19\u4f34', styles['h1']))
     story.append(Paragraph('\u8d27\u8fd0\u4ee3\u7406\u9875\u9762\u7ba1\u7406\u7269\u6d41\u5408\u4f5c\u4f19\u4f34\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['\u5b57\u6bb5', '\u63cf\u8ff0'],
@@ -353,7 +300,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S11
-    story.append(Paragraph('11. \u8d27\u5e01\u7ba1\u7406', styles['h1']))
+    story.append(Paragraph('<a name="currency-management"/>11. \u8d27\u5e01\u7ba1\u7406', styles['h1']))
     story.append(Paragraph('\u8d27\u5e01\u9875\u9762\u914d\u7f6e\u6c47\u7387\u548c\u6d3b\u52a8\u8d27\u5e01\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(bullet('<b>\u6c47\u7387</b>\uff1a\u7f16\u8f91\u76f8\u5bf9\u4e8eUSD\u7684\u6c47\u7387'))
@@ -366,7 +313,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S12
-    story.append(Paragraph('12. \u8f66\u8f86\u6279\u6b21', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-batches"/>12. \u8f66\u8f86\u6279\u6b21', styles['h1']))
     story.append(Paragraph('\u6279\u6b21\u90e8\u5206\u7ba1\u7406\u534f\u4f5c\u8005\u7684\u6279\u6b21\u63d0\u4ea4\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u9a8c\u8bc1\u5de5\u4f5c\u6d41\u7a0b', styles['h2']))
@@ -376,7 +323,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S13
-    story.append(Paragraph('13. \u901a\u77e5\u548c\u6d88\u606f', styles['h1']))
+    story.append(Paragraph('<a name="notifications"/>13. \u901a\u77e5\u548c\u6d88\u606f', styles['h1']))
     story.append(Spacer(1, 6))
     story.append(Paragraph('\u901a\u77e5', styles['h2']))
     story.append(Paragraph('\u901a\u77e5\u9762\u677f\u96c6\u4e2d\u6240\u6709\u5e73\u53f0\u4e8b\u4ef6\u3002', styles['body']))
@@ -393,7 +340,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S14
-    story.append(Paragraph('14. \u5e73\u53f0\u8bbe\u7f6e', styles['h1']))
+    story.append(Paragraph('<a name="platform-settings"/>14. \u5e73\u53f0\u8bbe\u7f6e', styles['h1']))
     story.append(Paragraph('\u8bbe\u7f6e\u9875\u9762\u914d\u7f6e\u5e73\u53f0\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(['\u7c7b\u522b', '\u9009\u9879'],
@@ -406,7 +353,7 @@ def build_guide():
     story.append(PageBreak())
 
     # S15
-    story.append(Paragraph('15. \u5206\u6790\u548c\u5229\u6da6', styles['h1']))
+    story.append(Paragraph('<a name="analytics"/>15. \u5206\u6790\u548c\u5229\u6da6', styles['h1']))
     story.append(Paragraph('\u5206\u6790\u9875\u9762\u63d0\u4f9b\u76c8\u5229\u80fd\u529b\u548c\u7ee9\u6548\u7684\u8be6\u7ec6\u89c6\u56fe\u3002', styles['body']))
     story.append(Spacer(1, 8))
     story.append(Paragraph('\u5229\u6da6\u5206\u6790', styles['h2']))
@@ -429,9 +376,22 @@ def build_guide():
         ('ROUNDEDCORNERS', [6, 6, 6, 6])]))
     story.append(t)
 
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
@@ -1,25 +1,31 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Admin Guide PDF - French Version."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 
-MANDARIN = HexColor('#E85D04')
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
+
 JEWEL = HexColor('#1B7A43')
-COD_GRAY = HexColor('#1a1a1a')
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Admin-Driveby-Africa.pdf'
+LANGUAGE = 'fr'
 
 styles = {
     'h1': ParagraphStyle('h1', fontName='Helvetica-Bold', fontSize=22, textColor=MANDARIN, spaceBefore=20, spaceAfter=12, leading=28),
@@ -45,20 +51,11 @@ def make_tip_box(text, box_type='tip'):
     else:
         bg, border, icon = HexColor('#E3F2FD'), HexColor('#2196F3'), 'INFO'
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
-    data = [[Paragraph(f'<b>{icon} :</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, -1), bg), ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14), ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10), ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4])]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon} :</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([('BACKGROUND', (0, 0), (0, 0), MANDARIN), ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'), ('ROUNDEDCORNERS', [12, 12, 12, 12])]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
     content = [Paragraph(title, styles['step_title'])]
     if description:
         content.append(Paragraph(description, styles['step_desc']))
@@ -88,66 +85,34 @@ def make_table(header, rows, col_widths=None):
     return t
 
 
+COVER = guidelib.CoverPage(
+    "Guide de l'Administrateur",
+    ('Gestion de la plateforme', "et administration complete"),
+    version='Version 2.0 - Fevrier 2026',
+    notice='Document interne - Usage reserve aux administrateurs Driveby Africa',
+)
+
+
 def draw_cover(c, doc):
-    c.saveState()
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 30)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, "Guide de l'Administrateur")
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont('Helvetica', 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, 'Gestion de la plateforme')
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, "et administration complete")
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
-    c.setFillColor(HexColor('#888888'))
-    c.setFont('Helvetica', 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, 'Version 2.0 - Fevrier 2026')
-    c.setFillColor(HexColor('#666666'))
-    c.setFont('Helvetica', 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, 'Document interne - Usage reserve aux administrateurs Driveby Africa')
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
-    c.restoreState()
+    COVER.draw(c, doc)
+
+
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - Guide Administrateur',
+    'Document confidentiel',
+)
 
 
 def header_footer(c, doc):
-    c.saveState()
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - Guide Administrateur')
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, 1 * cm, 'Document confidentiel')
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'Page {doc.page}')
-    c.restoreState()
+    CHROME.draw(c, f'Page {doc.page}', doc)
 
 
 def bullet(text):
     return Paragraph(f'&bull; {text}', ParagraphStyle('list', parent=styles['body'], leftIndent=15))
 
 
-def build_guide():
-    output_path = '/Users/user/Downloads/drivebyafrica-main/public/guides/Guide-Admin-Driveby-Africa.pdf'
-    doc = SimpleDocTemplate(output_path, pagesize=A4, topMargin=2.2 * cm, bottomMargin=2 * cm, leftMargin=2 * cm, rightMargin=2 * cm)
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     # Cover
@@ -157,34 +122,12 @@ def build_guide():
     # TOC
     story.append(Paragraph('Sommaire', styles['h1']))
     story.append(Spacer(1, 8))
-    toc = [
-        ('1.', 'Connexion et roles'),
-        ('2.', "Tableau de bord et KPI"),
-        ('3.', 'Gestion des vehicules'),
-        ('4.', 'Synchronisation des sources'),
-        ('5.', 'Gestion des commandes'),
-        ('6.', 'Gestion des devis'),
-        ('7.', 'Reassignation de vehicules'),
-        ('8.', 'Gestion des utilisateurs'),
-        ('9.', 'Routes et couts de transport'),
-        ('10.', 'Partenaires transport (transitaires)'),
-        ('11.', 'Gestion des devises'),
-        ('12.', 'Lots de vehicules (batches)'),
-        ('13.', 'Notifications et messages'),
-        ('14.', 'Parametres de la plateforme'),
-        ('15.', 'Analytiques et profits'),
-    ]
-    for num, title in toc:
-        data = [[Paragraph(f'<b>{num}</b>', ParagraphStyle('n', parent=styles['toc_item'], textColor=MANDARIN)),
-                 Paragraph(title, styles['toc_item'])]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([('VALIGN', (0, 0), (-1, -1), 'MIDDLE'), ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2), ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE'))]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
     story.append(PageBreak())
 
     # ===== SECTION 1: CONNEXION =====
-    story.append(Paragraph('1. Connexion et roles', styles['h1']))
+    story.append(Paragraph('<a name="login-and-roles"/>1. Connexion et roles', styles['h1']))
     story.append(Paragraph(
         "Le portail administrateur est accessible a <b>/admin/login</b>. "
         "Seuls les utilisateurs avec le role <b>admin</b> ou <b>super_admin</b> peuvent y acceder.",
@@ -205,7 +148,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 2: DASHBOARD =====
-    story.append(Paragraph('2. Tableau de bord et KPI', styles['h1']))
+    story.append(Paragraph('<a name="dashboard"/>2. Tableau de bord et KPI', styles['h1']))
     story.append(Paragraph(
         "Le tableau de bord affiche en temps reel les indicateurs cles de la plateforme.",
         styles['body']))
@@ -233,7 +176,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 3: VEHICULES =====
-    story.append(Paragraph('3. Gestion des vehicules', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-management"/>3. Gestion des vehicules', styles['h1']))
     story.append(Paragraph(
         "La section Vehicules comprend trois onglets : <b>Statistiques</b>, <b>Vehicules</b> et <b>Synchronisation</b>.",
         styles['body']))
@@ -256,7 +199,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 4: SYNC =====
-    story.append(Paragraph('4. Synchronisation des sources', styles['h1']))
+    story.append(Paragraph('<a name="source-sync"/>4. Synchronisation des sources', styles['h1']))
     story.append(Paragraph(
         "L'onglet Synchronisation permet d'importer les vehicules depuis les APIs externes : "
         "<b>Encar</b> (Coree), <b>CHE168/Dongchedi</b> (Chine), <b>Dubicars</b> (Dubai).",
@@ -278,7 +221,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 5: COMMANDES =====
-    story.append(Paragraph('5. Gestion des commandes', styles['h1']))
+    story.append(Paragraph('<a name="order-management"/>5. Gestion des commandes', styles['h1']))
     story.append(Paragraph(
         "La gestion des commandes suit un workflow en 14 etapes (identique au guide collaborateur). "
         "L'administrateur dispose de fonctionnalites supplementaires.",
@@ -302,7 +245,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 6: DEVIS =====
-    story.append(Paragraph('6. Gestion des devis', styles['h1']))
+    story.append(Paragraph('<a name="quote-management"/>6. Gestion des devis', styles['h1']))
     story.append(Paragraph(
         "La page Devis affiche le pipeline complet avec des statistiques en temps reel.",
         styles['body']))
@@ -329,7 +272,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 7: REASSIGNATION =====
-    story.append(Paragraph('7. Reassignation de vehicules', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-reassignment"/>7. Reassignation de vehicules', styles['h1']))
     story.append(Paragraph(
         "Quand un vehicule n'est plus disponible (vendu, indisponible, conflit de priorite), "
         "vous pouvez reassigner le devis a un vehicule similaire.",
@@ -346,7 +289,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 8: UTILISATEURS =====
-    story.append(Paragraph('8. Gestion des utilisateurs', styles['h1']))
+    story.append(Paragraph('<a name="user-management"/>8. Gestion des utilisateurs', styles['h1']))
     story.append(Paragraph(
         "La page Utilisateurs affiche tous les comptes avec leurs statistiques.",
         styles['body']))
@@ -366,7 +309,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 9: TRANSPORT =====
-    story.append(Paragraph('9. Routes et couts de transport', styles['h1']))
+    story.append(Paragraph('<a name="shipping-routes"/>9. Routes et couts de transport', styles['h1']))
     story.append(Paragraph(
         "La section Transport permet de gerer les 65+ destinations africaines et leurs couts d'expedition.",
         styles['body']))
@@ -384,7 +327,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 10: TRANSITAIRES =====
-    story.append(Paragraph('10. Partenaires transport', styles['h1']))
+    story.append(Paragraph('<a name="shipping-partners"/>10. Partenaires transport', styles['h1']))
     story.append(Paragraph(
         "La page Transitaires permet de gerer les partenaires logistiques.",
         styles['body']))
@@ -407,7 +350,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 11: DEVISES =====
-    story.append(Paragraph('11. Gestion des devises', styles['h1']))
+    story.append(Paragraph('<a name="currency-management"/>11. Gestion des devises', styles['h1']))
     story.append(Paragraph(
         "La page Devises permet de configurer les taux de change et les devises actives.",
         styles['body']))
@@ -423,7 +366,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 12: BATCHES =====
-    story.append(Paragraph('12. Lots de vehicules (batches)', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-batches"/>12. Lots de vehicules (batches)', styles['h1']))
     story.append(Paragraph(
         "La section Batches permet de gerer les soumissions de lots par les collaborateurs.",
         styles['body']))
@@ -445,7 +388,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 13: NOTIFICATIONS/MESSAGES =====
-    story.append(Paragraph('13. Notifications et messages', styles['h1']))
+    story.append(Paragraph('<a name="notifications"/>13. Notifications et messages', styles['h1']))
     story.append(Spacer(1, 6))
     story.append(Paragraph('Notifications', styles['h2']))
     story.append(Paragraph("Le panneau Notifications centralise tous les evenements de la plateforme.", styles['body']))
@@ -464,7 +407,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 14: PARAMETRES =====
-    story.append(Paragraph('14. Parametres de la plateforme', styles['h1']))
+    story.append(Paragraph('<a name="platform-settings"/>14. Parametres de la plateforme', styles['h1']))
     story.append(Paragraph("La page Parametres permet de configurer la plateforme.", styles['body']))
     story.append(Spacer(1, 8))
     story.append(make_table(
@@ -479,7 +422,7 @@ def build_guide():
     story.append(PageBreak())
 
     # ===== SECTION 15: ANALYTIQUES =====
-    story.append(Paragraph('15. Analytiques et profits', styles['h1']))
+    story.append(Paragraph('<a name="analytics"/>15. Analytiques et profits', styles['h1']))
     story.append(Paragraph(
         "La page Analytiques offre une vue detaillee de la rentabilite et des performances.",
         styles['body']))
@@ -513,9 +456,22 @@ def build_guide():
         ('ROUNDEDCORNERS', [6, 6, 6, 6])]))
     story.append(t)
 
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
@@ -1,28 +1,33 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Collaborator Guide PDF - English Version."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether, HRFlowable, ListFlowable, ListItem
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.pdfgen import canvas as canvasmod
+
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
 
 # Brand colors
-MANDARIN = HexColor('#E85D04')
 JEWEL = HexColor('#1B7A43')
-COD_GRAY = HexColor('#1a1a1a')
 DARK_BG = HexColor('#2d2d2d')
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Collaborateur-Driveby-Africa-EN.pdf'
+LANGUAGE = 'en'
 
 # Styles
 styles = {
@@ -110,29 +115,11 @@ def make_tip_box(text, box_type='tip'):
         icon = 'INFO'
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
 
-    data = [[Paragraph(f'<b>{icon}:</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg),
-        ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4]),
-    ]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon}:</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), MANDARIN),
-        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ('ROUNDEDCORNERS', [12, 12, 12, 12]),
-    ]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
 
     content = []
     content.append(Paragraph(title, styles['step_title']))
@@ -151,27 +138,30 @@ def make_numbered_step(number, title, description):
     return t
 
 
+# the 14 order statuses of the workflow: step, status, required documents
+# and collaborator action
+STATUS_ROWS = [
+    ['1', 'Deposit Paid', 'None', 'Confirm payment receipt'],
+    ['2', 'Vehicle Locked', 'Vehicle photos', 'Upload current photos'],
+    ['3', 'Inspection Sent', 'Inspection report', 'Upload report (PDF/photos)'],
+    ['4', 'Full Payment Received', 'Driveby invoice (auto)', 'Confirm full payment'],
+    ['5', 'Vehicle Purchased', 'Purchase invoice (internal)', 'Enter actual purchase price'],
+    ['6', 'Vehicle Received', 'Reception photos (internal)', 'Assign shipping partner'],
+    ['7', 'Export Customs', 'Export customs docs (internal)', 'Upload export documents'],
+    ['8', 'In Transit', 'None', 'Update status'],
+    ['9', 'At Port', 'Seal + loading photos', 'Upload container photos'],
+    ['10', 'Shipping', 'Tracking URL', 'Add tracking link'],
+    ['11', 'Documents Ready', 'BL, Packing list, Release', 'Upload all documents'],
+    ['12', 'Customs', 'None', 'Follow up on clearance'],
+    ['13', 'Ready for Pickup', 'None', 'Notify the client'],
+    ['14', 'Delivered', 'None', 'Confirm delivery'],
+]
+
+
 def make_status_table():
     header = ['Step', 'Status', 'Required Documents', 'Collaborator Action']
 
-    rows = [
-        ['1', 'Deposit Paid', 'None', 'Confirm payment receipt'],
-        ['2', 'Vehicle Locked', 'Vehicle photos', 'Upload current photos'],
-        ['3', 'Inspection Sent', 'Inspection report', 'Upload report (PDF/photos)'],
-        ['4', 'Full Payment Received', 'Driveby invoice (auto)', 'Confirm full payment'],
-        ['5', 'Vehicle Purchased', 'Purchase invoice (internal)', 'Enter actual purchase price'],
-        ['6', 'Vehicle Received', 'Reception photos (internal)', 'Assign shipping partner'],
-        ['7', 'Export Customs', 'Export customs docs (internal)', 'Upload export documents'],
-        ['8', 'In Transit', 'None', 'Update status'],
-        ['9', 'At Port', 'Seal + loading photos', 'Upload container photos'],
-        ['10', 'Shipping', 'Tracking URL', 'Add tracking link'],
-        ['11', 'Documents Ready', 'BL, Packing list, Release', 'Upload all documents'],
-        ['12', 'Customs', 'None', 'Follow up on clearance'],
-        ['13', 'Ready for Pickup', 'None', 'Notify the client'],
-        ['14', 'Delivered', 'None', 'Confirm delivery'],
-    ]
-
-    data = [header] + rows
+    data = [header] + STATUS_ROWS
     col_widths = [35, 95, 140, 195]
     t = Table(data, colWidths=col_widths, repeatRows=1)
 
@@ -235,87 +225,30 @@ def make_shortcut_table():
     return t
 
 
-def draw_cover(c, doc):
-    c.saveState()
-
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 30)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, 'Collaborator Guide')
-
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont('Helvetica', 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, 'Order Management')
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, 'and Delivery Tracking')
-
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
+COVER = guidelib.CoverPage(
+    'Collaborator Guide',
+    ('Order Management', 'and Delivery Tracking'),
+    version='Version 2.0 - February 2026',
+    notice='Internal document - For Driveby Africa collaborators only',
+)
 
-    c.setFillColor(HexColor('#888888'))
-    c.setFont('Helvetica', 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, 'Version 2.0 - February 2026')
 
-    c.setFillColor(HexColor('#666666'))
-    c.setFont('Helvetica', 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, 'Internal document - For Driveby Africa collaborators only')
+def draw_cover(c, doc):
+    COVER.draw(c, doc)
 
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
 
-    c.restoreState()
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - Collaborator Guide',
+    'Confidential document',
+)
 
 
 def header_footer(c, doc):
-    c.saveState()
-
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - Collaborator Guide')
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
+    CHROME.draw(c, f'Page {doc.page}', doc)
 
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, 1 * cm, 'Confidential document')
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'Page {doc.page}')
-
-    c.restoreState()
-
-
-def build_guide():
-    output_path = '/Users/user/Downloads/drivebyafrica-main/Guide-Collaborateur-Driveby-Africa-EN.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        topMargin=2.2 * cm,
-        bottomMargin=2 * cm,
-        leftMargin=2 * cm,
-        rightMargin=2 * cm,
-    )
 
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     # COVER PAGE
@@ -326,39 +259,13 @@ def build_guide():
     story.append(Paragraph('Table of Contents', styles['h1']))
     story.append(Spacer(1, 8))
 
-    toc_items = [
-        ('1.', 'Logging into the Collaborator Portal'),
-        ('2.', 'Dashboard - Overview'),
-        ('3.', 'Order Management'),
-        ('4.', 'The 14-Step Workflow'),
-        ('5.', 'Updating an Order Status'),
-        ('6.', 'Uploading Documents'),
-        ('7.', 'Special Steps: Purchase and Reception'),
-        ('8.', 'Contacting a Client via WhatsApp'),
-        ('9.', 'Vehicle Management'),
-        ('10.', 'Batch Management'),
-        ('11.', 'Notifications and Real-Time Updates'),
-        ('12.', 'Quick Reference'),
-    ]
-
-    for num, title in toc_items:
-        data = [[
-            Paragraph(f'<b>{num}</b>', ParagraphStyle('toc_num', parent=styles['toc_item'], textColor=MANDARIN)),
-            Paragraph(title, styles['toc_item'])
-        ]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),
-            ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE')),
-        ]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
 
     story.append(PageBreak())
 
     # SECTION 1: LOGIN
-    story.append(Paragraph('1. Logging into the Portal', styles['h1']))
+    story.append(Paragraph('<a name="login"/>1. Logging into the Portal', styles['h1']))
     story.append(Paragraph(
         'The collaborator portal is accessible at <b>/collaborator/login</b>. '
         'Only users with the <b>collaborator</b>, <b>admin</b> or <b>super_admin</b> '
@@ -385,7 +292,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 2: DASHBOARD
-    story.append(Paragraph('2. Dashboard', styles['h1']))
+    story.append(Paragraph('<a name="dashboard"/>2. Dashboard', styles['h1']))
     story.append(Paragraph(
         'The dashboard gives you an overview of current activity. '
         'It updates in real time.',
@@ -445,7 +352,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 3: ORDER MANAGEMENT
-    story.append(Paragraph('3. Order Management', styles['h1']))
+    story.append(Paragraph('<a name="order-management"/>3. Order Management', styles['h1']))
     story.append(Paragraph(
         'The Orders page is the core of your daily activity. It allows you to track, '
         'update, and manage all orders.',
@@ -499,7 +406,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 4: 14-STEP WORKFLOW
-    story.append(Paragraph('4. The 14-Step Workflow', styles['h1']))
+    story.append(Paragraph('<a name="workflow"/>4. The 14-Step Workflow', styles['h1']))
     story.append(Paragraph(
         'Each order follows a 14-step process, from deposit receipt '
         'to final delivery. Some steps require specific documents or actions.',
@@ -525,7 +432,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 5: UPDATE STATUS
-    story.append(Paragraph('5. Updating an Order Status', styles['h1']))
+    story.append(Paragraph('<a name="update-order-status"/>5. Updating an Order Status', styles['h1']))
     story.append(Paragraph(
         'To move an order forward in the workflow, you need to update its status. '
         'Here is the step-by-step procedure:',
@@ -564,7 +471,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 6: DOCUMENTS
-    story.append(Paragraph('6. Uploading Documents', styles['h1']))
+    story.append(Paragraph('<a name="upload-documents"/>6. Uploading Documents', styles['h1']))
     story.append(Paragraph(
         'Each workflow step may require specific documents (photos, PDFs, links). '
         'The "Documents" section in the order detail shows you what is expected.',
@@ -628,7 +535,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 7: SPECIAL STEPS
-    story.append(Paragraph('7. Special Steps', styles['h1']))
+    story.append(Paragraph('<a name="special-steps"/>7. Special Steps', styles['h1']))
 
     story.append(Paragraph('Step 5: Vehicle Purchased', styles['h2']))
     story.append(Paragraph(
@@ -692,7 +599,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 8: WHATSAPP
-    story.append(Paragraph('8. Contacting a Client', styles['h1']))
+    story.append(Paragraph('<a name="contact-client"/>8. Contacting a Client', styles['h1']))
     story.append(Paragraph(
         'You can contact a client directly via WhatsApp from the application. '
         'The message is pre-filled with the client\'s name and order number.',
@@ -723,7 +630,7 @@ def build_guide():
     story.append(Spacer(1, 16))
 
     # SECTION 9: VEHICLES
-    story.append(Paragraph('9. Vehicle Management', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-management"/>9. Vehicle Management', styles['h1']))
     story.append(Paragraph(
         'The "Vehicles" section lets you manage the vehicles you offer. '
         'You can add, edit and delete vehicles.',
@@ -766,7 +673,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 10: BATCHES
-    story.append(Paragraph('10. Batch Management', styles['h1']))
+    story.append(Paragraph('<a name="batch-management"/>10. Batch Management', styles['h1']))
     story.append(Paragraph(
         'The "Batches" section lets you manage batches of identical vehicles '
         '(same make, model, year) for wholesale.',
@@ -784,7 +691,7 @@ def build_guide():
     story.append(Spacer(1, 16))
 
     # SECTION 11: NOTIFICATIONS
-    story.append(Paragraph('11. Notifications and Real-Time Updates', styles['h1']))
+    story.append(Paragraph('<a name="notifications"/>11. Notifications and Real-Time Updates', styles['h1']))
     story.append(Paragraph(
         'The application works in <b>real time</b>. When another collaborator or an '
         'administrator updates an order, your screen refreshes automatically.',
@@ -819,7 +726,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 12: QUICK REFERENCE
-    story.append(Paragraph('12. Quick Reference', styles['h1']))
+    story.append(Paragraph('<a name="quick-reference"/>12. Quick Reference', styles['h1']))
     story.append(Spacer(1, 8))
 
     story.append(make_shortcut_table())
@@ -862,9 +769,22 @@ def build_guide():
     ]))
     story.append(t)
 
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
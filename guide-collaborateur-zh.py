@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Collaborator Guide PDF - Chinese Version."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether, HRFlowable, ListFlowable, ListItem
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.pdfgen import canvas as canvasmod
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
+
 # Register CJK fonts
 pdfmetrics.registerFont(UnicodeCIDFont('STSong-Light'))
 pdfmetrics.registerFont(UnicodeCIDFont('MSung-Light'))
@@ -23,16 +29,15 @@ CJK_FONT = 'STSong-Light'
 CJK_BOLD = 'STSong-Light'  # CID fonts don't have bold variant, we simulate with tags
 
 # Brand colors
-MANDARIN = HexColor('#E85D04')
 JEWEL = HexColor('#1B7A43')
-COD_GRAY = HexColor('#1a1a1a')
 DARK_BG = HexColor('#2d2d2d')
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Collaborateur-Driveby-Africa-ZH.pdf'
+LANGUAGE = 'zh'
 
 # Styles using CJK font
 styles = {
@@ -120,29 +125,11 @@ def make_tip_box(text, box_type='tip'):
         icon = '\u4fe1\u606f'  # 信息
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
 
-    data = [[Paragraph(f'<b>{icon}\uff1a</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg),
-        ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4]),
-    ]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon}\uff1a</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), MANDARIN),
-        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ('ROUNDEDCORNERS', [12, 12, 12, 12]),
-    ]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
 
     content = []
     content.append(Paragraph(title, styles['step_title']))
@@ -161,28 +148,31 @@ def make_numbered_step(number, title, description):
     return t
 
 
+# the 14 order statuses of the workflow: step, status, required documents
+# and collaborator action
+STATUS_ROWS = [
+    ['1', '\u5b9a\u91d1\u5df2\u4ed8', '\u65e0', '\u786e\u8ba4\u6536\u5230\u4ed8\u6b3e'],
+    ['2', '\u8f66\u8f86\u5df2\u9501\u5b9a', '\u8f66\u8f86\u7167\u7247', '\u4e0a\u4f20\u5f53\u524d\u7167\u7247'],
+    ['3', '\u68c0\u67e5\u5df2\u53d1\u9001', '\u68c0\u67e5\u62a5\u544a', '\u4e0a\u4f20\u62a5\u544a (PDF/\u7167\u7247)'],
+    ['4', '\u5168\u989d\u4ed8\u6b3e\u5df2\u6536', 'Driveby\u53d1\u7968 (\u81ea\u52a8)', '\u786e\u8ba4\u5168\u989d\u4ed8\u6b3e'],
+    ['5', '\u8f66\u8f86\u5df2\u8d2d\u4e70', '\u8d2d\u4e70\u53d1\u7968 (\u5185\u90e8)', '\u8f93\u5165\u5b9e\u9645\u8d2d\u4e70\u4ef7\u683c'],
+    ['6', '\u8f66\u8f86\u5df2\u63a5\u6536', '\u63a5\u6536\u7167\u7247 (\u5185\u90e8)', '\u5206\u914d\u8fd0\u8f93\u5408\u4f5c\u4f19\u4f34'],
+    ['7', '\u51fa\u53e3\u6d77\u5173', '\u51fa\u53e3\u6d77\u5173\u6587\u4ef6 (\u5185\u90e8)', '\u4e0a\u4f20\u51fa\u53e3\u6587\u4ef6'],
+    ['8', '\u8fd0\u8f93\u4e2d', '\u65e0', '\u66f4\u65b0\u72b6\u6001'],
+    ['9', '\u5728\u6e2f\u53e3', '\u5c01\u6761+\u88c5\u8f7d\u7167\u7247', '\u4e0a\u4f20\u96c6\u88c5\u7bb1\u7167\u7247'],
+    ['10', '\u6d77\u8fd0\u4e2d', '\u8ddf\u8e2a\u94fe\u63a5', '\u6dfb\u52a0\u8ddf\u8e2a\u94fe\u63a5'],
+    ['11', '\u6587\u4ef6\u5c31\u7eea', '\u63d0\u5355\u3001\u88c5\u7bb1\u5355\u3001\u653e\u884c\u8bc1', '\u4e0a\u4f20\u6240\u6709\u6587\u4ef6'],
+    ['12', '\u6d77\u5173\u6e05\u5173', '\u65e0', '\u8ddf\u8fdb\u6e05\u5173\u8fdb\u5ea6'],
+    ['13', '\u53ef\u63d0\u8d27', '\u65e0', '\u901a\u77e5\u5ba2\u6237'],
+    ['14', '\u5df2\u4ea4\u4ed8', '\u65e0', '\u786e\u8ba4\u4ea4\u4ed8'],
+]
+
+
 def make_status_table():
     header = ['\u6b65\u9aa4', '\u72b6\u6001', '\u6240\u9700\u6587\u4ef6', '\u534f\u4f5c\u8005\u64cd\u4f5c']
     # 步骤, 状态, 所需文件, 协作者操作
 
-    rows = [
-        ['1', '\u5b9a\u91d1\u5df2\u4ed8', '\u65e0', '\u786e\u8ba4\u6536\u5230\u4ed8\u6b3e'],
-        ['2', '\u8f66\u8f86\u5df2\u9501\u5b9a', '\u8f66\u8f86\u7167\u7247', '\u4e0a\u4f20\u5f53\u524d\u7167\u7247'],
-        ['3', '\u68c0\u67e5\u5df2\u53d1\u9001', '\u68c0\u67e5\u62a5\u544a', '\u4e0a\u4f20\u62a5\u544a (PDF/\u7167\u7247)'],
-        ['4', '\u5168\u989d\u4ed8\u6b3e\u5df2\u6536', 'Driveby\u53d1\u7968 (\u81ea\u52a8)', '\u786e\u8ba4\u5168\u989d\u4ed8\u6b3e'],
-        ['5', '\u8f66\u8f86\u5df2\u8d2d\u4e70', '\u8d2d\u4e70\u53d1\u7968 (\u5185\u90e8)', '\u8f93\u5165\u5b9e\u9645\u8d2d\u4e70\u4ef7\u683c'],
-        ['6', '\u8f66\u8f86\u5df2\u63a5\u6536', '\u63a5\u6536\u7167\u7247 (\u5185\u90e8)', '\u5206\u914d\u8fd0\u8f93\u5408\u4f5c\u4f19\u4f34'],
-        ['7', '\u51fa\u53e3\u6d77\u5173', '\u51fa\u53e3\u6d77\u5173\u6587\u4ef6 (\u5185\u90e8)', '\u4e0a\u4f20\u51fa\u53e3\u6587\u4ef6'],
-        ['8', '\u8fd0\u8f93\u4e2d', '\u65e0', '\u66f4\u65b0\u72b6\u6001'],
-        ['9', '\u5728\u6e2f\u53e3', '\u5c01\u6761+\u88c5\u8f7d\u7167\u7247', '\u4e0a\u4f20\u96c6\u88c5\u7bb1\u7167\u7247'],
-        ['10', '\u6d77\u8fd0\u4e2d', '\u8ddf\u8e2a\u94fe\u63a5', '\u6dfb\u52a0\u8ddf\u8e2a\u94fe\u63a5'],
-        ['11', '\u6587\u4ef6\u5c31\u7eea', '\u63d0\u5355\u3001\u88c5\u7bb1\u5355\u3001\u653e\u884c\u8bc1', '\u4e0a\u4f20\u6240\u6709\u6587\u4ef6'],
-        ['12', '\u6d77\u5173\u6e05\u5173', '\u65e0', '\u8ddf\u8fdb\u6e05\u5173\u8fdb\u5ea6'],
-        ['13', '\u53ef\u63d0\u8d27', '\u65e0', '\u901a\u77e5\u5ba2\u6237'],
-        ['14', '\u5df2\u4ea4\u4ed8', '\u65e0', '\u786e\u8ba4\u4ea4\u4ed8'],
-    ]
-
-    data = [header] + rows
+    data = [header] + STATUS_ROWS
     col_widths = [35, 85, 145, 200]
     t = Table(data, colWidths=col_widths, repeatRows=1)
 
@@ -243,87 +233,34 @@ def make_shortcut_table():
     return t
 
 
-def draw_cover(c, doc):
-    c.saveState()
-
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-
-    c.setFillColor(white)
-    c.setFont(CJK_FONT, 28)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, '\u534f\u4f5c\u8005\u6307\u5357')  # 协作者指南
-
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont(CJK_FONT, 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, '\u8ba2\u5355\u7ba1\u7406')  # 订单管理
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, '\u4e0e\u4ea4\u4ed8\u8ddf\u8e2a')  # 与交付跟踪
-
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
+COVER = guidelib.CoverPage(
+    '\u534f\u4f5c\u8005\u6307\u5357',  # 协作者指南
+    ('\u8ba2\u5355\u7ba1\u7406', '\u4e0e\u4ea4\u4ed8\u8ddf\u8e2a'),  # 订单管理 / 与交付跟踪
+    version='\u7248\u672c 2.0 - 2026\u5e742\u6708',  # 版本 2.0 - 2026年2月
+    notice='\u5185\u90e8\u6587\u4ef6 - \u4ec5\u4f9b Driveby Africa \u534f\u4f5c\u8005\u4f7f\u7528',  # 内部文件 - 仅供 Driveby Africa 协作者使用
+    font=CJK_FONT,
+    title_font=CJK_FONT,
+    title_size=28,
+)
 
-    c.setFillColor(HexColor('#888888'))
-    c.setFont(CJK_FONT, 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, '\u7248\u672c 2.0 - 2026\u5e742\u6708')  # 版本 2.0 - 2026年2月
 
-    c.setFillColor(HexColor('#666666'))
-    c.setFont(CJK_FONT, 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, '\u5185\u90e8\u6587\u4ef6 - \u4ec5\u4f9b Driveby Africa \u534f\u4f5c\u8005\u4f7f\u7528')  # 内部文件 - 仅供 Driveby Africa 协作者使用
+def draw_cover(c, doc):
+    COVER.draw(c, doc)
 
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
 
-    c.restoreState()
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - \u534f\u4f5c\u8005\u6307\u5357',  # 协作者指南
+    '\u673a\u5bc6\u6587\u4ef6',  # 机密文件
+    font=CJK_FONT,
+)
 
 
 def header_footer(c, doc):
-    c.saveState()
-
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-
-    c.setFillColor(HexColor('#999999'))
-    c.setFont(CJK_FONT, 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - \u534f\u4f5c\u8005\u6307\u5357')  # 协作者指南
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
+    CHROME.draw(c, f'\u7b2c {doc.page} \u9875', doc)  # 第 X 页
 
-    c.setFillColor(HexColor('#999999'))
-    c.setFont(CJK_FONT, 8)
-    c.drawString(2 * cm, 1 * cm, '\u673a\u5bc6\u6587\u4ef6')  # 机密文件
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'\u7b2c {doc.page} \u9875')  # 第 X 页
-
-    c.restoreState()
-
-
-def build_guide():
-    output_path = '/Users/user/Downloads/drivebyafrica-main/Guide-Collaborateur-Driveby-Africa-ZH.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        topMargin=2.2 * cm,
-        bottomMargin=2 * cm,
-        leftMargin=2 * cm,
-        rightMargin=2 * cm,
-    )
 
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     # COVER PAGE
@@ -334,39 +271,13 @@ def build_guide():
     story.append(Paragraph('\u76ee\u5f55', styles['h1']))  # 目录
     story.append(Spacer(1, 8))
 
-    toc_items = [
-        ('1.', '\u767b\u5f55\u534f\u4f5c\u8005\u95e8\u6237'),  # 登录协作者门户
-        ('2.', '\u4eea\u8868\u677f - \u6982\u89c8'),  # 仪表板 - 概览
-        ('3.', '\u8ba2\u5355\u7ba1\u7406'),  # 订单管理
-        ('4.', '14\u6b65\u5de5\u4f5c\u6d41\u7a0b'),  # 14步工作流程
-        ('5.', '\u66f4\u65b0\u8ba2\u5355\u72b6\u6001'),  # 更新订单状态
-        ('6.', '\u4e0a\u4f20\u6587\u4ef6'),  # 上传文件
-        ('7.', '\u7279\u6b8a\u6b65\u9aa4\uff1a\u8d2d\u4e70\u548c\u63a5\u6536'),  # 特殊步骤：购买和接收
-        ('8.', '\u901a\u8fc7WhatsApp\u8054\u7cfb\u5ba2\u6237'),  # 通过WhatsApp联系客户
-        ('9.', '\u8f66\u8f86\u7ba1\u7406'),  # 车辆管理
-        ('10.', '\u6279\u6b21\u7ba1\u7406'),  # 批次管理
-        ('11.', '\u901a\u77e5\u548c\u5b9e\u65f6\u66f4\u65b0'),  # 通知和实时更新
-        ('12.', '\u5feb\u901f\u53c2\u8003'),  # 快速参考
-    ]
-
-    for num, title in toc_items:
-        data = [[
-            Paragraph(f'<b>{num}</b>', ParagraphStyle('toc_num', parent=styles['toc_item'], textColor=MANDARIN)),
-            Paragraph(title, styles['toc_item'])
-        ]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),
-            ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE')),
-        ]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
 
     story.append(PageBreak())
 
     # SECTION 1: LOGIN
-    story.append(Paragraph('1. \u767b\u5f55\u95e8\u6237', styles['h1']))  # 登录门户
+    story.append(Paragraph('<a name="login"/>1. \u767b\u5f55\u95e8\u6237', styles['h1']))  # 登录门户
     story.append(Paragraph(
         '\u534f\u4f5c\u8005\u95e8\u6237\u53ef\u901a\u8fc7 <b>/collaborator/login</b> \u8bbf\u95ee\u3002'
         '\u53ea\u6709\u62e5\u6709 <b>collaborator</b>\u3001<b>admin</b> \u6216 <b>super_admin</b> '
@@ -393,7 +304,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 2: DASHBOARD
-    story.append(Paragraph('2. \u4eea\u8868\u677f', styles['h1']))  # 仪表板
+    story.append(Paragraph('<a name="dashboard"/>2. \u4eea\u8868\u677f', styles['h1']))  # 仪表板
     story.append(Paragraph(
         '\u4eea\u8868\u677f\u4e3a\u60a8\u63d0\u4f9b\u5f53\u524d\u6d3b\u52a8\u7684\u6982\u89c8\u3002'
         '\u5b83\u5b9e\u65f6\u66f4\u65b0\u3002',
@@ -452,7 +363,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 3: ORDER MANAGEMENT
-    story.append(Paragraph('3. \u8ba2\u5355\u7ba1\u7406', styles['h1']))  # 订单管理
+    story.append(Paragraph('<a name="order-management"/>3. \u8ba2\u5355\u7ba1\u7406', styles['h1']))  # 订单管理
     story.append(Paragraph(
         '\u8ba2\u5355\u9875\u9762\u662f\u60a8\u65e5\u5e38\u5de5\u4f5c\u7684\u6838\u5fc3\u3002'
         '\u5b83\u5141\u8bb8\u60a8\u8ddf\u8e2a\u3001\u66f4\u65b0\u548c\u7ba1\u7406\u6240\u6709\u8ba2\u5355\u3002',
@@ -506,7 +417,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 4: 14-STEP WORKFLOW
-    story.append(Paragraph('4. 14\u6b65\u5de5\u4f5c\u6d41\u7a0b', styles['h1']))  # 14步工作流程
+    story.append(Paragraph('<a name="workflow"/>4. 14\u6b65\u5de5\u4f5c\u6d41\u7a0b', styles['h1']))  # 14步工作流程
     story.append(Paragraph(
         '\u6bcf\u4e2a\u8ba2\u5355\u9075\u5faa14\u6b65\u6d41\u7a0b\uff0c\u4ece\u6536\u5230\u5b9a\u91d1'
         '\u5230\u6700\u7ec8\u4ea4\u4ed8\u3002\u67d0\u4e9b\u6b65\u9aa4\u9700\u8981\u7279\u5b9a\u7684\u6587\u4ef6\u6216\u64cd\u4f5c\u3002',
@@ -532,7 +443,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 5: UPDATE STATUS
-    story.append(Paragraph('5. \u66f4\u65b0\u8ba2\u5355\u72b6\u6001', styles['h1']))  # 更新订单状态
+    story.append(Paragraph('<a name="update-order-status"/>5. \u66f4\u65b0\u8ba2\u5355\u72b6\u6001', styles['h1']))  # 更新订单状态
     story.append(Paragraph(
         '\u8981\u5728\u5de5\u4f5c\u6d41\u7a0b\u4e2d\u63a8\u8fdb\u8ba2\u5355\uff0c\u60a8\u9700\u8981\u66f4\u65b0\u5176\u72b6\u6001\u3002'
         '\u4ee5\u4e0b\u662f\u5206\u6b65\u64cd\u4f5c\u6b65\u9aa4\uff1a',
@@ -571,7 +482,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 6: DOCUMENTS
-    story.append(Paragraph('6. \u4e0a\u4f20\u6587\u4ef6', styles['h1']))  # 上传文件
+    story.append(Paragraph('<a name="upload-documents"/>6. \u4e0a\u4f20\u6587\u4ef6', styles['h1']))  # 上传文件
     story.append(Paragraph(
         '\u6bcf\u4e2a\u5de5\u4f5c\u6d41\u7a0b\u6b65\u9aa4\u53ef\u80fd\u9700\u8981\u7279\u5b9a\u7684\u6587\u4ef6\uff08\u7167\u7247\u3001PDF\u3001\u94fe\u63a5\uff09\u3002'
         '\u8ba2\u5355\u8be6\u60c5\u4e2d\u7684\u201c\u6587\u4ef6\u201d\u90e8\u5206\u4f1a\u663e\u793a\u9700\u8981\u4ec0\u4e48\u3002',
@@ -635,7 +546,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 7: SPECIAL STEPS
-    story.append(Paragraph('7. \u7279\u6b8a\u6b65\u9aa4', styles['h1']))  # 特殊步骤
+    story.append(Paragraph('<a name="special-steps"/>7. \u7279\u6b8a\u6b65\u9aa4', styles['h1']))  # 特殊步骤
 
     story.append(Paragraph('\u7b2c5\u6b65\uff1a\u8f66\u8f86\u5df2\u8d2d\u4e70', styles['h2']))  # 第5步：车辆已购买
     story.append(Paragraph(
@@ -698,7 +609,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 8: WHATSAPP
-    story.append(Paragraph('8. \u8054\u7cfb\u5ba2\u6237', styles['h1']))  # 联系客户
+    story.append(Paragraph('<a name="contact-client"/>8. \u8054\u7cfb\u5ba2\u6237', styles['h1']))  # 联系客户
     story.append(Paragraph(
         '\u60a8\u53ef\u4ee5\u76f4\u63a5\u4ece\u5e94\u7528\u7a0b\u5e8f\u901a\u8fc7WhatsApp\u8054\u7cfb\u5ba2\u6237\u3002'
         '\u6d88\u606f\u5c06\u9884\u586b\u5ba2\u6237\u59d3\u540d\u548c\u8ba2\u5355\u7f16\u53f7\u3002',
@@ -729,7 +640,7 @@ def build_guide():
     story.append(Spacer(1, 16))
 
     # SECTION 9: VEHICLES
-    story.append(Paragraph('9. \u8f66\u8f86\u7ba1\u7406', styles['h1']))  # 车辆管理
+    story.append(Paragraph('<a name="vehicle-management"/>9. \u8f66\u8f86\u7ba1\u7406', styles['h1']))  # 车辆管理
     story.append(Paragraph(
         '\u201c\u8f66\u8f86\u201d\u90e8\u5206\u5141\u8bb8\u60a8\u7ba1\u7406\u60a8\u63d0\u4f9b\u7684\u8f66\u8f86\u3002'
         '\u60a8\u53ef\u4ee5\u6dfb\u52a0\u3001\u7f16\u8f91\u548c\u5220\u9664\u8f66\u8f86\u3002',
@@ -771,7 +682,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 10: BATCHES
-    story.append(Paragraph('10. \u6279\u6b21\u7ba1\u7406', styles['h1']))  # 批次管理
+    story.append(Paragraph('<a name="batch-management"/>10. \u6279\u6b21\u7ba1\u7406', styles['h1']))  # 批次管理
     story.append(Paragraph(
         '\u201c\u6279\u6b21\u201d\u90e8\u5206\u5141\u8bb8\u60a8\u7ba1\u7406\u76f8\u540c\u8f66\u8f86\u7684\u6279\u6b21'
         '\uff08\u76f8\u540c\u54c1\u724c\u3001\u578b\u53f7\u3001\u5e74\u4efd\uff09\u7528\u4e8e\u6279\u53d1\u3002',
@@ -789,7 +700,7 @@ def build_guide():
     story.append(Spacer(1, 16))
 
     # SECTION 11: NOTIFICATIONS
-    story.append(Paragraph('11. \u901a\u77e5\u548c\u5b9e\u65f6\u66f4\u65b0', styles['h1']))  # 通知和实时更新
+    story.append(Paragraph('<a name="notifications"/>11. \u901a\u77e5\u548c\u5b9e\u65f6\u66f4\u65b0', styles['h1']))  # 通知和实时更新
     story.append(Paragraph(
         '\u5e94\u7528\u7a0b\u5e8f\u4ee5<b>\u5b9e\u65f6</b>\u65b9\u5f0f\u8fd0\u884c\u3002\u5f53\u53e6\u4e00\u4e2a\u534f\u4f5c\u8005\u6216'
         '\u7ba1\u7406\u5458\u66f4\u65b0\u8ba2\u5355\u65f6\uff0c\u60a8\u7684\u5c4f\u5e55\u4f1a\u81ea\u52a8\u5237\u65b0\u3002',
@@ -824,7 +735,7 @@ def build_guide():
     story.append(PageBreak())
 
     # SECTION 12: QUICK REFERENCE
-    story.append(Paragraph('12. \u5feb\u901f\u53c2\u8003', styles['h1']))  # 快速参考
+    story.append(Paragraph('<a name="quick-reference"/>12. \u5feb\u901f\u53c2\u8003', styles['h1']))  # 快速参考
     story.append(Spacer(1, 8))
 
     story.append(make_shortcut_table())
@@ -867,9 +778,22 @@ def build_guide():
     ]))
     story.append(t)
 
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
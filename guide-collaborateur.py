@@ -1,24 +1,27 @@
 #!/usr/bin/env python3
 """Generate the Driveby Africa Collaborator Guide PDF."""
 
+import sys
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm, cm
 from reportlab.lib.colors import HexColor, white, black
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Spacer, Table, TableStyle,
     PageBreak, KeepTogether, HRFlowable, ListFlowable, ListItem
 )
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from reportlab.pdfgen import canvas as canvasmod
+
+import guidelib
+from guidelib import InternedParagraph as Paragraph
+from guidelib.chrome import BORDER_COLOR, MANDARIN
+from guidelib.cover import COD_GRAY
 
 # Brand colors
-MANDARIN = HexColor('#E85D04')
 JEWEL = HexColor('#1B7A43')
-COD_GRAY = HexColor('#1a1a1a')
 DARK_BG = HexColor('#2d2d2d')
 LIGHT_TEXT = HexColor('#555555')
-BORDER_COLOR = HexColor('#E0E0E0')
 LIGHT_BG = HexColor('#F8F8F8')
 SECTION_BG = HexColor('#FFF5EE')
 STATUS_GREEN = HexColor('#10B981')
@@ -30,6 +33,8 @@ STATUS_CYAN = HexColor('#06B6D4')
 STATUS_LIME = HexColor('#84CC16')
 
 WIDTH, HEIGHT = A4
+OUTPUT_NAME = 'Guide-Collaborateur-Driveby-Africa.pdf'
+LANGUAGE = 'fr'
 
 # Styles
 styles = {
@@ -118,30 +123,12 @@ def make_tip_box(text, box_type='tip'):
         icon = 'INFO'
         style = ParagraphStyle('info_text', parent=styles['tip_text'], textColor=HexColor('#0D47A1'))
 
-    data = [[Paragraph(f'<b>{icon} :</b> {text}', style)]]
-    t = Table(data, colWidths=[WIDTH - 4 * cm])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), bg),
-        ('BOX', (0, 0), (-1, -1), 1, border),
-        ('LEFTPADDING', (0, 0), (-1, -1), 14),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 14),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('ROUNDEDCORNERS', [4, 4, 4, 4]),
-    ]))
-    return t
+    return guidelib.FramedBox(Paragraph(f'<b>{icon} :</b> {text}', style), WIDTH - 4 * cm, bg, border)
 
 
 def make_numbered_step(number, title, description):
     """Create a numbered step with circle."""
-    num_data = [[Paragraph(str(number), styles['step_num'])]]
-    num_table = Table(num_data, colWidths=[24], rowHeights=[24])
-    num_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, 0), MANDARIN),
-        ('ALIGN', (0, 0), (0, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ('ROUNDEDCORNERS', [12, 12, 12, 12]),
-    ]))
+    num_table = guidelib.StepBadge(number, styles['step_num'], MANDARIN)
 
     content = []
     content.append(Paragraph(title, styles['step_title']))
@@ -160,28 +147,31 @@ def make_numbered_step(number, title, description):
     return t
 
 
+# the 14 order statuses of the workflow: step, status, required documents
+# and collaborator action
+STATUS_ROWS = [
+    ['1', 'Acompte paye', 'Aucun', 'Confirmer la reception du paiement'],
+    ['2', 'Vehicule bloque', 'Photos du vehicule', 'Uploader les photos actuelles'],
+    ['3', 'Inspection envoyee', 'Rapport d\'inspection', 'Uploader le rapport (PDF/photos)'],
+    ['4', 'Paiement total recu', 'Facture Driveby (auto)', 'Confirmer le paiement complet'],
+    ['5', 'Vehicule achete', 'Facture d\'achat (interne)', 'Saisir le prix d\'achat reel'],
+    ['6', 'Reception vehicule', 'Photos de reception (interne)', 'Attribuer le transitaire'],
+    ['7', 'Douane export', 'Docs douane export (interne)', 'Uploader les documents export'],
+    ['8', 'En transit', 'Aucun', 'Mettre a jour le statut'],
+    ['9', 'Au port', 'Photo plomb + chargement', 'Uploader photos container'],
+    ['10', 'En mer', 'URL de suivi', 'Ajouter le lien de tracking'],
+    ['11', 'Documentation', 'BL, Packing list, Relache', 'Uploader tous les documents'],
+    ['12', 'En douane', 'Aucun', 'Suivi du dedouanement'],
+    ['13', 'Pret pour retrait', 'Aucun', 'Notifier le client'],
+    ['14', 'Livre', 'Aucun', 'Confirmer la livraison'],
+]
+
+
 def make_status_table():
     """Create the 14-step status workflow table."""
     header = ['Etape', 'Statut', 'Documents requis', 'Action collaborateur']
 
-    rows = [
-        ['1', 'Acompte paye', 'Aucun', 'Confirmer la reception du paiement'],
-        ['2', 'Vehicule bloque', 'Photos du vehicule', 'Uploader les photos actuelles'],
-        ['3', 'Inspection envoyee', 'Rapport d\'inspection', 'Uploader le rapport (PDF/photos)'],
-        ['4', 'Paiement total recu', 'Facture Driveby (auto)', 'Confirmer le paiement complet'],
-        ['5', 'Vehicule achete', 'Facture d\'achat (interne)', 'Saisir le prix d\'achat reel'],
-        ['6', 'Reception vehicule', 'Photos de reception (interne)', 'Attribuer le transitaire'],
-        ['7', 'Douane export', 'Docs douane export (interne)', 'Uploader les documents export'],
-        ['8', 'En transit', 'Aucun', 'Mettre a jour le statut'],
-        ['9', 'Au port', 'Photo plomb + chargement', 'Uploader photos container'],
-        ['10', 'En mer', 'URL de suivi', 'Ajouter le lien de tracking'],
-        ['11', 'Documentation', 'BL, Packing list, Relache', 'Uploader tous les documents'],
-        ['12', 'En douane', 'Aucun', 'Suivi du dedouanement'],
-        ['13', 'Pret pour retrait', 'Aucun', 'Notifier le client'],
-        ['14', 'Livre', 'Aucun', 'Confirmer la livraison'],
-    ]
-
-    data = [header] + rows
+    data = [header] + STATUS_ROWS
     col_widths = [35, 95, 140, 195]
     t = Table(data, colWidths=col_widths, repeatRows=1)
 
@@ -251,103 +241,32 @@ def make_shortcut_table():
     return t
 
 
-def draw_cover(c, doc):
-    """Draw the cover page."""
-    c.saveState()
-
-    # Full page gradient background
-    c.setFillColor(COD_GRAY)
-    c.rect(0, 0, WIDTH, HEIGHT, fill=1, stroke=0)
-
-    # Mandarin accent bar at top
-    c.setFillColor(MANDARIN)
-    c.rect(0, HEIGHT - 8 * mm, WIDTH, 8 * mm, fill=1, stroke=0)
-
-    # Decorative circle
-    c.setFillColor(HexColor('#2a2a2a'))
-    c.circle(WIDTH / 2, HEIGHT / 2 + 40 * mm, 80 * mm, fill=1, stroke=0)
-
-    # Logo area
-    c.setFillColor(MANDARIN)
-    c.roundRect(WIDTH / 2 - 50 * mm, HEIGHT - 75 * mm, 100 * mm, 30 * mm, 6, fill=1, stroke=0)
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 24)
-    c.drawCentredString(WIDTH / 2, HEIGHT - 60 * mm, 'DRIVEBY AFRICA')
-
-    # Title
-    c.setFillColor(white)
-    c.setFont('Helvetica-Bold', 30)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 25 * mm, 'Guide du Collaborateur')
-
-    # Subtitle
-    c.setFillColor(HexColor('#FFCCAA'))
-    c.setFont('Helvetica', 16)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 + 5 * mm, 'Gestion des commandes')
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 10 * mm, 'et suivi des livraisons')
-
-    # Divider line
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(2)
-    c.line(WIDTH / 2 - 40 * mm, HEIGHT / 2 - 25 * mm, WIDTH / 2 + 40 * mm, HEIGHT / 2 - 25 * mm)
+COVER = guidelib.CoverPage(
+    'Guide du Collaborateur',
+    ('Gestion des commandes', 'et suivi des livraisons'),
+    version='Version 2.0 - Fevrier 2026',
+    notice='Document interne - Usage reserve aux collaborateurs Driveby Africa',
+)
 
-    # Version info
-    c.setFillColor(HexColor('#888888'))
-    c.setFont('Helvetica', 11)
-    c.drawCentredString(WIDTH / 2, HEIGHT / 2 - 40 * mm, 'Version 2.0 - Fevrier 2026')
 
-    # Footer
-    c.setFillColor(HexColor('#666666'))
-    c.setFont('Helvetica', 9)
-    c.drawCentredString(WIDTH / 2, 25 * mm, 'Document interne - Usage reserve aux collaborateurs Driveby Africa')
+def draw_cover(c, doc):
+    """Draw the cover page."""
+    COVER.draw(c, doc)
 
-    # Bottom mandarin bar
-    c.setFillColor(MANDARIN)
-    c.rect(0, 0, WIDTH, 4 * mm, fill=1, stroke=0)
 
-    c.restoreState()
+CHROME = guidelib.PageChrome(
+    'Driveby Africa - Guide Collaborateur',
+    'Document confidentiel',
+)
 
 
 def header_footer(c, doc):
     """Add header and footer to each page."""
-    c.saveState()
-
-    # Header line
-    c.setStrokeColor(MANDARIN)
-    c.setLineWidth(1.5)
-    c.line(2 * cm, HEIGHT - 1.5 * cm, WIDTH - 2 * cm, HEIGHT - 1.5 * cm)
-
-    # Header text
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, HEIGHT - 1.3 * cm, 'Driveby Africa - Guide Collaborateur')
-    c.drawRightString(WIDTH - 2 * cm, HEIGHT - 1.3 * cm, 'v2.0')
-
-    # Footer
-    c.setStrokeColor(BORDER_COLOR)
-    c.setLineWidth(0.5)
-    c.line(2 * cm, 1.5 * cm, WIDTH - 2 * cm, 1.5 * cm)
+    CHROME.draw(c, f'Page {doc.page}', doc)
 
-    c.setFillColor(HexColor('#999999'))
-    c.setFont('Helvetica', 8)
-    c.drawString(2 * cm, 1 * cm, 'Document confidentiel')
-    c.drawRightString(WIDTH - 2 * cm, 1 * cm, f'Page {doc.page}')
-
-    c.restoreState()
-
-
-def build_guide():
-    """Build the complete PDF guide."""
-    output_path = '/Users/user/Downloads/drivebyafrica-main/Guide-Collaborateur-Driveby-Africa.pdf'
-
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        topMargin=2.2 * cm,
-        bottomMargin=2 * cm,
-        leftMargin=2 * cm,
-        rightMargin=2 * cm,
-    )
 
+def build_story():
+    """Assemble the flowables of the guide."""
     story = []
 
     # ==========================================
@@ -363,41 +282,15 @@ def build_guide():
     story.append(Paragraph('Sommaire', styles['h1']))
     story.append(Spacer(1, 8))
 
-    toc_items = [
-        ('1.', 'Se connecter au portail collaborateur'),
-        ('2.', 'Tableau de bord - Vue d\'ensemble'),
-        ('3.', 'Gestion des commandes'),
-        ('4.', 'Workflow des 14 etapes'),
-        ('5.', 'Mettre a jour le statut d\'une commande'),
-        ('6.', 'Uploader des documents'),
-        ('7.', 'Etapes speciales : achat et reception'),
-        ('8.', 'Contacter un client via WhatsApp'),
-        ('9.', 'Gestion des vehicules'),
-        ('10.', 'Gestion des lots (batches)'),
-        ('11.', 'Notifications et temps reel'),
-        ('12.', 'Aide-memoire rapide'),
-    ]
-
-    for num, title in toc_items:
-        data = [[
-            Paragraph(f'<b>{num}</b>', ParagraphStyle('toc_num', parent=styles['toc_item'], textColor=MANDARIN)),
-            Paragraph(title, styles['toc_item'])
-        ]]
-        t = Table(data, colWidths=[30, WIDTH - 4.5 * cm])
-        t.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('TOPPADDING', (0, 0), (-1, -1), 2),
-            ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE')),
-        ]))
-        story.append(t)
+    story.append(guidelib.Contents(styles['toc_item'], MANDARIN,
+                                   (guidelib.CONTENTS_NUMBER_WIDTH, WIDTH - 4 * cm - guidelib.CONTENTS_NUMBER_WIDTH)))
 
     story.append(PageBreak())
 
     # ==========================================
     # SECTION 1: CONNEXION
     # ==========================================
-    story.append(Paragraph('1. Se connecter au portail', styles['h1']))
+    story.append(Paragraph('<a name="login"/>1. Se connecter au portail', styles['h1']))
     story.append(Paragraph(
         'Le portail collaborateur est accessible a l\'adresse <b>/collaborator/login</b>. '
         'Seuls les utilisateurs ayant le role <b>collaborator</b>, <b>admin</b> ou <b>super_admin</b> '
@@ -426,7 +319,7 @@ def build_guide():
     # ==========================================
     # SECTION 2: TABLEAU DE BORD
     # ==========================================
-    story.append(Paragraph('2. Tableau de bord', styles['h1']))
+    story.append(Paragraph('<a name="dashboard"/>2. Tableau de bord', styles['h1']))
     story.append(Paragraph(
         'Le tableau de bord vous donne une vue d\'ensemble de l\'activite en cours. '
         'Il se met a jour en temps reel.',
@@ -488,7 +381,7 @@ def build_guide():
     # ==========================================
     # SECTION 3: GESTION DES COMMANDES
     # ==========================================
-    story.append(Paragraph('3. Gestion des commandes', styles['h1']))
+    story.append(Paragraph('<a name="order-management"/>3. Gestion des commandes', styles['h1']))
     story.append(Paragraph(
         'La page Commandes est le coeur de votre activite quotidienne. Elle vous permet de suivre, '
         'mettre a jour et gerer l\'ensemble des commandes.',
@@ -544,7 +437,7 @@ def build_guide():
     # ==========================================
     # SECTION 4: WORKFLOW 14 ETAPES
     # ==========================================
-    story.append(Paragraph('4. Workflow des 14 etapes', styles['h1']))
+    story.append(Paragraph('<a name="workflow"/>4. Workflow des 14 etapes', styles['h1']))
     story.append(Paragraph(
         'Chaque commande suit un processus en 14 etapes, de la reception de l\'acompte '
         'jusqu\'a la livraison finale. Certaines etapes necessitent des documents ou des actions specifiques.',
@@ -572,7 +465,7 @@ def build_guide():
     # ==========================================
     # SECTION 5: METTRE A JOUR UN STATUT
     # ==========================================
-    story.append(Paragraph('5. Mettre a jour le statut', styles['h1']))
+    story.append(Paragraph('<a name="update-order-status"/>5. Mettre a jour le statut', styles['h1']))
     story.append(Paragraph(
         'Pour faire avancer une commande dans le workflow, vous devez mettre a jour son statut. '
         'Voici la procedure etape par etape :',
@@ -614,7 +507,7 @@ def build_guide():
     # ==========================================
     # SECTION 6: DOCUMENTS
     # ==========================================
-    story.append(Paragraph('6. Uploader des documents', styles['h1']))
+    story.append(Paragraph('<a name="upload-documents"/>6. Uploader des documents', styles['h1']))
     story.append(Paragraph(
         'Chaque etape du workflow peut necessiter des documents specifiques (photos, PDF, liens). '
         'La section "Documents" dans le detail de la commande vous montre ce qui est attendu.',
@@ -680,7 +573,7 @@ def build_guide():
     # ==========================================
     # SECTION 7: ETAPES SPECIALES
     # ==========================================
-    story.append(Paragraph('7. Etapes speciales', styles['h1']))
+    story.append(Paragraph('<a name="special-steps"/>7. Etapes speciales', styles['h1']))
 
     # Vehicle Purchased
     story.append(Paragraph('Etape 5 : Vehicule achete', styles['h2']))
@@ -748,7 +641,7 @@ def build_guide():
     # ==========================================
     # SECTION 8: WHATSAPP
     # ==========================================
-    story.append(Paragraph('8. Contacter un client', styles['h1']))
+    story.append(Paragraph('<a name="contact-client"/>8. Contacter un client', styles['h1']))
     story.append(Paragraph(
         'Vous pouvez contacter directement un client via WhatsApp depuis l\'application. '
         'Le message est pre-rempli avec le nom du client et le numero de commande.',
@@ -781,7 +674,7 @@ def build_guide():
     # ==========================================
     # SECTION 9: VEHICULES
     # ==========================================
-    story.append(Paragraph('9. Gestion des vehicules', styles['h1']))
+    story.append(Paragraph('<a name="vehicle-management"/>9. Gestion des vehicules', styles['h1']))
     story.append(Paragraph(
         'La section "Vehicles" vous permet de gerer les vehicules que vous proposez. '
         'Vous pouvez ajouter, modifier et supprimer des vehicules.',
@@ -826,7 +719,7 @@ def build_guide():
     # ==========================================
     # SECTION 10: LOTS
     # ==========================================
-    story.append(Paragraph('10. Gestion des lots', styles['h1']))
+    story.append(Paragraph('<a name="batch-management"/>10. Gestion des lots', styles['h1']))
     story.append(Paragraph(
         'La section "Batches" permet de gerer des lots de vehicules identiques '
         '(meme marque, modele, annee) pour la vente en gros.',
@@ -846,7 +739,7 @@ def build_guide():
     # ==========================================
     # SECTION 11: NOTIFICATIONS
     # ==========================================
-    story.append(Paragraph('11. Notifications et temps reel', styles['h1']))
+    story.append(Paragraph('<a name="notifications"/>11. Notifications et temps reel', styles['h1']))
     story.append(Paragraph(
         'L\'application fonctionne en <b>temps reel</b>. Lorsqu\'un autre collaborateur ou un '
         'administrateur met a jour une commande, votre ecran se rafraichit automatiquement.',
@@ -883,7 +776,7 @@ def build_guide():
     # ==========================================
     # SECTION 12: AIDE-MEMOIRE
     # ==========================================
-    story.append(Paragraph('12. Aide-memoire rapide', styles['h1']))
+    story.append(Paragraph('<a name="quick-reference"/>12. Aide-memoire rapide', styles['h1']))
     story.append(Spacer(1, 8))
 
     story.append(make_shortcut_table())
@@ -927,10 +820,22 @@ def build_guide():
     ]))
     story.append(t)
 
-    # Build the PDF
-    doc.build(story, onFirstPage=draw_cover, onLaterPages=header_footer)
-    print(f'PDF generated: {output_path}')
+    return story
+
+
+def build_guide(output=None, **options):
+    """Build the complete PDF guide.
+
+    ``output`` is a path or a writable binary stream and defaults to
+    ``public/guides/OUTPUT_NAME``; ``options`` go to ``guidelib.build_pdf``.
+    """
+    if output is None:
+        output = guidelib.default_output(OUTPUT_NAME)
+    guidelib.build_pdf(output, build_story(), draw_cover, header_footer, **options)
+    if isinstance(output, str):
+        print(f'PDF generated: {output}')
+    return output
 
 
 if __name__ == '__main__':
-    build_guide()
+    guidelib.main(sys.modules[__name__])
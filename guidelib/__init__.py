@@ -0,0 +1,16 @@
+"""Shared build tooling for the Driveby Africa guide PDFs (guide-*.py)."""
+
+from .build import (
+    GUIDE_SCRIPTS, OUTPUT_DIR, build_pdf, default_output, load_guide, main, render_bytes,
+)
+from .chrome import FramedBox, PageChrome, StepBadge
+from .cover import CoverPage, cover_art
+from .fragments import FRAGMENTS, InternedParagraph
+from .toc import CONTENTS_NUMBER_WIDTH, Contents
+from .writer import IncrementalCanvas, StreamingPDFDocument
+
+__all__ = [
+    'CONTENTS_NUMBER_WIDTH', 'FRAGMENTS', 'GUIDE_SCRIPTS', 'OUTPUT_DIR', 'Contents', 'CoverPage', 'FramedBox',
+    'IncrementalCanvas', 'InternedParagraph', 'PageChrome', 'StepBadge', 'StreamingPDFDocument', 'build_pdf',
+    'cover_art', 'default_output', 'load_guide', 'main', 'render_bytes',
+]
@@ -0,0 +1,495 @@
+"""Building guides: document setup, output targets and guide discovery."""
+
+import argparse
+import importlib.util
+import inspect
+import io
+import os
+import sys
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas as canvasmod
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, SimpleDocTemplate
+
+from . import draft as draftmod
+from . import linebreaks as linebreaksmod
+from . import optimize as optimizemod
+from . import reproducible as reproduciblemod
+from . import toc as tocmod
+from .writer import IncrementalCanvas
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(ROOT, 'public', 'guides')
+
+# top, bottom, left and right page margins of the A4 edition
+MARGINS = (2.2 * cm, 2 * cm, 2 * cm, 2 * cm)
+
+
+class Edition:
+    """Page layout of an edition of the guides: page size, margins and text columns."""
+
+    def __init__(self, name, pagesize=A4, margins=MARGINS, columns=1, gap=1 * cm):
+        self.name = name
+        self.pagesize = tuple(pagesize)
+        self.margins = margins
+        self.columns = columns
+        self.gap = gap
+
+    @property
+    def column_width(self):
+        """Width of a text column, as the A4 story uses the width of its frame."""
+        _, _, left, right = self.margins
+        return (self.pagesize[0] - left - right - self.gap * (self.columns - 1)) / self.columns
+
+    @property
+    def cache_key(self):
+        key = '%dx%d' % self.pagesize
+        return key if self.columns == 1 else '%s-%dcol' % (key, self.columns)
+
+
+A4_EDITION = Edition('a4')
+
+GUIDE_SCRIPTS = (
+    'guide-collaborateur.py',
+    'guide-collaborateur-en.py',
+    'guide-collaborateur-zh.py',
+    'guide-admin.py',
+    'guide-admin-en.py',
+    'guide-admin-zh.py',
+)
+
+
+def default_output(name):
+    """Path of a guide PDF inside ``public/guides``."""
+    return os.path.join(OUTPUT_DIR, name)
+
+
+def cover_name(name):
+    """File name of the standalone cover preview of guide ``name``."""
+    return os.path.splitext(name)[0] + '-cover.pdf'
+
+
+def load_guide(script):
+    """Import a ``guide-*.py`` script as a module without running it."""
+    path = script if os.path.isabs(script) else os.path.join(ROOT, script)
+    if not path.endswith('.py'):
+        path += '.py'
+    name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_postprocessed(output, data, optimize=None, linearize=False):
+    """Write ``data`` after the optimize profile and/or linearization.
+
+    Linearized output is verified before it is written; the size change is
+    reported on stderr.
+    """
+    # imported here, like search and sections below, so that running them
+    # with ``python -m`` does not import them twice
+    from . import linearize as linearizemod
+
+    if optimize:
+        result = optimizemod.optimize(data, optimize, linearize=linearize)
+    else:
+        result = linearizemod.linearize(data) if linearize else data
+    if linearize:
+        problems = linearizemod.verify(result)
+        if problems:
+            raise ValueError('linearized output is invalid: ' + '; '.join(problems))
+    if hasattr(output, 'write'):
+        output.write(result)
+    else:
+        with open(output, 'wb') as f:
+            f.write(result)
+    label = os.path.basename(output) if isinstance(output, str) else 'PDF'
+    steps = ([optimize + ' profile'] if optimize else []) + (['linearized'] if linearize else [])
+    print('%s: %d -> %d bytes (%+.1f%%, %s)' % (
+        label, len(data), len(result), 100.0 * (len(result) - len(data)) / len(data), ', '.join(steps),
+    ), file=sys.stderr)
+    return result
+
+
+def build_pdf(output, story, on_first_page, on_later_pages, incremental=False, optimize=None,
+              linearize=False, reproducible=False, sections=None, search=None, knowledge=None,
+              mobile=None, compact=None, thumbnails=None, draft=False, recipient=None,
+              edition=A4_EDITION):
+    """Lay out ``story`` as a guide, A4 by default, and write it to ``output``.
+
+    ``output`` is a file path or any writable binary stream (an open file,
+    ``io.BytesIO``, an HTTP response body, ``sys.stdout.buffer``).  With
+    ``incremental`` each page is written as soon as it is laid out.
+    ``optimize`` names a profile of ``guidelib.optimize`` applied to the
+    finished document, ``linearize`` writes it for fast web view.  With
+    ``reproducible`` the same inputs always give the same bytes, see
+    ``guidelib.reproducible``.  A ``guidelib.Contents`` in the story is
+    filled from the ``h1`` headings, see ``guidelib.toc``; ``sections``
+    names a directory that also receives every ``h1`` section as a PDF of
+    its own, see ``guidelib.sections``.  ``search`` and ``knowledge`` are
+    the paths of a search index of the text (``guidelib.search``) and of
+    its knowledge base export (``guidelib.knowledge``).  ``mobile`` and
+    ``compact`` are the paths of the mobile and the compact two-column
+    editions, laid out from the same story after this one, see
+    ``guidelib.mobile`` and ``guidelib.compact``.  ``thumbnails`` names a
+    directory that receives images of the first pages, rendered from the
+    finished PDF, see ``guidelib.thumbnails``.  A ``draft`` is laid
+    out as the regular build but drawn without the decorations, see
+    ``guidelib.draft``.  ``recipient`` is the name stamped on the cover
+    and every footer of a personal guide, see ``guidelib.personal``.
+    ``edition`` is the ``Edition`` being built.
+    Paragraph line breaks are kept between builds, see
+    ``guidelib.linebreaks``.  What is made of the guide once it is laid
+    out is written by the steps of ``PIPELINE``.
+    """
+    postprocess = optimize or linearize
+    if postprocess:
+        if incremental:
+            raise ValueError('optimized and linearized output rewrite the whole document, '
+                             'they cannot be combined with incremental output')
+        if optimize:
+            optimizemod.check_profile(optimize)
+        optimizemod.require_pikepdf()
+        target, output = output, io.BytesIO()
+    if draft:
+        if mobile is not None or compact is not None:
+            raise ValueError('a draft previews the A4 layout, it cannot be combined with '
+                             'the mobile and compact editions')
+        story = draftmod.draft(story)
+    if thumbnails is not None:
+        from . import thumbnails as thumbnailsmod
+
+        thumbnailsmod.require_pymupdf()
+        if not isinstance(output, (str, io.BytesIO)):
+            raise ValueError('thumbnails are rendered from the finished PDF, '
+                             'write it to a file or an io.BytesIO')
+    cache_name = toc_cache_name(on_first_page, edition)
+    contents = tocmod.ContentsLayout.find(story, cache_name)
+    line_breaks = linebreaksmod.LineBreaks(cache_name)
+    linebreaksmod.attach(contents.flowables if contents is not None else story, line_breaks)
+    for option, value in (('sections', sections), ('search', search), ('knowledge', knowledge)):
+        if value is not None and contents is None:
+            raise ValueError('%s output needs a guidelib.Contents in the story to find its sections'
+                             % option)
+    canvasmaker = IncrementalCanvas if incremental else canvasmod.Canvas
+    if reproducible:
+        # A4 digests are left as they were before there were other editions
+        other = {} if edition is A4_EDITION else {'edition': edition.name}
+        if draft:
+            other['draft'] = True
+        if recipient is not None:
+            other['recipient'] = recipient
+        digest = reproduciblemod.guide_digest(
+            on_first_page, incremental=incremental, optimize=optimize, linearize=linearize, **other
+        )
+        canvasmaker = reproduciblemod.pinned_id(canvasmaker, digest)
+    if draft:
+        canvasmaker = draftmod.draft_canvas(canvasmaker)
+    if recipient is not None:
+        from .personal import recipient_canvas
+
+        canvasmaker = recipient_canvas(canvasmaker, recipient)
+    if contents is None:
+        doc = _layout(output, story, on_first_page, on_later_pages, canvasmaker, reproducible,
+                      edition=edition)
+    else:
+        doc = _layout_with_contents(output, contents, on_first_page, on_later_pages, canvasmaker,
+                                    reproducible, incremental, edition)
+    build = Build(doc, output, target if postprocess else output, story, contents, line_breaks,
+                  on_first_page, on_later_pages, optimize=optimize, linearize=linearize,
+                  reproducible=reproducible, sections=sections, search=search, knowledge=knowledge,
+                  mobile=mobile, compact=compact, thumbnails=thumbnails)
+    for step in PIPELINE:
+        step(build)
+    return doc
+
+
+class Build:
+    """A laid out guide, handed to the steps of ``PIPELINE`` with the options of the build.
+
+    ``pdf`` is where it was laid out to, ``output`` where the guide goes:
+    the same unless it is optimized or linearized on the way.
+    """
+
+    def __init__(self, doc, pdf, output, story, contents, line_breaks, on_first_page, on_later_pages, *,
+                 optimize, linearize, reproducible, sections, search, knowledge, mobile, compact,
+                 thumbnails):
+        self.doc = doc
+        self.pdf = pdf
+        self.output = output
+        self.story = story
+        self.contents = contents
+        self.line_breaks = line_breaks
+        self.on_first_page = on_first_page
+        self.on_later_pages = on_later_pages
+        self.optimize = optimize
+        self.linearize = linearize
+        self.reproducible = reproducible
+        self.sections = sections
+        self.search = search
+        self.knowledge = knowledge
+        self.mobile = mobile
+        self.compact = compact
+        self.thumbnails = thumbnails
+
+
+def _postprocess(build):
+    if build.optimize or build.linearize:
+        write_postprocessed(build.output, build.pdf.getvalue(), build.optimize, build.linearize)
+
+
+def _write_thumbnails(build):
+    if build.thumbnails is not None:
+        from . import thumbnails as thumbnailsmod
+
+        thumbnailsmod.write_thumbnails(build.thumbnails, thumbnailsmod.pdf_data(build.pdf))
+
+
+def _write_search(build):
+    if build.search is not None:
+        from . import search as searchmod
+
+        searchmod.write_index(build.search, build.contents)
+
+
+def _write_knowledge(build):
+    if build.knowledge is not None:
+        from . import knowledge as knowledgemod
+
+        knowledgemod.write_export(build.knowledge, build.contents)
+
+
+def _write_sections(build):
+    if build.sections is None:
+        return
+    from . import sections as sectionsmod
+
+    def build_section(section, section_story, first_page):
+        # a few pages each: optimized like the guide but not linearized
+        buffer = io.BytesIO()
+        maker = canvasmod.Canvas
+        if build.reproducible:
+            maker = reproduciblemod.pinned_id(maker, reproduciblemod.guide_digest(
+                build.on_first_page, optimize=build.optimize, section=section.key,
+            ))
+        _layout(buffer, section_story, build.on_later_pages, build.on_later_pages, maker,
+                build.reproducible, build.contents.record, first_page)
+        data = buffer.getvalue()
+        return optimizemod.optimize(data, build.optimize) if build.optimize else data
+    sectionsmod.write_sections(build.sections, build.contents, build_section)
+
+
+def _save_line_breaks(build):
+    # after the sections, which break their paragraphs again
+    build.line_breaks.save()
+
+
+def _build_edition(build, path, editionmod, profile):
+    # the headings keep the slugs of this edition, the fragments their parse
+    flowables = editionmod.reflow(build.contents.flowables if build.contents is not None else build.story)
+    return build_pdf(path, flowables, build.on_first_page, build.on_later_pages, optimize=profile,
+                     linearize=build.linearize, reproducible=build.reproducible,
+                     edition=editionmod.EDITION)
+
+
+def _build_mobile(build):
+    if build.mobile is not None:
+        from . import mobile as mobilemod
+
+        # transfer size is what matters on a phone
+        profile = build.optimize or (mobilemod.PROFILE if optimizemod.pikepdf is not None else None)
+        _build_edition(build, build.mobile, mobilemod, profile)
+
+
+def _build_compact(build):
+    if build.compact is not None:
+        from . import compact as compactmod
+
+        compactmod.report(build.output, build.doc, build.compact,
+                          _build_edition(build, build.compact, compactmod, build.optimize))
+
+
+# what is made of a guide once it is laid out, in order: the outputs read
+# the finished PDF or the section map of its pass, the other editions are
+# laid out after it
+PIPELINE = (_postprocess, _write_thumbnails, _write_search, _write_knowledge, _write_sections,
+            _save_line_breaks, _build_mobile, _build_compact)
+
+
+def toc_cache_name(on_first_page, edition=A4_EDITION):
+    """Section map cache name of the guide defining ``on_first_page``."""
+    stem = os.path.splitext(os.path.basename(inspect.getsourcefile(on_first_page)))[0]
+    return '%s-%s' % (stem, edition.cache_key)
+
+
+def _layout(output, story, on_first_page, on_later_pages, canvasmaker, reproducible, after_flowable=None,
+            first_page=1, edition=A4_EDITION):
+    top, bottom, left, right = edition.margins
+    doc = (SimpleDocTemplate if edition.columns == 1 else BaseDocTemplate)(
+        output,
+        pagesize=edition.pagesize,
+        topMargin=top,
+        bottomMargin=bottom,
+        leftMargin=left,
+        rightMargin=right,
+        invariant=1 if reproducible else None,
+    )
+    if after_flowable is not None:
+        doc.afterFlowable = lambda flowable: after_flowable(doc, flowable)
+    if first_page != 1:
+        # called right after the page counter is reset for the build
+        doc.beforeDocument = lambda: setattr(doc, 'page', first_page - 1)
+    if edition.columns == 1:
+        doc.build(story, onFirstPage=on_first_page, onLaterPages=on_later_pages, canvasmaker=canvasmaker)
+        return doc
+    # the templates of SimpleDocTemplate, the later pages set in columns
+    width = edition.column_width
+    columns = [Frame(left + i * (width + edition.gap), bottom, width, doc.height, id='column%d' % i)
+               for i in range(edition.columns)]
+    doc.addPageTemplates([
+        PageTemplate('First', [Frame(left, bottom, doc.width, doc.height, id='normal')],
+                     onPage=on_first_page, autoNextPageTemplate='Later'),
+        PageTemplate('Later', columns, onPage=on_later_pages),
+    ])
+    doc.build(story, canvasmaker=canvasmaker)
+    return doc
+
+
+def _layout_with_contents(output, contents, on_first_page, on_later_pages, canvasmaker, reproducible,
+                          incremental, edition=A4_EDITION):
+    """Lay out a story holding a ``guidelib.Contents`` table until its page numbers hold.
+
+    A whole-document pass with stale numbers is dropped before it is saved.
+    Incremental output is already written by then: a file is simply written
+    again, and a stream, which cannot take a pass back, gets the pass whose
+    numbers hold from a buffer of its own.
+    """
+    if not incremental:
+        canvasmaker = contents.guard(canvasmaker)
+    target = output if incremental and not isinstance(output, str) else None
+    while True:
+        if target is not None:
+            output = io.BytesIO()
+        try:
+            doc = _layout(output, contents.story(), on_first_page, on_later_pages, canvasmaker,
+                          reproducible, contents.record, edition=edition)
+        except tocmod.StaleContents:
+            contents.next_pass()
+            continue
+        if not contents.next_pass():
+            break
+    if target is not None:
+        target.write(output.getvalue())
+    contents.save()
+    return doc
+
+
+def render_bytes(guide, **options):
+    """Render a guide module in memory and return the PDF bytes.
+
+    The PDF is built into a single ``io.BytesIO``; ``getvalue()`` hands back
+    its internal buffer, so nothing touches disk and the data is not copied
+    again.
+    """
+    buffer = io.BytesIO()
+    guide.build_guide(buffer, **options)
+    return buffer.getvalue()
+
+
+def add_build_arguments(parser):
+    """Options shared by the guide scripts and ``build-guides.py``."""
+    parser.add_argument('--incremental', action='store_true',
+                        help='write each page as soon as it is laid out')
+    parser.add_argument('--optimize', choices=optimizemod.PROFILES,
+                        help='rewrite the finished PDF for the given profile (needs pikepdf)')
+    parser.add_argument('--linearize', action='store_true',
+                        help='write linearized PDFs for fast web view (needs pikepdf)')
+    parser.add_argument('--reproducible', action='store_true',
+                        help='byte-identical output for identical inputs (dates from SOURCE_DATE_EPOCH)')
+    parser.add_argument('--sections', action='store_true',
+                        help='also write every section as its own PDF, with an index.json, '
+                             'into sections/<guide>/')
+    parser.add_argument('--search', action='store_true',
+                        help='also write a full-text search index of the guide to search/<guide>.json')
+    parser.add_argument('--knowledge', action='store_true',
+                        help='also export the text as knowledge base chunks, with the changes since '
+                             'the last export, to knowledge/<guide>.json')
+    parser.add_argument('--mobile', action='store_true',
+                        help='also write the mobile edition, reflowed onto a phone-sized page, '
+                             'as <guide>-Mobile.pdf')
+    parser.add_argument('--compact', action='store_true',
+                        help='also write the compact two-column print edition as <guide>-Compact.pdf')
+    parser.add_argument('--html', action='store_true',
+                        help='also write an HTML rendition of the guide to html/<guide>.html')
+    parser.add_argument('--thumbnails', action='store_true',
+                        help='also write PNG and WebP thumbnails of the first pages to thumbnails/<guide>/ '
+                             '(needs pymupdf and pillow)')
+    parser.add_argument('--draft', action='store_true',
+                        help='fast preview without box, badge, table and cover decorations, '
+                             'same line breaks and pages, as <guide>-Draft.pdf')
+
+
+def build_options(args):
+    """Keyword arguments for ``build_guide`` from parsed command line options."""
+    return {
+        'incremental': args.incremental,
+        'optimize': args.optimize,
+        'linearize': args.linearize,
+        'reproducible': args.reproducible,
+        'draft': args.draft,
+    }
+
+
+def build_argv(args):
+    """The shared build options of ``args`` as command line arguments again."""
+    argv = ['--optimize', args.optimize] if args.optimize else []
+    for flag in ('incremental', 'linearize', 'reproducible', 'draft'):
+        if getattr(args, flag):
+            argv.append('--' + flag)
+    return argv
+
+
+def main(guide, argv=None):
+    """Command line entry point of a single ``guide-*.py`` script."""
+    parser = argparse.ArgumentParser(description=guide.__doc__)
+    parser.add_argument('-o', '--output',
+                        help="output file, or '-' for stdout (default: public/guides/%s)" % guide.OUTPUT_NAME)
+    parser.add_argument('--cover', action='store_true',
+                        help='only write the cover page, for previews')
+    add_build_arguments(parser)
+    args = parser.parse_args(argv)
+    output = sys.stdout.buffer if args.output == '-' else args.output
+    if args.cover:
+        guide.COVER.render(output or default_output(cover_name(guide.OUTPUT_NAME)))
+        return
+    if args.draft and output is None:
+        output = default_output(draftmod.draft_name(guide.OUTPUT_NAME))
+    options = build_options(args)
+    directory = os.path.dirname(output) if isinstance(output, str) else OUTPUT_DIR
+    if args.sections:
+        from .sections import sections_dir
+        options['sections'] = sections_dir(directory, guide.OUTPUT_NAME)
+    if args.search:
+        from .search import search_path
+        options['search'] = search_path(directory, guide.OUTPUT_NAME)
+    if args.knowledge:
+        from .knowledge import knowledge_path
+        options['knowledge'] = knowledge_path(directory, guide.OUTPUT_NAME)
+    if args.mobile:
+        from .mobile import mobile_name
+        options['mobile'] = os.path.join(directory, mobile_name(guide.OUTPUT_NAME))
+    if args.compact:
+        from .compact import compact_name
+        options['compact'] = os.path.join(directory, compact_name(guide.OUTPUT_NAME))
+    if args.thumbnails:
+        from .thumbnails import thumbnails_dir
+        options['thumbnails'] = thumbnails_dir(directory, guide.OUTPUT_NAME)
+    guide.build_guide(output, **options)
+    if args.html:
+        from .html import html_path, write_html
+        write_html(html_path(directory, guide.OUTPUT_NAME), guide)
@@ -0,0 +1,184 @@
+"""Page chrome and repeated decorations compiled once as Form XObjects.
+
+The header/footer rules and texts, the numbered step badges and the tip box
+frames are identical wherever they appear.  Each is drawn once into a named
+Form XObject and every later occurrence is a single ``Do`` operator; only the
+parts that change (page number, step number, box text) are drawn live.
+
+Page numbers are drawn as ``/PageNumber`` marked content, which page
+hashes leave out: a page that only moved keeps its hash.
+"""
+
+import contextlib
+import hashlib
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable
+
+from .fonts import draw_string
+
+MANDARIN = HexColor('#E85D04')
+BORDER_COLOR = HexColor('#E0E0E0')
+CHROME_TEXT = HexColor('#999999')
+
+
+@contextlib.contextmanager
+def page_number(canv):
+    """Mark what is drawn on ``canv`` inside as a page number, see ``guidelib.pages``."""
+    canv.addLiteral('/PageNumber BMC')
+    yield
+    canv.addLiteral('EMC')
+
+
+def form_name(*parts):
+    """Stable XObject name for a decoration and the parameters that shape it."""
+    # kept short: the name is repeated in every page's resources and stream
+    return parts[0] + hashlib.md5(repr(parts).encode('utf-8')).hexdigest()[:6]
+
+
+def do_form(canv, name, draw, bbox):
+    """Draw the form ``name``, compiling it with ``draw(canv)`` on first use."""
+    if not canv.hasForm(name):
+        canv.beginForm(name, *bbox)
+        draw(canv)
+        canv.endForm()
+    canv.doForm(name)
+
+
+class PageChrome:
+    """Header and footer of the content pages.
+
+    ``draw`` places the static rules, title, version and confidentiality
+    notice through one shared form and only writes ``page_label`` live.
+    Given the ``doc``, it draws on the page size of the document with the
+    rules aligned to its side margin, as the mobile edition needs.  The
+    ``recipient`` of a personal guide is written live in the middle of the
+    footer.
+    """
+
+    def __init__(self, title, notice, font='Helvetica', version='v2.0', pagesize=A4, margin=2 * cm):
+        self.title = title
+        self.notice = notice
+        self.font = font
+        self.version = version
+        self.width, self.height = pagesize
+        self.margin = margin
+        self.name = form_name('C', title, notice, font, version, tuple(pagesize), margin)
+        self._resized = {}
+
+    def resized(self, pagesize, margin):
+        """This chrome for another page size and side margin."""
+        key = (tuple(pagesize), margin)
+        if key == ((self.width, self.height), self.margin):
+            return self
+        if key not in self._resized:
+            self._resized[key] = PageChrome(self.title, self.notice, self.font, self.version, *key)
+        return self._resized[key]
+
+    def draw_static(self, c):
+        width, height, margin = self.width, self.height, self.margin
+        c.setStrokeColor(MANDARIN)
+        c.setLineWidth(1.5)
+        c.line(margin, height - 1.5 * cm, width - margin, height - 1.5 * cm)
+        c.setFillColor(CHROME_TEXT)
+        c.setFont(self.font, 8)
+        c.drawString(margin, height - 1.3 * cm, self.title)
+        c.drawRightString(width - margin, height - 1.3 * cm, self.version)
+        c.setStrokeColor(BORDER_COLOR)
+        c.setLineWidth(0.5)
+        c.line(margin, 1.5 * cm, width - margin, 1.5 * cm)
+        c.setFillColor(CHROME_TEXT)
+        c.setFont(self.font, 8)
+        c.drawString(margin, 1 * cm, self.notice)
+
+    def draw(self, c, page_label, doc=None):
+        chrome = self.resized(doc.pagesize, doc.leftMargin) if doc is not None else self
+        c.saveState()
+        do_form(c, chrome.name, chrome.draw_static, (0, 0, chrome.width, chrome.height))
+        c.setFillColor(CHROME_TEXT)
+        c.setFont(chrome.font, 8)
+        with page_number(c):
+            c.drawRightString(chrome.width - chrome.margin, 1 * cm, page_label)
+        recipient = getattr(c, 'recipient', None)
+        if recipient:
+            draw_string(c, chrome.width / 2, 1 * cm, recipient, chrome.font, 8, 'middle')
+        c.restoreState()
+
+
+class StepBadge(Flowable):
+    """Round numbered badge of ``make_numbered_step``.
+
+    Replaces the one-cell rounded ``Table``: the disc is a shared form and
+    the number is drawn on top with the ``step_num`` style, centred as the
+    table cell did.
+    """
+
+    def __init__(self, number, style, color=MANDARIN, size=24):
+        super().__init__()
+        self.number = str(number)
+        self.style = style
+        self.color = color
+        self.size = size
+        self.name = form_name('B', color.hexval(), size)
+
+    def wrap(self, availWidth, availHeight):
+        return self.size, self.size
+
+    def draw_static(self, c):
+        radius = self.size / 2
+        c.setFillColor(self.color)
+        c.circle(radius, radius, radius, fill=1, stroke=0)
+
+    def draw(self):
+        c = self.canv
+        do_form(c, self.name, self.draw_static, (0, 0, self.size, self.size))
+        style = self.style
+        # a one-line paragraph in a middle-aligned cell with 3pt padding
+        baseline = (self.size - style.leading) / 2 + style.leading - style.fontSize
+        c.setFillColor(style.textColor)
+        c.setFont(style.fontName, style.fontSize)
+        c.drawCentredString(self.size / 2, baseline, self.number)
+
+
+class FramedBox(Flowable):
+    """Rounded, filled and outlined box around a single flowable.
+
+    Equivalent to the one-cell ``Table`` with BACKGROUND, BOX and
+    ROUNDEDCORNERS used for tip boxes.  Frames are shared by size, so tip
+    boxes of the same height reuse one form.
+    """
+
+    def __init__(self, content, width, background, border, padding=(14, 10),
+                 radius=4, border_width=1):
+        super().__init__()
+        self.content = content
+        self.width = width
+        self.background = background
+        self.border = border
+        self.hpad, self.vpad = padding
+        self.radius = radius
+        self.border_width = border_width
+        # tables are centred in the frame, keep the box where the table was
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        _, h = self.content.wrap(self.width - 2 * self.hpad, availHeight)
+        self.height = h + 2 * self.vpad
+        return self.width, self.height
+
+    def draw_static(self, c):
+        c.setFillColor(self.background)
+        c.setStrokeColor(self.border)
+        c.setLineWidth(self.border_width)
+        c.roundRect(0, 0, self.width, self.height, self.radius, stroke=1, fill=1)
+
+    def draw(self):
+        name = form_name('F', self.background.hexval(), self.border.hexval(),
+                         round(self.width, 2), round(self.height, 2), self.radius,
+                         self.border_width)
+        lw = self.border_width
+        do_form(self.canv, name, self.draw_static,
+                (-lw, -lw, self.width + lw, self.height + lw))
+        self.content.drawOn(self.canv, self.hpad, self.vpad)
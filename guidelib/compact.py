@@ -0,0 +1,99 @@
+"""Compact print edition: A4 with the body set in two columns.
+
+Reference sections such as the quick reference and the admin tables fill
+a fraction of each A4 page of the regular edition.  The compact edition
+lays the same story out on ``BaseDocTemplate`` page templates: the cover
+page as it is, every later page in two frames.  It reuses the reflow of
+``guidelib.mobile`` for the column width, on a smaller type scale and
+with tighter table padding, and sections only start a new column when
+fewer than ``SECTION_SPACE`` points are left in the current one.
+
+The build reports the page count and size against the regular edition:
+
+    python build-guides.py --compact
+"""
+
+import os
+import sys
+
+from reportlab.lib.units import cm
+from reportlab.platypus import CondPageBreak, PageBreak
+
+from .build import Edition
+from .mobile import Reflow
+from .mobile import font_size as mobile_font_size
+
+EDITION = Edition('compact', columns=2)
+# print reads well smaller than a screen
+TYPE_SCALE = 0.9
+# largest vertical cell padding of the steps and boxes
+CELL_PADDING = 3
+SECTION_SPACE = 8 * cm
+HEADINGS = ('h1', 'h2', 'h3')
+
+
+def compact_name(name):
+    """File name of the compact edition of guide ``name``."""
+    return os.path.splitext(name)[0] + '-Compact.pdf'
+
+
+def font_size(size):
+    """Compact size of text set at ``size`` in the A4 edition."""
+    return mobile_font_size(size) * TYPE_SCALE
+
+
+class CompactReflow(Reflow):
+    """``Reflow`` for the columns: headings kept with what follows, tables tighter."""
+
+    def __init__(self, width):
+        super().__init__(width, font_size, padding=(5, 3))
+
+    def style(self, style):
+        scaled = super().style(style)
+        if style.name in HEADINGS:
+            scaled.keepWithNext = 1
+        return scaled
+
+    def table(self, table):
+        result = super().table(table)
+        for row in result._cellStyles:
+            for cell in row:
+                cell.topPadding = min(cell.topPadding, CELL_PADDING)
+                cell.bottomPadding = min(cell.bottomPadding, CELL_PADDING)
+        return result
+
+
+def reflow(story):
+    """The flowables of ``story`` laid out for the columns.
+
+    The page break after the cover is kept, the others become conditional
+    column breaks.
+    """
+    reflowed = CompactReflow(EDITION.column_width)
+    flowables = []
+    cover = True
+    for flowable in story:
+        if isinstance(flowable, PageBreak) and not cover:
+            flowables.append(CondPageBreak(SECTION_SPACE))
+            continue
+        cover = cover and not isinstance(flowable, PageBreak)
+        flowables.append(reflowed.flowable(flowable))
+    return flowables
+
+
+def _size(output):
+    if isinstance(output, str):
+        return os.path.getsize(output)
+    getbuffer = getattr(output, 'getbuffer', None)
+    return getbuffer().nbytes if getbuffer is not None else None
+
+
+def report(output, doc, compact_output, compact_doc):
+    """Print the pages and bytes of the compact edition against the regular one."""
+    size, compact_size = _size(output), _size(compact_output)
+    label = os.path.basename(compact_output) if isinstance(compact_output, str) else 'compact PDF'
+    line = '%s: %d -> %d pages (%+.1f%%)' % (
+        label, doc.page, compact_doc.page, 100.0 * (compact_doc.page - doc.page) / doc.page)
+    if size and compact_size:
+        line += ', %d -> %d bytes (%+.1f%%)' % (size, compact_size, 100.0 * (compact_size - size) / size)
+    print(line, file=sys.stderr)
@@ -0,0 +1,141 @@
+"""Cover page: shared vector artwork with the audience and locale text on top.
+
+Every guide has the same cover background, accent bars, decorative circle,
+logo block and divider; only the title, subtitle, version line and notice
+differ.  The artwork is compiled to PDF operators once per process and
+replayed into each cover as a literal block, the text is drawn live.
+
+The layout is drawn for A4 and scaled to other page sizes, the mobile
+edition among them: positions and shapes follow the page, text that would
+no longer fit is set smaller.
+"""
+
+import functools
+
+from reportlab.lib.colors import HexColor, white
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as canvasmod
+
+from .chrome import MANDARIN
+from .fonts import draw_string, string_width
+
+COD_GRAY = HexColor('#1a1a1a')
+
+
+def _scale(pagesize):
+    """Horizontal and vertical scale of the A4 cover layout on ``pagesize``."""
+    return pagesize[0] / A4[0], pagesize[1] / A4[1]
+
+
+def _fit(text, font, size, width):
+    """``size``, or less so that ``text`` is at most ``width`` wide."""
+    text_width = stringWidth(text, font, size)
+    if not text_width:
+        return size
+    return min(size, size * width / text_width)
+
+
+@functools.lru_cache(maxsize=None)
+def cover_art(pagesize=A4):
+    """PDF operators of the locale-independent cover artwork, per page size.
+
+    The artwork uses no fonts or images, so the operators do not depend on
+    the document they are replayed into.
+    """
+    width, height = pagesize
+    sx, sy = _scale(pagesize)
+    c = canvasmod.Canvas(None, pagesize=pagesize)
+    c.saveState()
+    c.setFillColor(COD_GRAY)
+    c.rect(0, 0, width, height, fill=1, stroke=0)
+    # accent bars
+    c.setFillColor(MANDARIN)
+    c.rect(0, height - 8 * mm, width, 8 * mm, fill=1, stroke=0)
+    c.rect(0, 0, width, 4 * mm, fill=1, stroke=0)
+    c.setFillColor(HexColor('#2a2a2a'))
+    c.circle(width / 2, height / 2 + 40 * mm * sy, 80 * mm * sx, fill=1, stroke=0)
+    # logo block, its text is drawn with the cover text
+    c.setFillColor(MANDARIN)
+    c.roundRect(width / 2 - 50 * mm * sx, height - 75 * mm * sy, 100 * mm * sx, 30 * mm * sy, 6,
+                fill=1, stroke=0)
+    c.setStrokeColor(MANDARIN)
+    c.setLineWidth(2)
+    c.line(width / 2 - 40 * mm * sx, height / 2 - 25 * mm * sy,
+           width / 2 + 40 * mm * sx, height / 2 - 25 * mm * sy)
+    c.restoreState()
+    return '\n'.join(c._code)
+
+
+class CoverPage:
+    """Cover of one guide edition.
+
+    ``draw(c, doc)`` is usable directly as ``onFirstPage`` and draws on the
+    page size of ``doc``; ``render(output)`` writes the cover alone as a
+    one-page PDF for previews.  On the canvas of a draft build (see
+    ``guidelib.draft``) only the text is drawn, in black on the white page.
+    The ``recipient`` of a personal guide (see ``guidelib.personal``) is
+    set under the version line.
+    """
+
+    logo = 'DRIVEBY AFRICA'
+
+    def __init__(self, title, subtitle, version, notice, font='Helvetica',
+                 title_font='Helvetica-Bold', title_size=30, pagesize=A4):
+        self.title = title
+        self.subtitle = subtitle
+        self.version = version
+        self.notice = notice
+        self.font = font
+        self.title_font = title_font
+        self.title_size = title_size
+        self.pagesize = pagesize
+
+    def draw(self, c, doc=None):
+        pagesize = tuple(doc.pagesize) if doc is not None else self.pagesize
+        width, height = pagesize
+        sx, sy = _scale(pagesize)
+        text_width = width - 12 * mm
+        draft = getattr(c, 'draft', False)
+
+        def fill(color):
+            c.setFillColor(COD_GRAY if draft else color)
+
+        if not draft:
+            c.addLiteral(cover_art(pagesize))
+        c.saveState()
+        fill(white)
+        c.setFont('Helvetica-Bold', _fit(self.logo, 'Helvetica-Bold', 24, 100 * mm * sx - 6 * mm))
+        c.drawCentredString(width / 2, height - 60 * mm * sy, self.logo)
+
+        c.setFont(self.title_font, _fit(self.title, self.title_font, self.title_size, text_width))
+        c.drawCentredString(width / 2, height / 2 + 25 * mm * sy, self.title)
+
+        fill(HexColor('#FFCCAA'))
+        c.setFont(self.font, min(_fit(line, self.font, 16, text_width) for line in self.subtitle))
+        for i, line in enumerate(self.subtitle):
+            c.drawCentredString(width / 2, height / 2 + 5 * mm * sy - i * 15 * mm * sy, line)
+
+        fill(HexColor('#888888'))
+        c.setFont(self.font, _fit(self.version, self.font, 11, text_width))
+        c.drawCentredString(width / 2, height / 2 - 40 * mm * sy, self.version)
+
+        recipient = getattr(c, 'recipient', None)
+        if recipient:
+            fill(white)
+            size = min(13, 13 * text_width / string_width(recipient, self.font, 13))
+            draw_string(c, width / 2, height / 2 - 55 * mm * sy, recipient, self.font, size, 'middle')
+
+        fill(HexColor('#666666'))
+        c.setFont(self.font, _fit(self.notice, self.font, 9, text_width))
+        c.drawCentredString(width / 2, 25 * mm * sy, self.notice)
+        c.restoreState()
+
+    def render(self, output):
+        """Write the cover alone to ``output`` (a path or binary stream)."""
+        c = canvasmod.Canvas(output, pagesize=self.pagesize)
+        self.draw(c)
+        c.showPage()
+        c.save()
+        return output
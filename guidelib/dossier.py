@@ -0,0 +1,609 @@
+"""Order dossiers, built in bulk from an order export.
+
+A dossier tells a customer or a customs broker where one order stands in
+the 14-step workflow of the collaborator guide: the order, the vehicle
+and its destination, the current step and the estimated arrival, a
+timeline of the steps with the dates they were reached and the documents
+each requires, and the documents received so far.  The statuses and
+required documents are the ``STATUS_ROWS`` of the collaborator guide in
+the dossier's language, so a dossier says what the guide says, less what
+customers do not see: the admin-only reception step and the internal
+documents of the purchase, reception and export customs steps.  The
+export is a JSON array of ``orders`` rows, or JSON Lines with one order
+per line, see ``read_orders``:
+
+    python -m guidelib.dossier orders.json --out dossiers/
+    python -m guidelib.dossier - --language en --out dossiers/ < orders.jsonl
+
+Dossiers name the customer, so they go to ``--out`` and never next to
+the public guides.  Only the documents visible to the client are listed.
+
+The whole order history is built in one run.  An order that cannot be
+made a dossier, for a row that is not an order, a language without a
+guide or data the layout chokes on, is reported on stderr with the
+reason and skipped; the run goes on and exits non-zero with the count of
+the orders skipped.  The export is read one
+order at a time and a pool of worker processes builds the dossiers a
+chunk at a time, with at most ``IN_FLIGHT`` chunks per worker read
+ahead, so neither the export nor the dossiers are ever held in memory
+at once.  The first dossier of every language is built on its own, which
+settles the line break cache of its headings in ``.guide-cache``; a
+dossier has no table of contents and is laid out in a single pass.  The
+run ends with the throughput and the median and 95th percentile time per
+dossier.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import functools
+import json
+import os
+import sys
+import time
+
+from reportlab.lib.colors import HexColor, white
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+from .build import Edition, build_pdf, load_guide
+from .chrome import BORDER_COLOR, CHROME_TEXT, MANDARIN, PageChrome
+from .cover import COD_GRAY
+from .fonts import markup
+from .fragments import InternedParagraph
+from .personal import GUIDES, LIGHT_BG, Failures, percentile
+from .toc import slugify
+
+# the statuses of the 14 steps, in the order of ``STATUS_ROWS``
+STEPS = (
+    'deposit_paid', 'vehicle_locked', 'inspection_sent', 'full_payment_received',
+    'vehicle_purchased', 'vehicle_received', 'export_customs', 'in_transit', 'at_port',
+    'shipping', 'documents_ready', 'customs', 'ready_pickup', 'delivered',
+)
+# statuses of orders from before the 14-step workflow, as ORDER_STATUSES maps them
+LEGACY_STEPS = {
+    'deposit_pending': 1, 'deposit_received': 2, 'processing': 2, 'inspection_pending': 3,
+    'inspection_complete': 3, 'payment_pending': 4, 'pending_payment': 4, 'payment_received': 4,
+    'paid': 4, 'preparing_export': 7, 'shipped': 8, 'customs_clearance': 12, 'completed': 14,
+}
+# steps hidden from customers, adminOnly in ORDER_STATUSES
+ADMIN_ONLY = ('vehicle_received',)
+# steps whose required documents are internal, visibleToClient false in
+# lib/order-documents-config.ts
+INTERNAL_DOCUMENTS = ('vehicle_purchased', 'vehicle_received', 'export_customs')
+# statuses that stop the workflow
+HALTED = ('cancelled', 'pending_reassignment')
+# orders columns dating a step, for orders exported without their tracking rows
+STEP_DATES = {
+    'deposit_paid': 'deposit_paid_at',
+    'full_payment_received': 'balance_paid_at',
+    'documents_ready': 'documents_sent_at',
+}
+SUMMARY_COLUMNS = (120, 345)
+TIMELINE_COLUMNS = (35, 130, 80, 220)
+DOCUMENT_COLUMNS = (235, 150, 80)
+CURRENT_BG = HexColor('#FFF3E0')
+# dossiers handed to a worker at a time, and chunks read ahead per worker
+CHUNK_SIZE = 8
+IN_FLIGHT = 4
+READ_SIZE = 1 << 16
+
+TEXT = {
+    'fr': {
+        'chrome': 'Driveby Africa - Dossier de commande',
+        'notice': 'Document client',
+        'page': 'Page %d',
+        'title': 'Dossier de commande',
+        'order': 'Commande %s',
+        'updated': 'Mis a jour le %s',
+        'fields': ('Client', 'Vehicule', 'Destination', 'Etape actuelle', 'Arrivee estimee', 'Suivi'),
+        'step': 'Etape %d sur %d - %s',
+        'no_eta': 'Non communiquee',
+        'halted': {'cancelled': 'Commande annulee',
+                   'pending_reassignment': 'Vehicule non disponible, reassignation en cours'},
+        'unknown': 'Statut inconnu (%s)',
+        'timeline': 'Chronologie',
+        'columns': ('Etape', 'Statut', 'Date', 'Documents requis'),
+        'documents': 'Documents recus',
+        'document_columns': ('Document', 'Etape', 'Recu le'),
+        'no_documents': 'Aucun document recu pour le moment.',
+    },
+    'en': {
+        'chrome': 'Driveby Africa - Order Dossier',
+        'notice': 'Customer document',
+        'page': 'Page %d',
+        'title': 'Order Dossier',
+        'order': 'Order %s',
+        'updated': 'Updated %s',
+        'fields': ('Customer', 'Vehicle', 'Destination', 'Current step', 'Estimated arrival', 'Tracking'),
+        'step': 'Step %d of %d - %s',
+        'no_eta': 'Not yet known',
+        'halted': {'cancelled': 'Order cancelled',
+                   'pending_reassignment': 'Vehicle unavailable, being reassigned'},
+        'unknown': 'Unknown status (%s)',
+        'timeline': 'Timeline',
+        'columns': ('Step', 'Status', 'Date', 'Required Documents'),
+        'documents': 'Documents received',
+        'document_columns': ('Document', 'Step', 'Received'),
+        'no_documents': 'No documents received yet.',
+    },
+    'zh': {
+        'chrome': 'Driveby Africa - \u8ba2\u5355\u6863\u6848',  # 订单档案
+        'notice': '\u5ba2\u6237\u6587\u4ef6',  # 客户文件
+        'page': '\u7b2c %d \u9875',  # 第 X 页
+        'title': '\u8ba2\u5355\u6863\u6848',  # 订单档案
+        'order': '\u8ba2\u5355 %s',  # 订单 X
+        'updated': '\u66f4\u65b0\u4e8e %s',  # 更新于 X
+        # 客户, 车辆, 目的地, 当前步骤, 预计到达, 跟踪
+        'fields': ('\u5ba2\u6237', '\u8f66\u8f86', '\u76ee\u7684\u5730', '\u5f53\u524d\u6b65\u9aa4',
+                   '\u9884\u8ba1\u5230\u8fbe', '\u8ddf\u8e2a'),
+        'step': '\u7b2c %d \u6b65 (\u5171 %d \u6b65) - %s',  # 第 X 步 (共 Y 步) - Z
+        'no_eta': '\u672a\u63d0\u4f9b',  # 未提供
+        # 订单已取消, 车辆不可用，正在重新分配
+        'halted': {'cancelled': '\u8ba2\u5355\u5df2\u53d6\u6d88',
+                   'pending_reassignment': '\u8f66\u8f86\u4e0d\u53ef\u7528\uff0c'
+                                           '\u6b63\u5728\u91cd\u65b0\u5206\u914d'},
+        'unknown': '\u672a\u77e5\u72b6\u6001 (%s)',  # 未知状态 (X)
+        'timeline': '\u8fdb\u5ea6\u65f6\u95f4\u7ebf',  # 进度时间线
+        # 步骤, 状态, 日期, 所需文件
+        'columns': ('\u6b65\u9aa4', '\u72b6\u6001', '\u65e5\u671f', '\u6240\u9700\u6587\u4ef6'),
+        'documents': '\u5df2\u6536\u6587\u4ef6',  # 已收文件
+        # 文件, 步骤, 接收日期
+        'document_columns': ('\u6587\u4ef6', '\u6b65\u9aa4', '\u63a5\u6536\u65e5\u671f'),
+        # 目前尚未收到文件。
+        'no_documents': '\u76ee\u524d\u5c1a\u672a\u6536\u5230\u6587\u4ef6\u3002',
+    },
+}
+
+
+class DossierEdition(Edition):
+    """A4 edition of the dossiers of one language, with a line break cache of its own."""
+
+    @property
+    def cache_key(self):
+        return '%s-%s' % (super().cache_key, self.name)
+
+
+EDITIONS = {language: DossierEdition(language) for language in GUIDES}
+
+
+def step_of(status):
+    """Step of ``status`` in the workflow, 1 to 14, or 0 off the workflow."""
+    if not isinstance(status, str):
+        return 0
+    if status in STEPS:
+        return STEPS.index(status) + 1
+    return LEGACY_STEPS.get(status, 0)
+
+
+def _date(value):
+    """The day of a timestamp of the export, as ``YYYY-MM-DD``."""
+    return value[:10] if isinstance(value, str) else ''
+
+
+class Order:
+    """One order of the export and the language of its dossier.
+
+    ``row`` is a row of the ``orders`` table; its ``tracking`` entry, when
+    the export joins it, lists the ``order_tracking`` rows of the order.
+    A ``language`` in the row overrides the language of the run.
+    """
+
+    def __init__(self, row, language='fr'):
+        if not isinstance(row, dict):
+            raise ValueError('an order is a JSON object, not %r' % (row,))
+        language = row.get('language') or language
+        if language not in GUIDES:
+            raise ValueError('no collaborator guide in %r, use one of %s' % (language, ', '.join(GUIDES)))
+        if not isinstance(row.get('status'), (str, type(None))):
+            raise ValueError('status %r is not a string' % (row['status'],))
+        self.row = row
+        self.language = language
+
+    @property
+    def number(self):
+        """The order number, or the start of the order id before numbers existed."""
+        return self.row.get('order_number') or str(self.row.get('id') or '')[:8].upper()
+
+    @property
+    def step(self):
+        """The step of the order as the customer sees it: an admin-only step shows as the one before."""
+        step = step_of(self.row.get('status'))
+        while step and STEPS[step - 1] in ADMIN_ONLY:
+            step -= 1
+        return step
+
+    @property
+    def eta(self):
+        return _date(self.row.get('shipping_eta') or self.row.get('estimated_arrival'))
+
+    @property
+    def label(self):
+        """The line written in every footer."""
+        order = TEXT[self.language]['order'] % self.number
+        return ' - '.join(filter(None, (order, self.row.get('customer_name'))))
+
+    def step_dates(self):
+        """The day each step was reached, by step, from the tracking rows first."""
+        dates = {}
+        for step, column in STEP_DATES.items():
+            if self.row.get(column):
+                dates[step_of(step)] = _date(self.row[column])
+        tracked = {}
+        for entry in self.row.get('tracking') or ():
+            step = step_of(entry.get('status'))
+            if step and entry.get('completed_at'):
+                tracked[step] = min(tracked.get(step, entry['completed_at']), entry['completed_at'])
+        dates.update((step, _date(value)) for step, value in tracked.items())
+        return dates
+
+    def documents(self):
+        """The uploaded documents the client may see, oldest first."""
+        documents = [document for document in self.row.get('uploaded_documents') or ()
+                     if isinstance(document, dict) and document.get('visible_to_client', True)]
+        return sorted(documents, key=lambda document: document.get('uploaded_at') or '')
+
+
+class OrderParagraph(Paragraph):
+    """Paragraph of order data.
+
+    Neither interned nor line break cached, as ``RecipientParagraph``: no
+    two dossiers share it.
+    """
+
+
+def _stream_items(f, path):
+    """The JSON values of ``f``, an array or values one after the other, decoded one at a time."""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    array = None
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            if eof:
+                if array:
+                    raise ValueError('%s: the JSON array is not closed' % path)
+                return
+            chunk = f.read(READ_SIZE)
+            buffer, position, eof = chunk, 0, not chunk
+            continue
+        if array is None:
+            array = buffer[position] == '['
+            if array:
+                position += 1
+            continue
+        if array and buffer[position] in ',]':
+            if buffer[position] == ']':
+                return
+            position += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # a number at the end of the buffer may go on in the next chunk too
+        if end is None or end == len(buffer) and not eof:
+            # the value goes on in the next chunk
+            chunk = f.read(READ_SIZE)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+            continue
+        yield item
+        position = end
+
+
+def _row_label(row, index):
+    if isinstance(row, dict) and (row.get('order_number') or row.get('id')):
+        return 'order %s' % (row.get('order_number') or row.get('id'))
+    return 'order #%d of the export' % (index + 1)
+
+
+def read_orders(path, language='fr', failures=None):
+    """The orders of the export at ``path``, ``-`` for stdin, one at a time.
+
+    The export is a JSON array of ``orders`` rows, as the Supabase table
+    editor exports them, or JSON Lines with one row per line.  A row may
+    carry its ``order_tracking`` rows as ``tracking`` and its language as
+    ``language``; ``language`` is the language of the others.  Rows that
+    are not orders, and the rest of an export that is not valid JSON, are
+    added to ``failures`` and skipped; without ``failures`` they raise
+    ``ValueError``.
+    """
+    if path == '-':
+        yield from _orders(sys.stdin, '<stdin>', language, failures)
+        return
+    with open(path, encoding='utf-8-sig') as f:
+        yield from _orders(f, path, language, failures)
+
+
+def _orders(f, path, language, failures):
+    index = -1
+    try:
+        for index, row in enumerate(_stream_items(f, path)):
+            try:
+                yield Order(row, language)
+            except ValueError as e:
+                if failures is None:
+                    raise ValueError('%s: %s' % (_row_label(row, index), e)) from e
+                failures.add(_row_label(row, index), e)
+    except json.JSONDecodeError as e:
+        if failures is None:
+            raise
+        failures.add(path, 'not valid JSON after order #%d (%s); the rest of the export'
+                     % (index + 1, e))
+
+
+@functools.lru_cache(maxsize=None)
+def dossier_styles(language):
+    """The heading and cell styles of the dossiers in ``language``."""
+    styles = load_guide(GUIDES[language]).styles
+    return {
+        'heading': ParagraphStyle('dossier_h2', parent=styles['h2'], keepWithNext=1),
+        'cell': ParagraphStyle('dossier_cell', parent=styles['body'], fontSize=9, leading=12,
+                               spaceBefore=0, spaceAfter=0),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def page_function(language):
+    """The header and footer of the dossiers in ``language``, in the chrome of its guide."""
+    guide = load_guide(GUIDES[language])
+    text = TEXT[language]
+    chrome = PageChrome(text['chrome'], text['notice'], font=guide.CHROME.font)
+
+    def header_footer(c, doc):
+        chrome.draw(c, text['page'] % doc.page, doc)
+    return header_footer
+
+
+def _table(rows, widths, styles, commands=()):
+    t = Table(rows, colWidths=widths, repeatRows=1)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COD_GRAY),
+        ('TEXTCOLOR', (0, 0), (-1, 0), white),
+        ('FONTNAME', (0, 0), (-1, 0), styles['body_bold'].fontName),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTNAME', (0, 1), (-1, -1), styles['body'].fontName),
+        ('FONTSIZE', (0, 1), (-1, -1), 8.5),
+        ('TEXTCOLOR', (0, 1), (-1, -1), HexColor('#333333')),
+        ('GRID', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white, LIGHT_BG]),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        *commands,
+    ]))
+    return t
+
+
+def current_step(guide, order):
+    """The current step of ``order`` as the dossier states it."""
+    text = TEXT[order.language]
+    status = order.row.get('status')
+    if status in HALTED:
+        return text['halted'][status]
+    if not order.step:
+        return text['unknown'] % status
+    return text['step'] % (order.step, len(STEPS), guide.STATUS_ROWS[order.step - 1][1])
+
+
+def summary_table(guide, order):
+    """Customer, vehicle, destination, current step, estimated arrival and tracking of ``order``."""
+    text = TEXT[order.language]
+    row = order.row
+    cell = dossier_styles(order.language)['cell']
+    vehicle = ' '.join(str(row[key]) for key in ('vehicle_make', 'vehicle_model', 'vehicle_year')
+                       if row.get(key))
+    destination = ', '.join(filter(None, (row.get('destination_name') or row.get('destination_city'),
+                                          row.get('destination_port'),
+                                          row.get('destination_country'))))
+    tracking = ' - '.join(filter(None, (row.get('tracking_number'), row.get('tracking_url'))))
+    values = (row.get('customer_name'), vehicle, destination, current_step(guide, order),
+              order.eta or text['no_eta'], tracking)
+    rows = [[field, OrderParagraph(markup(str(value or '-'), cell.fontName), cell)]
+            for field, value in zip(text['fields'], values)]
+    t = Table(rows, colWidths=SUMMARY_COLUMNS)
+    t.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), guide.styles['body_bold'].fontName),
+        ('FONTSIZE', (0, 0), (0, -1), 9),
+        ('TEXTCOLOR', (0, 0), (0, -1), COD_GRAY),
+        ('BACKGROUND', (0, 0), (0, -1), LIGHT_BG),
+        ('BACKGROUND', (1, 3), (1, 3), CURRENT_BG),
+        ('GRID', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    return t
+
+
+def timeline_table(guide, order):
+    """The steps the customer sees, with the day each was reached; the current one stands out.
+
+    The required documents of a step are only given when the customer
+    gets them.
+    """
+    text = TEXT[order.language]
+    dates = order.step_dates()
+    rows = [list(text['columns'])]
+    commands = [('ALIGN', (0, 0), (0, -1), 'CENTER')]
+    current = order.step if order.row.get('status') not in HALTED else 0
+    for number, status, documents, _ in guide.STATUS_ROWS:
+        step = int(number)
+        if STEPS[step - 1] in ADMIN_ONLY:
+            continue
+        reached = step <= order.step or step in dates
+        if STEPS[step - 1] in INTERNAL_DOCUMENTS:
+            documents = ''
+        rows.append([number, status, dates.get(step, '-') if reached else '', documents])
+        row = len(rows) - 1
+        if not reached:
+            commands.append(('TEXTCOLOR', (0, row), (-1, row), CHROME_TEXT))
+        elif step == current:
+            commands += [
+                ('BACKGROUND', (0, row), (-1, row), CURRENT_BG),
+                ('FONTNAME', (0, row), (-1, row), guide.styles['body_bold'].fontName),
+                ('LINEBEFORE', (0, row), (0, row), 3, MANDARIN),
+            ]
+    return _table(rows, TIMELINE_COLUMNS, guide.styles, commands)
+
+
+def documents_table(guide, order, documents):
+    """The ``documents`` received for ``order``, with the step they belong to."""
+    text = TEXT[order.language]
+    cell = dossier_styles(order.language)['cell']
+    rows = [list(text['document_columns'])]
+    for document in documents:
+        step = step_of(document.get('status'))
+        rows.append([
+            OrderParagraph(markup(str(document.get('name') or document.get('requirement_id') or '-'), cell.fontName),
+                           cell),
+            guide.STATUS_ROWS[step - 1][1] if step else '',
+            _date(document.get('uploaded_at')),
+        ])
+    return _table(rows, DOCUMENT_COLUMNS, guide.styles)
+
+
+def dossier(guide, order):
+    """The flowables of the dossier of ``order``."""
+    text = TEXT[order.language]
+    styles = guide.styles
+    heading = dossier_styles(order.language)['heading']
+    updated = order.row.get('last_modified_at') or order.row.get('updated_at')
+    intro = markup(text['order'] % order.number, styles['body'].fontName, bold=True)
+    if updated:
+        intro += ' - %s' % (text['updated'] % _date(updated))
+    documents = order.documents()
+    return [
+        InternedParagraph(text['title'], styles['h1']),
+        OrderParagraph(intro, styles['body']),
+        Spacer(1, 4),
+        summary_table(guide, order),
+        InternedParagraph(text['timeline'], heading),
+        timeline_table(guide, order),
+        InternedParagraph(text['documents'], heading),
+        documents_table(guide, order, documents) if documents
+        else OrderParagraph(text['no_documents'], styles['body']),
+    ]
+
+
+def build_dossier(order, output):
+    """Build the dossier of ``order`` to ``output``, a path or a binary stream."""
+    guide = load_guide(GUIDES[order.language])
+    pages = page_function(order.language)
+    return build_pdf(output, dossier(guide, order), pages, pages, recipient=order.label,
+                     edition=EDITIONS[order.language])
+
+
+def file_names(orders):
+    """A unique PDF file name per order, from its number, as the orders go by."""
+    used = set()
+    for order in orders:
+        base = slugify(order.number) or 'order'
+        name, n = base, 1
+        while name in used:
+            n += 1
+            name = '%s-%d' % (base, n)
+        used.add(name)
+        yield order, name + '.pdf'
+
+
+def _timed_build(job):
+    """Seconds the dossier of ``job`` took, or None and the reason it failed."""
+    order, path = job
+    start = time.perf_counter()
+    try:
+        build_dossier(order, path)
+    except Exception as e:  # one order must not stop the run over the whole history
+        if os.path.exists(path):
+            os.remove(path)
+        return None, '%s: %s' % (type(e).__name__, e)
+    return time.perf_counter() - start, None
+
+
+def _build_chunk(chunk):
+    return [(index, _timed_build(job)) for index, job in chunk]
+
+
+def build_all(orders, directory, workers=None, failures=None):
+    """Build the dossiers of the iterable ``orders`` into ``directory``.
+
+    ``orders`` is consumed as the pool takes the dossiers.  The orders
+    whose dossier fails are added to ``failures`` and skipped.  Returns the
+    seconds each dossier built took, in export order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    failures = Failures() if failures is None else failures
+    times = {}
+    labels = {}
+    primed = set()
+    pending = collections.deque()
+    chunk = []
+
+    def collect(results):
+        for index, (seconds, error) in results:
+            if error is None:
+                times[index] = seconds
+            else:
+                failures.add(labels[index], error)
+            labels.pop(index, None)
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        for index, (order, name) in enumerate(file_names(orders)):
+            job = (order, os.path.join(directory, name))
+            labels[index] = 'order %s' % order.number
+            if order.language not in primed:
+                # the workers would all miss the line break cache of a cold start at once
+                primed.add(order.language)
+                collect([(index, _timed_build(job))])
+                continue
+            chunk.append((index, job))
+            if len(chunk) == CHUNK_SIZE:
+                pending.append(pool.submit(_build_chunk, chunk))
+                chunk = []
+                while len(pending) >= workers * IN_FLIGHT:
+                    collect(pending.popleft().result())
+        if chunk:
+            pending.append(pool.submit(_build_chunk, chunk))
+        for future in pending:
+            collect(future.result())
+    return [times[index] for index in sorted(times)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build an order dossier for every order of an export.')
+    parser.add_argument('orders', help="JSON array or JSON Lines of orders rows, '-' for stdin")
+    parser.add_argument('--out', required=True,
+                        help='output directory; the dossiers name customers, keep it out of public/')
+    parser.add_argument('--language', choices=sorted(GUIDES), default='fr',
+                        help='language of the orders without one (default: fr)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+    if args.orders != '-' and not os.path.isfile(args.orders):
+        parser.error('%s: no such file' % args.orders)
+    failures = Failures()
+    start = time.perf_counter()
+    times = build_all(read_orders(args.orders, args.language, failures), args.out, args.workers,
+                      failures)
+    elapsed = time.perf_counter() - start
+    if not times and not failures:
+        parser.error('%s lists no orders' % args.orders)
+    if times:
+        print('%d dossiers in %.1f s: %.1f dossiers/s, %.0f ms median and %.0f ms p95 per dossier' % (
+            len(times), elapsed, len(times) / elapsed, 1000 * percentile(times, 0.5),
+            1000 * percentile(times, 0.95)), file=sys.stderr)
+    if failures:
+        print('%d skipped, see above' % len(failures), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
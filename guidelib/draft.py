@@ -0,0 +1,110 @@
+"""Draft preview: the text flow of a guide without its decorations.
+
+While the copy is edited only the text and where it breaks matter.  A
+draft build lays out the same story with the decorations swapped for the
+least drawing that still shows the structure:
+
+* tip boxes are a thin outline instead of a rounded, filled form;
+* step badges are their number, without the disc;
+* tables lose their backgrounds, striping, grid lines and rounded
+  corners; text that sat on a background is set in black;
+* the cover is its text on a white page, without the artwork.
+
+Only drawing changes: every flowable wraps and splits as in the regular
+build, so line breaks and pagination are identical and the table of
+contents cache is shared with it.
+
+    python build-guides.py --draft
+"""
+
+import copy
+import os
+
+from reportlab.lib.colors import black
+from reportlab.platypus import KeepTogether, Table
+
+from .chrome import FramedBox, StepBadge
+
+# outline of the draft tip boxes, in points
+BOX_LINE_WIDTH = 0.5
+
+
+class DraftBox(FramedBox):
+    """``FramedBox`` drawn as a plain outline around its content."""
+
+    def draw(self):
+        c = self.canv
+        c.setStrokeColor(self.border)
+        c.setLineWidth(BOX_LINE_WIDTH)
+        c.rect(0, 0, self.width, self.height, stroke=1, fill=0)
+        self.content.drawOn(c, self.hpad, self.vpad)
+
+
+class DraftBadge(StepBadge):
+    """``StepBadge`` drawn as its number alone, in the colour of the disc."""
+
+    def draw(self):
+        style = self.style
+        baseline = (self.size - style.leading) / 2 + style.leading - style.fontSize
+        self.canv.setFillColor(self.color)
+        self.canv.setFont(style.fontName, style.fontSize)
+        self.canv.drawCentredString(self.size / 2, baseline, self.number)
+
+
+def draft_name(name):
+    """File name of the draft of guide ``name``."""
+    return os.path.splitext(name)[0] + '-Draft.pdf'
+
+
+def _cells(start, end, size):
+    """Indexes of a style command range, which counts negative ones from the end."""
+    return range(start % size, end % size + 1)
+
+
+def plain_table(table):
+    """``table`` without backgrounds, lines and rounded corners, cells drafted."""
+    result = copy.copy(table)
+    result._cellvalues = [[draft_flowable(value) for value in row] for row in table._cellvalues]
+    result._cellStyles = [[copy.copy(style) for style in row] for row in table._cellStyles]
+    for cmd in table._bkgrndcmds:
+        if cmd[0] != 'BACKGROUND':
+            continue  # row and column stripes sit under dark text already
+        (c0, r0), (c1, r1) = cmd[1], cmd[2]
+        for r in _cells(r0, r1, len(result._cellStyles)):
+            for c in _cells(c0, c1, len(result._cellStyles[r])):
+                result._cellStyles[r][c].color = black
+    result._bkgrndcmds = []
+    result._linecmds = []
+    result._cornerRadii = None
+    return result
+
+
+def draft_flowable(flowable):
+    """The draft counterpart of ``flowable``; flowables without decorations are kept."""
+    if isinstance(flowable, FramedBox):
+        return DraftBox(draft_flowable(flowable.content), flowable.width, flowable.background,
+                        flowable.border, (flowable.hpad, flowable.vpad), flowable.radius,
+                        flowable.border_width)
+    if isinstance(flowable, StepBadge):
+        return DraftBadge(flowable.number, flowable.style, flowable.color, flowable.size)
+    if isinstance(flowable, Table):
+        return plain_table(flowable)
+    if isinstance(flowable, KeepTogether):
+        return KeepTogether([draft_flowable(item) for item in flowable._content], flowable._maxHeight)
+    if isinstance(flowable, (list, tuple)):
+        return [draft_flowable(item) for item in flowable]
+    return flowable
+
+
+def draft(story):
+    """The flowables of ``story`` drafted; headings and paragraphs are the same objects."""
+    return [draft_flowable(flowable) for flowable in story]
+
+
+def draft_canvas(canvasmaker):
+    """Wrap ``canvasmaker`` so the cover is drawn as a draft, see ``CoverPage.draw``."""
+    def make(*args, **kwargs):
+        canv = canvasmaker(*args, **kwargs)
+        canv.draft = True
+        return canv
+    return make
@@ -0,0 +1,147 @@
+"""Fonts for the text the guides do not write themselves: names and order data.
+
+The guides are set in Helvetica, or STSong-Light in Chinese, which cover
+their own text.  A recipient's name or an order's customer can hold any
+letter, and a letter the font lacks is drawn as a box or dropped.
+``runs`` splits such text into runs of one font each: the guide's font
+where it has the letters, STSong-Light for Chinese and Japanese, and
+DejaVu Sans, embedded, for the other scripts (Latin Extended, Vietnamese,
+Cyrillic, Greek).  ``draw_string`` draws the runs on a canvas and
+``markup`` writes them as paragraph markup.
+
+DejaVu Sans is looked up where systems install it, or at
+``$GUIDE_UNICODE_FONT``, and only when a text needs it:
+``apt install fonts-dejavu-core``.
+"""
+
+import os
+import unicodedata
+from xml.sax.saxutils import escape
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfbase.ttfonts import TTFont
+
+CJK_FONT = 'STSong-Light'
+UNICODE_FONT = 'DejaVuSans'
+UNICODE_BOLD = 'DejaVuSans-Bold'
+UNICODE_FONT_PATHS = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Debian, Ubuntu
+    '/usr/share/fonts/dejavu-sans-fonts/DejaVuSans.ttf',  # Fedora
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',  # Arch
+    '/Library/Fonts/DejaVuSans.ttf',  # macOS
+    os.path.expanduser('~/Library/Fonts/DejaVuSans.ttf'),
+)
+
+
+def unicode_font_path():
+    path = os.environ.get('GUIDE_UNICODE_FONT')
+    if path:
+        return path
+    for path in UNICODE_FONT_PATHS:
+        if os.path.exists(path):
+            return path
+    raise RuntimeError('text with letters outside Latin-1 and Chinese needs DejaVu Sans: '
+                       'apt install fonts-dejavu-core, or set GUIDE_UNICODE_FONT to its TTF file')
+
+
+def register(name):
+    """Register the CJK or the Unicode font with ReportLab, once."""
+    if name in pdfmetrics.getRegisteredFontNames():
+        return
+    if name == CJK_FONT:
+        pdfmetrics.registerFont(UnicodeCIDFont(CJK_FONT))
+        # no bold: <b> keeps the face
+        pdfmetrics.registerFontFamily(CJK_FONT, normal=CJK_FONT, bold=CJK_FONT,
+                                      italic=CJK_FONT, boldItalic=CJK_FONT)
+    elif name == UNICODE_FONT:
+        path = unicode_font_path()
+        pdfmetrics.registerFont(TTFont(UNICODE_FONT, path))
+        bold_path = os.path.join(os.path.dirname(path), UNICODE_BOLD + '.ttf')
+        bold = UNICODE_FONT
+        if os.path.exists(bold_path):
+            pdfmetrics.registerFont(TTFont(UNICODE_BOLD, bold_path))
+            bold = UNICODE_BOLD
+        # <b> around a DejaVu run in a paragraph needs the family
+        pdfmetrics.registerFontFamily(UNICODE_FONT, normal=UNICODE_FONT, bold=bold,
+                                      italic=UNICODE_FONT, boldItalic=bold)
+
+
+def is_cjk(char):
+    return unicodedata.east_asian_width(char) in ('W', 'F')
+
+
+def covers(font, char):
+    """Whether ``font`` has a glyph for ``char``."""
+    if font == CJK_FONT:
+        return char < '\x7f' or is_cjk(char)
+    face = getattr(pdfmetrics.getFont(font), 'face', None)
+    if hasattr(face, 'charToGlyph'):
+        return ord(char) in face.charToGlyph
+    # the standard fonts, written in WinAnsiEncoding
+    try:
+        char.encode('cp1252')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def runs(text, font):
+    """``text`` as ``(font, part)`` runs, in ``font`` wherever it has the letters.
+
+    Spaces and punctuation stay in the run they are in when its font has
+    them.  The fonts of the other runs are registered.
+    """
+    parts = []
+    for char in text:
+        if parts and not char.isalnum() and covers(parts[-1][0], char):
+            parts[-1][1] += char
+            continue
+        if covers(font, char):
+            choice = font
+        else:
+            choice = CJK_FONT if is_cjk(char) else UNICODE_FONT
+            register(choice)
+        if parts and parts[-1][0] == choice:
+            parts[-1][1] += char
+        else:
+            parts.append([choice, char])
+    return [tuple(part) for part in parts]
+
+
+def string_width(text, font, size):
+    """Width of ``text`` set in ``font`` and the fonts of the letters it lacks."""
+    return sum(pdfmetrics.stringWidth(part, name, size) for name, part in runs(text, font))
+
+
+def draw_string(canv, x, y, text, font, size, anchor='start'):
+    """Draw ``text`` from ``x``, or centred on or ending at ``x`` for ``anchor`` middle or end.
+
+    The font of ``canv`` is ``font`` afterwards.
+    """
+    parts = runs(text, font)
+    if anchor != 'start':
+        width = sum(pdfmetrics.stringWidth(part, name, size) for name, part in parts)
+        x -= width / 2 if anchor == 'middle' else width
+    for name, part in parts:
+        canv.setFont(name, size)
+        canv.drawString(x, y, part)
+        x += pdfmetrics.stringWidth(part, name, size)
+    if parts and parts[-1][0] != font:
+        canv.setFont(font, size)
+
+
+def markup(text, font, bold=False):
+    """``text`` escaped as paragraph markup, in ``font`` wherever it has the letters.
+
+    ``<b>`` only reaches a run in another font from inside its ``<font>``
+    tag, so bold text is asked for here rather than wrapped around.
+    """
+    result = []
+    for name, part in runs(text, font):
+        part = escape(part)
+        if bold:
+            part = '<b>%s</b>' % part
+        result.append(part if name == font else '<font face="%s">%s</font>' % (name, part))
+    return ''.join(result)
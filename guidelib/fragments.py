@@ -0,0 +1,97 @@
+"""Parsed paragraph markup shared between paragraphs with the same text and style.
+
+``Paragraph`` parses its markup into fragments when it is made.  The
+paragraphs of one guide rarely repeat, but everything that builds guides
+more than once in a process does: ``build-guides.py`` and
+``render_bytes`` callers, the contents rows of every layout pass and the
+headings of the section map.  An ``InternedParagraph`` looks its
+fragments up in ``FRAGMENTS`` by markup and style fingerprint and only
+parses on a miss; paragraphs with the same markup then share one
+fragment list, which layout and drawing only read.
+
+The cache keeps the ``MAX_ENTRIES`` most recently used parses and counts
+its hits and misses:
+
+    python build-guides.py      # ends with the hit rate on stderr
+"""
+
+import collections
+import hashlib
+import weakref
+
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import textTransformFrags
+from reportlab.platypus.paraparser import ParaParser
+
+MAX_ENTRIES = 4096
+# style attributes that are not layout
+IGNORED_STYLE_KEYS = ('name', 'parent')
+
+
+def style_key(style):
+    """Fingerprint of the layout attributes of a ``ParagraphStyle``."""
+    items = sorted((k, repr(v)) for k, v in style.__dict__.items() if k not in IGNORED_STYLE_KEYS)
+    return hashlib.sha1(repr(items).encode('utf-8')).hexdigest()
+
+
+class FragmentCache:
+    """Bounded least recently used cache of paragraph markup parses."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        # styles are made once and used for many paragraphs
+        self.style_keys = weakref.WeakKeyDictionary()
+        self.hits = self.misses = 0
+
+    def parse(self, text, style, case_sensitive, cleaner):
+        """``(text, style, frags, bullet_frags)`` of ``text`` parsed with ``style``.
+
+        The style is None when the markup does not change it.
+        """
+        style_id = self.style_keys.get(style)
+        if style_id is None:
+            style_id = self.style_keys[style] = style_key(style)
+        key = (text, style_id, case_sensitive)
+        parsed = self.entries.get(key)
+        if parsed is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return parsed
+        self.misses += 1
+        text = cleaner(text)
+        parser = ParaParser()
+        parser.caseSensitive = case_sensitive
+        parsed_style, frags, bullet_frags = parser.parse(text, style)
+        if frags is None:
+            raise ValueError("xml parser error (%s) in paragraph beginning\n'%s'"
+                             % (parser.errors[0], text[:min(30, len(text))]))
+        textTransformFrags(frags, parsed_style)
+        parsed = (text, None if parsed_style is style else parsed_style, frags, bullet_frags)
+        self.entries[key] = parsed
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return parsed
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return 'paragraph fragments: %d parsed, %d shared (%.0f%% hits), %d cached' % (
+            self.misses, self.hits, 100 * self.hit_rate, len(self.entries))
+
+
+FRAGMENTS = FragmentCache()
+
+
+class InternedParagraph(Paragraph):
+    """``Paragraph`` taking the fragments of its markup from ``FRAGMENTS``."""
+
+    def _setup(self, text, style, bulletText, frags, cleaner):
+        if frags is None:
+            text, parsed_style, frags, bullet_frags = FRAGMENTS.parse(text, style, self.caseSensitive, cleaner)
+            style = parsed_style or style
+            bulletText = bullet_frags or bulletText
+        super()._setup(text, style, bulletText, frags, cleaner)
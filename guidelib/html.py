@@ -0,0 +1,271 @@
+"""HTML rendition of a guide, from the same story as the PDF.
+
+Phones show the PDF guides poorly.  ``render_html`` walks the flowables of
+a guide's story and writes one self-contained page of semantic HTML:
+headings with the PDF's named destinations as ids (``#upload-documents``
+works on both), paragraphs and bullet lists, tip boxes as ``aside``,
+numbered steps as an ordered list and tables with their header row.  The
+critical CSS, in the brand palette, is inlined; there are no scripts,
+fonts or images to fetch.
+
+    python build-guides.py --html
+"""
+
+import html
+import os
+from html.parser import HTMLParser
+
+from reportlab.lib.colors import white
+from reportlab.platypus import Flowable, HRFlowable, Paragraph, Table
+
+from . import toc as tocmod
+from .build import toc_cache_name
+from .chrome import FramedBox, StepBadge
+
+HEADINGS = {'h1': 'h2', 'h2': 'h3', 'h3': 'h4'}
+BULLET = '•'
+
+CSS = """\
+:root{--mandarin:#E85D04;--ink:#1a1a1a;--text:#333;--muted:#555;--line:#E0E0E0;--soft:#F8F8F8;--warm:#FFF5EE}
+*{box-sizing:border-box}
+body{margin:0;font:16px/1.55 system-ui,-apple-system,"Segoe UI",Roboto,"PingFang SC","Noto Sans CJK SC",sans-serif;color:var(--text);background:#fff}
+header{background:var(--ink);color:#fff;padding:2rem 1.25rem;border-bottom:6px solid var(--mandarin)}
+header .logo{color:var(--mandarin);font-weight:700;letter-spacing:.08em;font-size:.8rem}
+header h1{margin:.4rem 0;font-size:1.9rem;line-height:1.2}
+header p{margin:0;color:#FFCCAA}
+main,footer{max-width:46rem;margin:0 auto;padding:0 1.25rem}
+nav ul{list-style:none;padding:0}nav li{margin:.35rem 0}
+h2{color:var(--mandarin);font-size:1.5rem;margin:2.5rem 0 .75rem;line-height:1.25}
+h3{color:var(--ink);font-size:1.2rem;margin:1.75rem 0 .5rem}
+h4{font-size:1.05rem;margin:1.25rem 0 .4rem}
+a{color:var(--mandarin)}
+.small{font-size:.85rem;color:var(--muted)}
+.box{border:1px solid;border-radius:6px;padding:.75rem 1rem;margin:1rem 0}
+.steps{list-style:none;padding:0}
+.steps li{position:relative;padding-left:2.75rem;margin:.9rem 0;min-height:2rem}
+.steps li::before{content:attr(value);position:absolute;left:0;top:0;width:2rem;height:2rem;border-radius:50%;background:var(--mandarin);color:#fff;font-weight:700;text-align:center;line-height:2rem}
+.steps p{margin:.2rem 0 0;color:var(--muted);font-size:.92rem}
+.table{overflow-x:auto;margin:1rem 0}
+table{border-collapse:collapse;width:100%;font-size:.9rem}
+th,td{border:1px solid var(--line);padding:.45rem .6rem;text-align:left;vertical-align:top}
+th{background:var(--mandarin);color:#fff}
+tbody tr:nth-child(even){background:var(--soft)}
+hr{border:0;border-top:1px solid var(--line)}
+footer{color:var(--muted);font-size:.8rem;padding-top:2rem;padding-bottom:2rem}
+"""
+
+
+def html_path(directory, name):
+    """Path of the HTML rendition of the guide ``name`` written to ``directory``."""
+    return os.path.join(directory, 'html', os.path.splitext(name)[0] + '.html')
+
+
+class _Inline(HTMLParser):
+    """Paragraph markup to HTML: ``<b>``, ``<i>``, ``<br/>`` and links kept, the rest dropped."""
+
+    TAGS = {'b': 'strong', 'strong': 'strong', 'i': 'em', 'em': 'em'}
+
+    def __init__(self, bold):
+        super().__init__()
+        self.bold = bold
+        self.out = []
+        self.open = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'br':
+            self.out.append('<br>')
+            return
+        if tag == 'a' and attrs.get('href'):
+            html_tag = 'a'
+            self.out.append('<a href="%s">' % html.escape(attrs['href']))
+        else:
+            html_tag = self.TAGS.get(tag)
+            if html_tag == 'strong' and not self.bold:
+                html_tag = None
+            if html_tag:
+                self.out.append('<%s>' % html_tag)
+        self.open.append((tag, html_tag))
+
+    def handle_startendtag(self, tag, attrs):
+        # <a name="..."/> anchors become the heading ids
+        if tag == 'br':
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        while self.open:
+            opened, html_tag = self.open.pop()
+            if html_tag:
+                self.out.append('</%s>' % html_tag)
+            if opened == tag:
+                break
+
+    def handle_data(self, data):
+        self.out.append(html.escape(data, quote=False))
+
+
+def inline(paragraph, bold=True):
+    """HTML of the text of ``paragraph``: bold, italic, line breaks and links kept.
+
+    The markup is read again rather than taken from the fragments, which
+    lose ``<b>`` with the CID fonts of the Chinese guides.  Headings are
+    bold by their style already, they pass ``bold=False``.
+    """
+    parser = _Inline(bold)
+    parser.feed(paragraph.text)
+    parser.close()
+    parser.handle_endtag(None)
+    return ''.join(parser.out).strip()
+
+
+def _color(color):
+    return '#' + color.hexval()[2:].lower()
+
+
+class _Renderer:
+    def __init__(self, contents):
+        self.contents = contents
+        self.out = []
+        self.open_list = None
+
+    def close_list(self):
+        if self.open_list:
+            self.out.append('</%s>' % self.open_list)
+            self.open_list = None
+
+    def start_list(self, tag, attrs=''):
+        if self.open_list != tag:
+            self.close_list()
+            self.out.append('<%s%s>' % (tag, attrs))
+            self.open_list = tag
+
+    def flowable(self, flowable):
+        if isinstance(flowable, tocmod.Contents):
+            self.close_list()
+            self.out.append(self.nav())
+        elif isinstance(flowable, Paragraph):
+            self.paragraph(flowable)
+        elif isinstance(flowable, Table):
+            self.table(flowable)
+        elif isinstance(flowable, FramedBox):
+            self.close_list()
+            self.out.append(self.box(flowable.content, flowable.background, flowable.border))
+        elif isinstance(flowable, HRFlowable):
+            self.close_list()
+            self.out.append('<hr>')
+        elif isinstance(getattr(flowable, '_content', None), list):  # KeepTogether
+            for item in flowable._content:
+                self.flowable(item)
+        # spacers, page breaks and other layout-only flowables have no text
+
+    def paragraph(self, paragraph):
+        name = paragraph.style.name
+        text = inline(paragraph, bold=name not in HEADINGS)
+        if paragraph.getPlainText().startswith(BULLET):
+            self.start_list('ul')
+            self.out.append('<li>%s</li>' % text.split(BULLET, 1)[1].strip())
+            return
+        self.close_list()
+        section = getattr(paragraph, '_section', None)
+        if name in HEADINGS:
+            tag = HEADINGS[name]
+            ident = ' id="%s"' % section.key if section is not None else ''
+            self.out.append('<%s%s>%s</%s>' % (tag, ident, text, tag))
+        elif name == 'small':
+            self.out.append('<p class="small">%s</p>' % text)
+        else:
+            self.out.append('<p>%s</p>' % text)
+
+    def cell(self, value, bold=True):
+        if isinstance(value, (list, tuple)):
+            return '<br>'.join(filter(None, (self.cell(item) for item in value)))
+        if isinstance(value, Paragraph):
+            return inline(value, bold)
+        if isinstance(value, Flowable):
+            inner = _Renderer(self.contents)
+            inner.flowable(value)
+            inner.close_list()
+            return ''.join(inner.out)
+        return html.escape(str(value), quote=False) if value is not None else ''
+
+    def table(self, table):
+        rows = table._cellvalues
+        if rows and isinstance(rows[0][0], StepBadge):
+            # make_numbered_step: badge, then title and description
+            self.start_list('ol', ' class="steps"')
+            title, *description = rows[0][1] if isinstance(rows[0][1], (list, tuple)) else [rows[0][1]]
+            body = '<strong>%s</strong>' % self.cell(title, bold=False)
+            body += ''.join('<p>%s</p>' % self.cell(item) for item in description)
+            self.out.append('<li value="%s">%s</li>' % (html.escape(rows[0][0].number), body))
+            return
+        self.close_list()
+        if len(rows) == 1 and len(rows[0]) == 1:
+            # a framed one-cell table is a box
+            background = next((cmd[3] for cmd in table._bkgrndcmds if cmd[0] == 'BACKGROUND'), None)
+            self.out.append(self.box(rows[0][0], background, None))
+            return
+        header = [cmd for cmd in table._bkgrndcmds
+                  if cmd[0] == 'BACKGROUND' and cmd[1][1] == 0 and cmd[2][1] == 0]
+        out = ['<div class="table"><table>']
+        body = rows
+        if header and len(rows) > 1:
+            color = header[0][3]
+            style = '' if _color(color) == '#e85d04' else ' style="background:%s"' % _color(color)
+            out.append('<thead><tr>%s</tr></thead>' % ''.join(
+                '<th%s>%s</th>' % (style, self.cell(value)) for value in rows[0]))
+            body = rows[1:]
+        out.append('<tbody>')
+        for row in body:
+            out.append('<tr>%s</tr>' % ''.join('<td>%s</td>' % self.cell(value) for value in row))
+        out.append('</tbody></table></div>')
+        self.out.append(''.join(out))
+
+    def box(self, content, background, border):
+        styles = []
+        if background is not None and background != white:
+            styles.append('background:%s' % _color(background))
+        if border is not None:
+            styles.append('border-color:%s' % _color(border))
+        paragraphs = content if isinstance(content, (list, tuple)) else [content]
+        color = getattr(getattr(paragraphs[0], 'style', None), 'textColor', None)
+        if color is not None:
+            styles.append('color:%s' % _color(color))
+        return '<aside class="box" style="%s">%s</aside>' % (';'.join(styles), self.cell(content))
+
+    def nav(self):
+        items = ''.join('<li><a href="#%s">%s</a></li>' % (section.key, html.escape(section.label, quote=False))
+                        for section in self.contents.sections if not section.level)
+        return '<nav><ul>%s</ul></nav>' % items
+
+
+def render_html(guide):
+    """Self-contained HTML page of the guide module ``guide``."""
+    story = guide.build_story()
+    contents = tocmod.ContentsLayout.find(story, toc_cache_name(guide.draw_cover))
+    flowables = contents.flowables if contents is not None else story
+    renderer = _Renderer(contents)
+    for flowable in flowables:
+        renderer.flowable(flowable)
+    renderer.close_list()
+    cover = guide.COVER
+    subtitle = ' '.join(cover.subtitle) if isinstance(cover.subtitle, (list, tuple)) else cover.subtitle
+    return ''.join([
+        '<!doctype html><html lang="%s"><head><meta charset="utf-8">' % guide.LANGUAGE,
+        '<meta name="viewport" content="width=device-width,initial-scale=1">',
+        '<title>%s - %s</title>' % (html.escape(cover.title), html.escape(cover.logo.title())),
+        '<style>%s</style></head><body>' % CSS,
+        '<header><div class="logo">%s</div><h1>%s</h1><p>%s</p><p>%s</p></header>' % (
+            html.escape(cover.logo), html.escape(cover.title), html.escape(subtitle),
+            html.escape(cover.version)),
+        '<main>', '\n'.join(renderer.out), '</main>',
+        '<footer>%s</footer>' % html.escape(cover.notice),
+        '</body></html>\n',
+    ])
+
+
+def write_html(path, guide):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = render_html(guide).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
@@ -0,0 +1,106 @@
+"""Incremental export of the guide text for the assistant's knowledge base.
+
+The knowledge base (``lib/rag``) chunks and embeds whatever it is given;
+uploading a whole guide again re-embeds all of it.  The export cuts the
+guide into the passages of ``guidelib.search`` (one per ``h1``/``h2``
+heading), splits those longer than ``MAX_CHARS`` at block boundaries, and
+gives every chunk an ID derived from its named destination and a SHA-256
+of its text.  Each chunk starts with its guide, section and heading
+titles so it stands on its own once retrieved.
+
+Next to ``knowledge/<guide>.json`` the export writes
+``knowledge/<guide>.delta.json`` with the IDs added, changed and removed
+since the previous export, so only those chunks need embedding again:
+
+    python build-guides.py --knowledge
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+from .search import passages
+
+# the 500 tokens of chunkText in lib/rag/embeddings.ts, at ~4 characters per token
+MAX_CHARS = 2000
+
+
+def knowledge_path(directory, name):
+    """Path of the knowledge export of the guide ``name`` written to ``directory``."""
+    return os.path.join(directory, 'knowledge', os.path.splitext(name)[0] + '.json')
+
+
+def delta_path(path):
+    return os.path.splitext(path)[0] + '.delta.json'
+
+
+def _parts(blocks, limit):
+    """Group ``blocks`` into runs of at most ``limit`` characters; a longer block stands alone."""
+    parts, current = [], []
+    for block in blocks:
+        if current and len('\n\n'.join(current + [block])) > limit:
+            parts.append(current)
+            current = []
+        current.append(block)
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunks(guide_title, contents):
+    """Knowledge chunks of a guide laid out with ``contents``, in reading order."""
+    found = []
+    parent = None
+    for section, blocks in passages(contents):
+        if not section.level:
+            parent = section
+        heading = ' > '.join([guide_title, parent.label] + ([section.label] if section.level else []))
+        # blocks[0] is the heading itself, replaced by the full heading line
+        parts = _parts(blocks[1:], MAX_CHARS - len(heading) - 2) or [[]]
+        for n, part in enumerate(parts, 1):
+            text = '\n\n'.join([heading] + part)
+            found.append({
+                'id': section.key if len(parts) == 1 else '%s~%d' % (section.key, n),
+                'section': parent.key,
+                'destination': section.key,
+                'page': contents.heading_pages.get(section.key),
+                'title': section.label,
+                'text': text,
+                'sha256': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            })
+    return found
+
+
+def delta(old, new):
+    """IDs added, changed and removed from the chunk list ``old`` to ``new``."""
+    before = {chunk['id']: chunk['sha256'] for chunk in old}
+    after = {chunk['id']: chunk['sha256'] for chunk in new}
+    return {
+        'added': [key for key in after if key not in before],
+        'changed': [key for key in after if key in before and before[key] != after[key]],
+        'removed': [key for key in before if key not in after],
+        'unchanged': sum(1 for key in after if before.get(key) == after[key]),
+    }
+
+
+def write_export(path, contents):
+    """Write the chunks to ``path`` and their delta against the chunks already there."""
+    guide = os.path.splitext(os.path.basename(path))[0] + '.pdf'
+    new = chunks(os.path.splitext(guide)[0].replace('-', ' '), contents)
+    old = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            old = json.load(f)['chunks']
+    changes = dict(delta(old, new), guide=guide)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for target, data in ((path, {'guide': guide, 'max_chars': MAX_CHARS, 'chunks': new}),
+                         (delta_path(path), changes)):
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write('\n')
+    print('%s: knowledge chunks %d added, %d changed, %d removed, %d unchanged' % (
+        guide, len(changes['added']), len(changes['changed']), len(changes['removed']),
+        changes['unchanged'],
+    ), file=sys.stderr)
+    return changes
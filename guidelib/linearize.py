@@ -0,0 +1,142 @@
+"""Linearized ("fast web view") output and its verifier.
+
+A linearized PDF starts with a linearization dictionary, the objects of
+page 1 and hint tables locating every other page, so a browser can show the
+first page while the rest of the file is still downloading.  qpdf writes
+the linearized file; ``verify`` checks it the way a viewer relies on it:
+
+    python -m guidelib.linearize public/guides/*.pdf
+"""
+
+import argparse
+import contextlib
+import io
+import re
+import sys
+
+from .optimize import pikepdf, require_pikepdf
+
+# the linearization dictionary must be the first object, within 1024 bytes
+FIRST_OBJECT = re.compile(rb'%PDF-\d\.\d[^\n]*\n(?:%[^\n]*\n)?(\d+) (\d+) obj\s*<<')
+OBJECT_HEADER = rb'(?<![0-9])%d %d obj\b'
+ANY_OBJECT_HEADER = re.compile(rb'(?<![0-9])(\d+) (\d+) obj\b')
+
+
+def linearize(data):
+    """Return the PDF ``data`` rewritten as a linearized file."""
+    require_pikepdf()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        buffer = io.BytesIO()
+        pdf.save(buffer, linearize=True, deterministic_id=True)
+    return buffer.getvalue()
+
+
+def _span(data, objgen):
+    """Start and end offsets of an uncompressed object, or None."""
+    match = re.search(OBJECT_HEADER % objgen, data)
+    if not match:
+        return None
+    return match.start(), data.index(b'endobj', match.end()) + len(b'endobj')
+
+
+def _first_page_objects(page):
+    """Indirect objects page 1 needs to render, without the page tree."""
+    found, todo = {}, [page]
+    while todo:
+        obj = todo.pop()
+        if not isinstance(obj, pikepdf.Object):
+            continue
+        if obj.is_indirect:
+            if obj.objgen in found:
+                continue
+            found[obj.objgen] = obj
+        if isinstance(obj, pikepdf.Stream):
+            obj = obj.stream_dict
+        if isinstance(obj, pikepdf.Dictionary):
+            todo.extend(value for key, value in obj.items() if key not in ('/Parent', '/P'))
+        elif isinstance(obj, pikepdf.Array):
+            todo.extend(obj)
+    return found
+
+
+def verify(data):
+    """Check the linearization of the PDF ``data``; return the problems found."""
+    require_pikepdf()
+    match = FIRST_OBJECT.match(data)
+    if not match or match.start(1) >= 1024:
+        return ['no linearization dictionary at the start of the file']
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        if not pdf.is_linearized:
+            return ['not linearized']
+        params = pdf.get_object(int(match.group(1)), int(match.group(2)))
+        problems = []
+        length, first_page_end = int(params.L), int(params.E)
+        hint_offset, hint_length = int(params.H[0]), int(params.H[1])
+        if length != len(data):
+            problems.append('/L is %d, the file has %d bytes' % (length, len(data)))
+        if int(params.N) != len(pdf.pages):
+            problems.append('/N is %d, the document has %d pages' % (int(params.N), len(pdf.pages)))
+
+        first = pdf.pages[0].obj
+        if int(params.O) != first.objgen[0]:
+            problems.append('/O is object %d, page 1 is object %d' % (int(params.O), first.objgen[0]))
+        # everything page 1 needs must be complete by /E; dictionaries may sit
+        # in an object stream, which then has to end there, streams cannot
+        for objgen, obj in sorted(_first_page_objects(first).items()):
+            span = _span(data, objgen)
+            if span is None:
+                if isinstance(obj, pikepdf.Stream):
+                    problems.append('page 1 object %d not found in the file' % objgen[0])
+            elif span[1] > first_page_end:
+                problems.append('page 1 object %d ends at %d, after the first page section (/E %d)'
+                                % (objgen[0], span[1], first_page_end))
+
+        # no object (e.g. an object stream holding page 1 resources) may
+        # straddle the end of the first page section
+        for header in ANY_OBJECT_HEADER.finditer(data, 0, first_page_end):
+            end = data.find(b'endobj', header.end())
+            if end < 0 or end + len(b'endobj') > first_page_end:
+                problems.append('object %s crosses the end of the first page section (/E %d)'
+                                % (header.group(1).decode(), first_page_end))
+
+        if not re.match(rb'\d+ \d+ obj', data[hint_offset:hint_offset + 32]):
+            problems.append('/H does not point to the hint stream (offset %d)' % hint_offset)
+        if hint_offset + hint_length > first_page_end:
+            problems.append('hint stream ends after the first page section')
+        # /T is the main xref stream, or the white-space before the first
+        # entry of the main xref table
+        main_xref = int(params.T)
+        if not (re.match(rb'\s?\d+ \d+ obj', data[main_xref:main_xref + 32])
+                or re.match(rb'\s\d{10} \d{5} f', data[main_xref:main_xref + 20])
+                and b'xref' in data[max(main_xref - 32, 0):main_xref]):
+            problems.append('/T does not point to the main cross-reference section')
+
+        # qpdf checks the page offset and shared object hint tables against
+        # the actual object positions; pikepdf leaves sys.stderr pointing at
+        # the report stream, hence the redirect
+        report = io.StringIO()
+        with contextlib.redirect_stderr(report):
+            linearized = pdf.check_linearization(report)
+        if not linearized:
+            problems.extend(line for line in report.getvalue().splitlines() if line.strip())
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verify linearized guide PDFs.')
+    parser.add_argument('pdfs', nargs='+', help='PDF files to check')
+    args = parser.parse_args(argv)
+    failed = False
+    for path in args.pdfs:
+        with open(path, 'rb') as f:
+            problems = verify(f.read())
+        for problem in problems:
+            print('%s: %s' % (path, problem))
+        if not problems:
+            print('%s: OK' % path)
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
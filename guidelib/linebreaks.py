@@ -0,0 +1,164 @@
+"""Paragraph line breaks cached on disk between builds.
+
+Most paragraphs of a guide are the same from one build to the next, yet
+every build breaks each of them into lines again, once per pass.  A
+``LineBreaks`` cache keeps the lines ``Paragraph.breakLines`` computes,
+keyed by the paragraph markup, a fingerprint of its style, the available
+widths and the metrics version of the fonts it is set in, and ``attach`` makes the paragraphs
+of a story look their lines up there before computing them.  A build
+after an edit only breaks the paragraphs that changed.
+
+The cache of each guide and edition is a pickle in ``.guide-cache/``
+next to the section map, holding the entries the last build used.  The
+lines are unpickled afresh on every hit, as splitting a paragraph takes
+its lines apart.  They are the ones ``breakLines`` returns, so the PDF is
+the same with or without the cache.
+"""
+
+import copy
+import functools
+import os
+import pickle
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import KeepTogether, Paragraph, Table
+
+from .chrome import FramedBox
+from .fragments import InternedParagraph, style_key
+from .toc import CACHE_DIR
+
+# what laying a paragraph out adds to it
+PASS_STATE = ('blPara', '_wrapWidths', 'width', 'height')
+
+
+@functools.lru_cache(maxsize=None)
+def font_version(name):
+    """Version of the metrics of font ``name``, '' for those shipped with ReportLab.
+
+    TrueType fonts are read from their files.
+    """
+    path = getattr(getattr(pdfmetrics.getFont(name), 'face', None), 'filename', None)
+    if isinstance(path, str) and os.path.exists(path):
+        stat = os.stat(path)
+        return '%d:%d' % (stat.st_size, stat.st_mtime)
+    return ''
+
+
+def fonts_key(paragraph):
+    """The fonts ``paragraph`` is set in, with the version of their metrics."""
+    names = {paragraph.style.fontName}
+    names.update(getattr(frag, 'fontName', paragraph.style.fontName) for frag in paragraph.frags)
+    return tuple((name, font_version(name)) for name in sorted(names))
+
+
+class LineBreaks:
+    """Lines of paragraphs by markup, style, widths and font versions, for one build.
+
+    The fonts are those of the paragraph: registering another font, as the
+    personal guides do for names, leaves the other entries valid.
+    """
+
+    def __init__(self, cache_name):
+        self.cache_path = os.path.join(CACHE_DIR, cache_name + '.lines.pickle')
+        self.version = reportlab.Version
+        self.entries = self.load()
+        self.used = {}
+        self.hits = self.misses = 0
+
+    def __deepcopy__(self, memo):
+        # shared by the copies of the story every pass lays out
+        return self
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}
+        if not isinstance(cached, dict) or cached.get('version') != self.version:
+            return {}
+        return cached['entries']
+
+    def save(self):
+        """Write the entries of this build, if they differ from those loaded."""
+        if self.used.keys() == self.entries.keys():
+            return
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        partial = '%s.%d' % (self.cache_path, os.getpid())
+        with open(partial, 'wb') as f:
+            pickle.dump({'version': self.version, 'entries': self.used}, f,
+                        pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, self.cache_path)
+
+    def lines(self, paragraph, kind, width, break_lines):
+        """The lines of ``paragraph`` for ``width``, from the cache or ``break_lines(width)``."""
+        key = (kind, paragraph.line_break_key, tuple(width))
+        data = self.used.get(key) or self.entries.get(key)
+        if data is not None:
+            self.hits += 1
+            self.used[key] = data
+            return pickle.loads(data)
+        self.misses += 1
+        lines = break_lines(width)
+        self.used[key] = pickle.dumps(lines, pickle.HIGHEST_PROTOCOL)
+        return lines
+
+
+class CachedParagraph(Paragraph):
+    """``Paragraph`` that takes its lines from ``line_breaks``.
+
+    ``line_break_key`` is its markup and style fingerprint, taken when it
+    is attached.  The parts of a split paragraph are plain: their markup
+    is gone.
+
+    A pass only adds the lines and the size to a paragraph, and the lines
+    come from the cache, so the copy of the story for the next pass shares
+    the style and fragments instead of copying them.
+    """
+
+    line_breaks = None
+    line_break_key = None
+
+    def __deepcopy__(self, memo):
+        clone = copy.copy(self)
+        for name in PASS_STATE:
+            clone.__dict__.pop(name, None)
+        return clone
+
+    def breakLines(self, width):
+        if self.line_breaks is None:
+            return super().breakLines(width)
+        return self.line_breaks.lines(self, '', width, super().breakLines)
+
+    def breakLinesCJK(self, maxWidths):
+        if self.line_breaks is None:
+            return super().breakLinesCJK(maxWidths)
+        return self.line_breaks.lines(self, 'cjk', maxWidths, super().breakLinesCJK)
+
+
+def attach(flowables, line_breaks, _styles=None):
+    """Make the paragraphs of ``flowables``, in tables and boxes too, use ``line_breaks``.
+
+    The style fingerprints are taken once per style here rather than on
+    every pass: the copies of the story a pass lays out copy the key, and
+    a fingerprint kept on the style would be inherited by its children.
+    """
+    styles = {} if _styles is None else _styles
+    for flowable in flowables:
+        if type(flowable) in (Paragraph, InternedParagraph) and isinstance(flowable.text, str):
+            style = flowable.style
+            if id(style) not in styles:
+                styles[id(style)] = style, style_key(style)
+            flowable.__class__ = CachedParagraph
+            flowable.line_breaks = line_breaks
+            flowable.line_break_key = (flowable.text, styles[id(style)][1], fonts_key(flowable))
+        elif isinstance(flowable, Table):
+            for row in flowable._cellvalues:
+                attach(row, line_breaks, styles)
+        elif isinstance(flowable, FramedBox):
+            attach([flowable.content], line_breaks, styles)
+        elif isinstance(flowable, KeepTogether):
+            attach(flowable._content, line_breaks, styles)
+        elif isinstance(flowable, (list, tuple)):
+            attach(flowable, line_breaks, styles)
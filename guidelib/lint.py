@@ -0,0 +1,199 @@
+"""Dry-run layout of the guides and overflow checks.
+
+Plain string cells of a ``Table`` never wrap: a longer translation runs
+out of its column without any error.  ``lint`` lays a guide out once on
+a ``NullCanvas``, which keeps no page and writes no PDF, and reports
+
+* table cells whose text runs past the edge of their column (for
+  paragraph cells, a word that cannot be broken),
+* flowables that reach well into the page margins, and those too tall for
+  any page,
+* the pages of every ``h1`` section.
+
+It takes a fraction of a build, so it can run on every commit:
+
+    python build-guides.py --dry-run
+    python -m guidelib.lint guide-admin-en.py
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as canvasmod
+from reportlab.platypus import Flowable, Paragraph, Table
+from reportlab.platypus.doctemplate import LayoutError
+
+from . import toc as tocmod
+from .build import GUIDE_SCRIPTS, _layout, load_guide, toc_cache_name
+
+# differences below this are rounding, in points
+TOLERANCE = 0.5
+# centred tables may reach into the side margins, the steps do by 10 pt each side
+MARGIN_ALLOWANCE = 1 * cm
+
+
+class NullCanvas(canvasmod.Canvas):
+    """Canvas that throws every page away when it is closed and never saves."""
+
+    def showPage(self):
+        self._startPage()
+
+    def save(self):
+        pass
+
+
+def _text(value):
+    if isinstance(value, Paragraph):
+        return value.getPlainText()
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_text(item) for item in value)
+    return str(value) if not isinstance(value, Flowable) else type(value).__name__
+
+
+def _needed_width(value, style):
+    """Width the content of a cell needs without wrapping, None when it can wrap anywhere."""
+    if isinstance(value, str):
+        return max(stringWidth(line, style.fontname, style.fontsize) for line in value.split('\n'))
+    if isinstance(value, Paragraph):
+        return value.minWidth()
+    if isinstance(value, (list, tuple)):
+        widths = [w for w in (_needed_width(item, style) for item in value) if w is not None]
+        return max(widths) if widths else None
+    return None
+
+
+def _spill(needed, width, style):
+    """How far content ``needed`` wide runs past the edges of a cell ``width`` wide."""
+    left, right = style.leftPadding, style.rightPadding
+    if style.alignment in ('CENTER', 'CENTRE'):
+        centre = left + (width - left - right) / 2
+        return needed / 2 - min(centre, width - centre)
+    if style.alignment == 'RIGHT':
+        return needed - (width - right)
+    return left + needed - width
+
+
+def cell_overflows(table):
+    """``(row, column, text, excess)`` of every cell of a laid out ``table`` that spills out of its column."""
+    spans = getattr(table, '_spanRanges', None) or {}
+    for r, row in enumerate(table._cellvalues):
+        for c, value in enumerate(row):
+            span = spans.get((c, r), (c, r, c, r))
+            if span is None:
+                continue  # covered by a spanning cell
+            style = table._cellStyles[r][c]
+            needed = _needed_width(value, style)
+            if needed is None:
+                continue
+            excess = _spill(needed, sum(table._colWidths[span[0]:span[2] + 1]), style)
+            if excess > TOLERANCE:
+                yield r, c, _text(value), excess
+
+
+class Report:
+    """Problems and section pages found while laying out one guide."""
+
+    def __init__(self, name, contents):
+        self.name = name
+        self.contents = contents
+        self.problems = []
+        self.pages = 0
+        self.page = 0
+        self.section = None
+        self._seen = set()
+
+    def problem(self, page, message):
+        # the header row repeats on every part of a split table
+        key = (self.section.key if self.section else None, message)
+        if key not in self._seen:
+            self._seen.add(key)
+            where = 'page %d, %s' % (page, self.section.label) if self.section else 'page %d' % page
+            self.problems.append('%s: %s: %s' % (self.name, where, message))
+
+    def after_flowable(self, doc, flowable):
+        if self.contents is not None:
+            self.contents.record(doc, flowable)
+        self.page = doc.page
+        section = getattr(flowable, '_section', None)
+        if section is not None:
+            self.section = section
+        frame = doc.frame._width
+        width = getattr(flowable, '_width', None) or getattr(flowable, 'width', None)
+        if isinstance(width, (int, float)) and width > frame + MARGIN_ALLOWANCE:
+            self.problem(doc.page, '%s is %.1f pt wider than the frame' % (
+                type(flowable).__name__, width - frame))
+        if isinstance(flowable, Table):
+            for row, column, text, excess in cell_overflows(flowable):
+                self.problem(doc.page, 'cell %r (row %d, column %d) runs %.1f pt out of its column' % (
+                    text, row + 1, column + 1, excess))
+
+    def section_pages(self):
+        """``(section, pages)`` of every ``h1`` section, in order."""
+        if self.contents is None:
+            return []
+        starts = [(s, self.contents.recorded[s.key]) for s in self.contents.sections
+                  if not s.level and s.key in self.contents.recorded]
+        ends = [page for _, page in starts[1:]] + [self.pages + 1]
+        # a section ending where the next starts shares that page
+        return [(section, max(1, end - start)) for (section, start), end in zip(starts, ends)]
+
+
+def _measure_only(flowable, canvas, x, y, _sW=0):
+    pass
+
+
+def lint(guide):
+    """Lay ``guide`` out on a ``NullCanvas`` and return its ``Report``.
+
+    The story is used up: flowables are wrapped and split as in a build,
+    but those of the story are not drawn, which is most of the time a
+    page takes.  Parts of a split flowable still are.
+    """
+    story = guide.build_story()
+    contents = tocmod.ContentsLayout.find(story, toc_cache_name(guide.draw_cover))
+    report = Report(guide.OUTPUT_NAME, contents)
+    flowables = contents.story(fresh=False) if contents is not None else story
+    for flowable in flowables:
+        flowable.drawOn = _measure_only.__get__(flowable)
+    try:
+        doc = _layout(None, flowables, guide.draw_cover, guide.header_footer, NullCanvas, False,
+                      report.after_flowable)
+    except LayoutError as error:
+        report.problem(report.page, 'layout stopped: %s' % str(error).split('\n')[0])
+        report.pages = report.page
+        return report
+    report.pages = doc.page
+    return report
+
+
+def check(scripts):
+    """Lint each guide script and print its report; returns the number of problems."""
+    count = 0
+    for script in scripts:
+        start = time.perf_counter()
+        report = lint(load_guide(script))
+        elapsed = time.perf_counter() - start
+        print('%s: %d pages in %.2f s%s' % (
+            os.path.basename(script), report.pages, elapsed,
+            ', %d problems' % len(report.problems) if report.problems else ''))
+        for section, pages in report.section_pages():
+            print('  %-40s %d' % (section.label[:40], pages))
+        for problem in report.problems:
+            print('  ' + problem)
+        count += len(report.problems)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Dry-run layout of the guides with overflow checks.')
+    parser.add_argument('guides', nargs='*', help='guide scripts to check (default: all six)')
+    args = parser.parse_args(argv)
+    return 1 if check(args.guides or GUIDE_SCRIPTS) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
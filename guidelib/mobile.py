@@ -0,0 +1,181 @@
+"""Mobile edition: the story of a guide reflowed onto a phone-sized page.
+
+Collaborators read the guides on their phones and forward them on
+WhatsApp; A4 with 2 cm margins has to be zoomed into line by line.  The
+mobile edition lays the same story out on a narrow page, in the same run
+as the A4 edition and with the fonts, text and markup already loaded for
+it:
+
+* paragraphs keep their parsed fragments, only the type scale changes:
+  body text keeps its size, which reads well once the page fills the
+  screen, headings are brought closer to it and justified text is set
+  ragged right;
+* tables with a header row become a single column of cards, one per row,
+  the other columns as "header: value" lines;
+* tip boxes, numbered steps and the table of contents take the width of
+  the page.
+
+The cover and the page chrome follow the page size of the document.
+The edition is written with the ``size`` profile of ``guidelib.optimize``
+when pikepdf is installed.
+
+    python build-guides.py --mobile
+"""
+
+import copy
+import html
+import os
+
+from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm, mm
+from reportlab.platypus import KeepTogether, Paragraph, Table, TableStyle
+
+from . import toc as tocmod
+from .build import Edition
+from .chrome import FramedBox, StepBadge
+from .fragments import InternedParagraph
+
+# top, bottom, left, right; the chrome rules sit 1.5 cm from the top and bottom
+EDITION = Edition('mobile', (100 * mm, 178 * mm), (2 * cm, 1.8 * cm, 6 * mm, 6 * mm))
+BODY_SIZE = 11
+HEADING_SCALE = 0.55
+PROFILE = 'size'
+
+
+def mobile_name(name):
+    """File name of the mobile edition of guide ``name``."""
+    return os.path.splitext(name)[0] + '-Mobile.pdf'
+
+
+def font_size(size):
+    """Mobile size of text set at ``size`` in the A4 edition."""
+    return size if size <= BODY_SIZE else BODY_SIZE + (size - BODY_SIZE) * HEADING_SCALE
+
+
+def _markup(value):
+    """Paragraph markup of a table cell."""
+    if isinstance(value, Paragraph):
+        return value.text
+    if isinstance(value, (list, tuple)):
+        return '<br/>'.join(_markup(item) for item in value)
+    return html.escape(str(value), quote=False)
+
+
+def _has_header(table):
+    return len(table._cellvalues) > 1 and len(table._cellvalues[0]) > 1 and any(
+        cmd[0] == 'BACKGROUND' and cmd[1][1] == 0 and cmd[2][1] == 0 for cmd in table._bkgrndcmds)
+
+
+class Reflow:
+    """Rewrites A4 story flowables for a column ``width`` points wide.
+
+    ``font_size`` maps A4 sizes to those of the edition; ``padding`` is the
+    horizontal and vertical cell padding of the cards.
+    """
+
+    def __init__(self, width, font_size=font_size, padding=(8, 6)):
+        self.width = width
+        self.font_size = font_size
+        self.padding = padding
+        self.styles = {}
+
+    def style(self, style):
+        """``style`` on the type scale of the edition, made once per style."""
+        if style not in self.styles:
+            size = self.font_size(style.fontSize)
+            ratio = size / style.fontSize
+            self.styles[style] = ParagraphStyle(
+                style.name, parent=style, fontSize=size, leading=style.leading * ratio,
+                spaceBefore=style.spaceBefore * ratio, spaceAfter=style.spaceAfter * ratio,
+                alignment=TA_LEFT if style.alignment == TA_JUSTIFY else style.alignment,
+            )
+        return self.styles[style]
+
+    def paragraph(self, paragraph):
+        style = self.style(paragraph.style)
+        ratio = style.fontSize / paragraph.style.fontSize
+        frags = []
+        for frag in paragraph.frags:
+            frag = frag.clone()
+            frag.fontSize *= ratio
+            frags.append(frag)
+        # the fragments are passed in, the markup is not parsed again
+        return Paragraph(paragraph.text, style, paragraph.bulletText, frags=frags)
+
+    def flowable(self, flowable):
+        if isinstance(flowable, tocmod.Contents):
+            contents = copy.copy(flowable)
+            contents.style = self.style(flowable.style)
+            contents.col_widths = (tocmod.CONTENTS_NUMBER_WIDTH, self.width - tocmod.CONTENTS_NUMBER_WIDTH)
+            return contents
+        if isinstance(flowable, Paragraph):
+            return self.paragraph(flowable)
+        if isinstance(flowable, FramedBox):
+            box = copy.copy(flowable)
+            box.content = self.flowable(flowable.content)
+            box.width = self.width
+            return box
+        if isinstance(flowable, Table):
+            return self.cards(flowable) if _has_header(flowable) else self.table(flowable)
+        if isinstance(flowable, KeepTogether):
+            return KeepTogether([self.flowable(item) for item in flowable._content])
+        if isinstance(flowable, (list, tuple)):
+            return [self.flowable(item) for item in flowable]
+        return copy.deepcopy(flowable)
+
+    def table(self, table):
+        """``table`` with reflowed cells, its columns narrowed to fit the frame."""
+        result = copy.deepcopy(table)
+        result._cellvalues = [[cell if isinstance(cell, (str, StepBadge)) else self.flowable(cell)
+                               for cell in row] for row in table._cellvalues]
+        widths = list(table._argW)
+        if sum(widths) > self.width:
+            if isinstance(table._cellvalues[0][0], StepBadge):
+                # the badge column keeps its width
+                widths[1:] = [w * (self.width - widths[0]) / sum(widths[1:]) for w in widths[1:]]
+            else:
+                widths = [w * self.width / sum(widths) for w in widths]
+        result._argW = result._colWidths = widths
+        return result
+
+    def cards(self, table):
+        """One column of cards, a card per body row of ``table``."""
+        header, *rows = table._cellvalues
+        head, first, other = table._cellStyles[0][0], table._cellStyles[1][0], table._cellStyles[1][1]
+        label_color = next(cmd[3] for cmd in table._bkgrndcmds
+                           if cmd[0] == 'BACKGROUND' and cmd[1][1] == 0)
+        head_style = ParagraphStyle('card_head', fontName=head.fontname, fontSize=head.fontsize,
+                                    leading=head.fontsize * 1.3, textColor=head.color)
+        title_style = ParagraphStyle('card_title', fontName=first.fontname, fontSize=other.fontsize + 0.5,
+                                     leading=(other.fontsize + 0.5) * 1.35, textColor=first.color)
+        line_style = ParagraphStyle('card_line', fontName=other.fontname, fontSize=other.fontsize,
+                                    leading=other.fontsize * 1.35, textColor=other.color, spaceBefore=2)
+        labels = [_markup(value) for value in header]
+        data = [[InternedParagraph(labels[0], head_style)]]
+        for row in rows:
+            card = [InternedParagraph('<b>%s</b>' % _markup(row[0]), title_style)]
+            card += [InternedParagraph('<font color="%s">%s:</font> %s' % (label_color.hexval(), label, _markup(value)),
+                               line_style)
+                     for label, value in zip(labels[1:], row[1:])]
+            data.append([card])
+        hpad, vpad = self.padding
+        commands = [
+            ('GRID', (0, 0), (-1, -1), 0.5, table._linecmds[0][4] if table._linecmds else label_color),
+            ('LEFTPADDING', (0, 0), (-1, -1), hpad), ('RIGHTPADDING', (0, 0), (-1, -1), hpad),
+            ('TOPPADDING', (0, 0), (-1, -1), vpad), ('BOTTOMPADDING', (0, 0), (-1, -1), vpad),
+        ]
+        for cmd in table._bkgrndcmds:
+            (_, start), (_, end) = cmd[1], cmd[2]
+            if cmd[0] == 'ROWBACKGROUNDS' or start == end:
+                # a highlighted cell marks its whole card
+                commands.append((cmd[0], (0, start), (-1, end)) + tuple(cmd[3:]))
+        result = Table(data, colWidths=[self.width], repeatRows=1)
+        result.setStyle(TableStyle(commands))
+        return result
+
+
+def reflow(story):
+    """The flowables of ``story`` laid out for the mobile page."""
+    reflowed = Reflow(EDITION.column_width)
+    return [reflowed.flowable(flowable) for flowable in story]
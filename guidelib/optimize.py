@@ -0,0 +1,261 @@
+"""Size-optimized output profile (``--optimize=size``).
+
+ReportLab writes PDF 1.4 with ASCII85-wrapped Flate streams, a classic xref
+table, an obsolete ``/ProcSet`` on every page and a few graphics state
+operators that never affect the rendering (identity ``cm``, text state set
+and immediately replaced, empty ``q``/``Q`` and ``BT``/``ET`` pairs).  The
+size profile rewrites the finished document with pikepdf (qpdf): content
+streams are cleaned, identical streams and resources are merged, every
+stream is recompressed with Flate at level 9 and the objects go into PDF 1.5
+object streams with a compressed xref stream.
+
+pikepdf is only needed for this profile: ``pip install pikepdf``.
+"""
+
+import hashlib
+import io
+
+try:
+    import pikepdf
+except ImportError:  # optional, only needed by the size profile
+    pikepdf = None
+
+PROFILES = ('size',)
+
+# operator -> graphics state slot it sets; fill and stroke colour are one
+# slot each whatever colour space operator sets them
+STATE_OPERATORS = {
+    'w': 'w', 'J': 'J', 'j': 'j', 'M': 'M', 'd': 'd', 'ri': 'ri', 'i': 'i',
+    'g': 'fill', 'rg': 'fill', 'k': 'fill',
+    'G': 'stroke', 'RG': 'stroke', 'K': 'stroke',
+    'Tc': 'Tc', 'Tw': 'Tw', 'Tz': 'Tz', 'TL': 'TL', 'Tf': 'Tf', 'Tr': 'Tr', 'Ts': 'Ts',
+}
+# operators that change a slot to a value we do not track
+INVALIDATES = {
+    'cs': ('fill',), 'sc': ('fill',), 'scn': ('fill',),
+    'CS': ('stroke',), 'SC': ('stroke',), 'SCN': ('stroke',),
+    'TD': ('TL',), '"': ('Tw', 'Tc'),
+}
+# text state that is only read by these operators
+TEXT_STATE_USES = {
+    'Tf': ('Tj', 'TJ', "'", '"'),
+    'TL': ('T*', "'", '"'),
+}
+# object types that may be merged when identical; pages, annotations and
+# the document structure keep their identity
+MERGEABLE_TYPES = ('/Font', '/FontDescriptor', '/Encoding', '/ExtGState', '/XObject')
+
+
+def require_pikepdf():
+    if pikepdf is None:
+        raise RuntimeError('the size profile needs pikepdf: pip install pikepdf')
+
+
+def _operator(instruction):
+    return str(instruction.operator) if isinstance(instruction, pikepdf.ContentStreamInstruction) else None
+
+
+def _value(instruction):
+    return (str(instruction.operator),) + tuple(repr(operand) for operand in instruction.operands)
+
+
+def _drop_redundant_state(instructions):
+    """Drop state operators that set the value already in effect."""
+    state, stack, kept = {}, [], []
+    for instruction in instructions:
+        op = _operator(instruction)
+        if op == 'cm' and [float(x) for x in instruction.operands] == [1, 0, 0, 1, 0, 0]:
+            continue
+        if op == 'q':
+            stack.append(dict(state))
+        elif op == 'Q':
+            state = stack.pop() if stack else {}
+        elif op == 'gs':
+            state = {}
+        elif op in INVALIDATES:
+            for slot in INVALIDATES[op]:
+                state.pop(slot, None)
+        elif op in STATE_OPERATORS:
+            slot, value = STATE_OPERATORS[op], _value(instruction)
+            if state.get(slot) == value:
+                continue
+            state[slot] = value
+        kept.append(instruction)
+    return kept
+
+
+def _drop_dead_text_state(instructions):
+    """Drop ``Tf``/``TL`` that are replaced or discarded before being read."""
+    dead = set()
+    levels = [{}]  # per q level: slot -> index of the unread store
+    for index, instruction in enumerate(instructions):
+        op = _operator(instruction)
+        pending = levels[-1]
+        if op in TEXT_STATE_USES:
+            if op in pending:
+                dead.add(pending[op])
+            pending[op] = index
+        elif op == 'q':
+            # the nested content may read anything set so far
+            for level in levels:
+                level.clear()
+            levels.append({})
+        elif op == 'Q':
+            dead.update(pending.values())
+            if len(levels) > 1:
+                levels.pop()
+            else:
+                pending.clear()
+        elif op is None or op in ('Do', 'gs', 'TD'):
+            for level in levels:
+                level.clear()
+        else:
+            for slot, uses in TEXT_STATE_USES.items():
+                if op in uses:
+                    for level in levels:
+                        level.pop(slot, None)
+    # the state is discarded at the end of the stream
+    for level in levels:
+        dead.update(level.values())
+    return [instruction for index, instruction in enumerate(instructions) if index not in dead]
+
+
+def _drop_empty_blocks(instructions):
+    """Drop ``BT ET`` pairs and ``q``/``Q`` pairs that only hold ``cm``."""
+    kept = []
+    for instruction in instructions:
+        op = _operator(instruction)
+        if op == 'ET' and kept and _operator(kept[-1]) == 'BT':
+            kept.pop()
+            continue
+        if op == 'Q':
+            start = len(kept)
+            while start and _operator(kept[start - 1]) == 'cm':
+                start -= 1
+            if start and _operator(kept[start - 1]) == 'q':
+                del kept[start - 1:]
+                continue
+        kept.append(instruction)
+    return kept
+
+
+def clean_content(stream):
+    """Rewrite a content stream without its no-op graphics state operators."""
+    instructions = pikepdf.parse_content_stream(stream)
+    cleaned = _drop_empty_blocks(_drop_dead_text_state(_drop_redundant_state(instructions)))
+    if len(cleaned) != len(instructions):
+        stream.write(pikepdf.unparse_content_stream(cleaned))
+
+
+def _object_key(obj):
+    """Hashable description of an indirect object, references kept as is."""
+    if isinstance(obj, pikepdf.Stream):
+        head = pikepdf.Dictionary({k: v for k, v in obj.stream_dict.items()
+                                   if k not in ('/Length', '/Filter', '/DecodeParms')})
+        return 'S', head.unparse(), hashlib.sha256(obj.read_bytes()).digest()
+    return 'D', obj.unparse()
+
+
+def _mergeable(obj):
+    if isinstance(obj, pikepdf.Stream):
+        return obj.stream_dict.get('/Type') in (None, '/XObject')
+    return isinstance(obj, pikepdf.Dictionary) and obj.get('/Type') in MERGEABLE_TYPES
+
+
+def _replace_references(container, replacements):
+    items = container.items() if isinstance(container, pikepdf.Dictionary) else enumerate(container)
+    for key, value in list(items):
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            if value.objgen in replacements:
+                container[key] = replacements[value.objgen]
+        elif isinstance(value, (pikepdf.Dictionary, pikepdf.Array)):
+            _replace_references(value, replacements)
+
+
+def merge_duplicates(pdf):
+    """Point every reference to one copy of identical streams and resources.
+
+    Returns the number of objects merged away.  Merging can make parents
+    identical in turn, so it runs until nothing changes.
+    """
+    merged = 0
+    while True:
+        seen, replacements = {}, {}
+        for obj in pdf.objects:
+            if _mergeable(obj):
+                first = seen.setdefault(_object_key(obj), obj)
+                if first.objgen != obj.objgen:
+                    replacements[obj.objgen] = first
+        if not replacements:
+            return merged
+        merged += len(replacements)
+        for obj in pdf.objects:
+            if isinstance(obj, pikepdf.Stream):
+                _replace_references(obj.stream_dict, replacements)
+            elif isinstance(obj, (pikepdf.Dictionary, pikepdf.Array)):
+                _replace_references(obj, replacements)
+
+
+def _drop_procset(resources):
+    if '/ProcSet' in resources:  # obsolete since PDF 1.4
+        del resources['/ProcSet']
+
+
+def _strip_page_defaults(page):
+    _drop_procset(page.obj.Resources)
+    if page.obj.get('/Rotate') == 0:
+        del page.obj['/Rotate']
+    if '/Trans' in page.obj and not page.obj.Trans.keys():
+        del page.obj['/Trans']
+
+
+def optimize_size(data, linearize=False):
+    """Return the smallest rendition of the PDF ``data`` that renders the same.
+
+    With ``linearize`` the result is also linearized, in the same pass.
+    """
+    require_pikepdf()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages:
+            page.contents_coalesce()
+            clean_content(page.Contents)
+            _strip_page_defaults(page)
+        for obj in pdf.objects:
+            if isinstance(obj, pikepdf.Stream) and obj.stream_dict.get('/Subtype') == '/Form':
+                clean_content(obj)
+                if '/Resources' in obj.stream_dict:
+                    _drop_procset(obj.stream_dict.Resources)
+        pdf.remove_unreferenced_resources()
+        merge_duplicates(pdf)
+        buffer = io.BytesIO()
+        # qpdf has no level per save, only a process-wide one: other users
+        # of pikepdf get theirs back
+        previous = pikepdf.settings.set_flate_compression_level(9)
+        try:
+            pdf.save(
+                buffer,
+                compress_streams=True,
+                recompress_flate=True,
+                stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                linearize=linearize,
+                deterministic_id=True,
+            )
+        finally:
+            pikepdf.settings.set_flate_compression_level(previous)
+    return buffer.getvalue()
+
+
+def check_profile(profile):
+    """Fail early, before any layout, on an unknown or unavailable profile."""
+    if profile not in PROFILES:
+        raise ValueError('unknown optimize profile %r' % (profile,))
+    require_pikepdf()
+
+
+def optimize(data, profile, linearize=False):
+    """Apply the output ``profile`` (one of ``PROFILES``) to the PDF ``data``."""
+    check_profile(profile)
+    return optimize_size(data, linearize=linearize)
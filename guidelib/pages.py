@@ -0,0 +1,178 @@
+"""Per-page content hashes and page-by-page comparison of two builds.
+
+A page hash covers what the page draws: its decoded content stream, its
+resources (fonts, forms with their own content, images), page boxes and
+annotations.  Object numbers, stream compression, object streams, dates
+and the document ID do not enter it, so a page drawn the same way hashes
+the same in a plain, incremental or linearized build.  The page numbers,
+in the footer and in the table of contents, are drawn as ``/PageNumber``
+marked content and left out, and references to other pages (link
+destinations) are hashed as the content of the page they point to: a
+page that only moves because pages were inserted before it keeps its
+hash, and is reported as moved.
+
+Comparing two builds needs no rasterizing; each side is a PDF, a
+``manifest.json`` written by the publish step, or a directory holding one:
+
+    python -m guidelib.pages old/manifest.json public/guides
+    python -m guidelib.pages old.pdf new.pdf
+"""
+
+import argparse
+import difflib
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+
+from .optimize import pikepdf, require_pikepdf
+
+# entries that point back up the page tree or otherwise outside the page
+SKIPPED_KEYS = ('/Parent', '/P', '/Length', '/Filter', '/DecodeParms', '/StructParents')
+# page numbers, see ``guidelib.chrome.page_number``
+PAGE_NUMBER = re.compile(rb'/PageNumber\s+BMC\b.*?\bEMC\b', re.S)
+
+
+def page_content(page):
+    """The content of ``page`` without its page numbers."""
+    contents = page.obj.get('/Contents')
+    streams = contents if isinstance(contents, pikepdf.Array) else [contents] if contents else []
+    return PAGE_NUMBER.sub(b'', b'\n'.join(s.read_bytes() for s in streams))
+
+
+class _PageHasher:
+    def __init__(self, pdf):
+        self.page_contents = {page.obj.objgen: hashlib.sha256(page_content(page)).digest()
+                              for page in pdf.pages}
+        self.memo = {}
+
+    def feed(self, digest, obj):
+        if isinstance(obj, pikepdf.Object) and obj.is_indirect:
+            if obj.objgen in self.page_contents:
+                digest.update(b'page ' + self.page_contents[obj.objgen])
+                return
+            if obj.objgen not in self.memo:
+                self.memo[obj.objgen] = None  # cycle guard
+                sub = hashlib.sha256()
+                self.feed_direct(sub, obj)
+                self.memo[obj.objgen] = sub.digest()
+            digest.update(self.memo[obj.objgen] or b'cycle')
+            return
+        self.feed_direct(digest, obj)
+
+    def feed_direct(self, digest, obj):
+        if isinstance(obj, pikepdf.Stream):
+            self.feed_direct(digest, obj.stream_dict)
+            digest.update(hashlib.sha256(obj.read_bytes()).digest())
+        elif isinstance(obj, pikepdf.Dictionary):
+            digest.update(b'<<')
+            for key in sorted(obj.keys()):
+                if key not in SKIPPED_KEYS:
+                    digest.update(key.encode('utf-8'))
+                    self.feed(digest, obj[key])
+            digest.update(b'>>')
+        elif isinstance(obj, pikepdf.Array):
+            digest.update(b'[')
+            for item in obj:
+                self.feed(digest, item)
+            digest.update(b']')
+        elif isinstance(obj, pikepdf.Object):
+            digest.update(obj.unparse())
+        else:
+            digest.update(repr(obj).encode('utf-8'))
+        digest.update(b' ')
+
+    def page(self, page):
+        digest = hashlib.sha256()
+        for key in ('/MediaBox', '/CropBox', '/Rotate', '/Resources', '/Annots'):
+            if key in page.obj:
+                digest.update(key.encode('ascii'))
+                self.feed(digest, page.obj[key])
+        digest.update(self.page_contents[page.obj.objgen])
+        return digest.hexdigest()
+
+
+def page_hashes(data):
+    """SHA-256 of every page of the PDF ``data``, in page order."""
+    require_pikepdf()
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        hasher = _PageHasher(pdf)
+        return [hasher.page(page) for page in pdf.pages]
+
+
+def _ranges(start, end):
+    if end - start == 1:
+        return 'page %d' % (start + 1)
+    return 'pages %d-%d' % (start + 1, end)
+
+
+def diff(old, new):
+    """Describe how the page hash lists ``old`` and ``new`` differ.
+
+    Returns a list of lines, empty when every page is the same.  Pages that
+    only shifted because pages were inserted or removed before them are
+    reported as moved rather than changed.
+    """
+    changes = []
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            if i1 != j1:
+                changes.append('%s moved to %s' % (_ranges(i1, i2), _ranges(j1, j2)))
+        elif tag == 'replace':
+            if i2 - i1 == j2 - j1 and i1 == j1:
+                changes.append('%s changed' % _ranges(j1, j2))
+            else:
+                changes.append('%s replaced by new %s' % (_ranges(i1, i2), _ranges(j1, j2)))
+        elif tag == 'delete':
+            changes.append('%s removed' % _ranges(i1, i2))
+        elif tag == 'insert':
+            changes.append('%s inserted' % _ranges(j1, j2))
+    return changes
+
+
+def _load(path):
+    """Page hash lists by guide name, from a PDF, a manifest or a directory."""
+    if os.path.isdir(path):
+        path = os.path.join(path, 'manifest.json')
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            guides = json.load(f)['guides']
+        return {name: entry.get('page_hashes') for name, entry in guides.items()}
+    with open(path, 'rb') as f:
+        return {os.path.basename(path): page_hashes(f.read())}
+
+
+def compare(old, new):
+    """Print the differences between two ``_load`` results; True if any."""
+    if len(old) == len(new) == 1 and set(old) != set(new):
+        # two single PDFs, whatever their names
+        old, new = {'': next(iter(old.values()))}, {'': next(iter(new.values()))}
+    changed = False
+    for name in sorted(set(old) | set(new)):
+        label = name + ': ' if name else ''
+        if name not in old or name not in new:
+            print(label + ('added' if name in new else 'removed'))
+            changed = True
+        elif old[name] is None or new[name] is None:
+            print(label + 'no page hashes recorded')
+            changed = True
+        else:
+            changes = diff(old[name], new[name])
+            print(label + ('; '.join(changes) if changes else 'unchanged'))
+            changed = changed or bool(changes)
+    return changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two guide builds page by page.')
+    parser.add_argument('old', help='PDF, manifest.json or output directory of the old build')
+    parser.add_argument('new', help='PDF, manifest.json or output directory of the new build')
+    args = parser.parse_args(argv)
+    return 1 if compare(_load(args.old), _load(args.new)) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
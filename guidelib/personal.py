@@ -0,0 +1,416 @@
+"""Personal collaborator guides, built in bulk from a roster.
+
+Every collaborator on the roster gets the collaborator guide in their
+language with their name and role on the cover and in every footer, and
+an appendix: the vehicle batches assigned to them and a copy of the
+14-step order workflow of ``make_status_table``.  The roster is a JSON
+list of collaborators or a CSV export with one row per assigned batch,
+see ``read_roster``:
+
+    python -m guidelib.personal roster.csv --out personal-guides/
+
+The guides are confidential, so they go to ``--out`` and never next to
+the public guides.
+
+A roster of thousands of collaborators is built by a pool of worker
+processes that stay warm from one guide to the next.  Before the pool
+starts, the first guide of every language is built on its own, which
+settles the section map and the line break cache of the personal
+edition in ``.guide-cache``; each worker then loads the guide scripts,
+registers their fonts and parses their stories once.  Later guides reuse
+the parsed fragments and cached line breaks of the static sections and
+a table of contents that is right on the first pass; only the appendix
+is new.  The run ends with the throughput and the median and 95th
+percentile time per guide.  Roster entries and guides that cannot be
+built are reported and skipped, and the run then exits with status 1.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import math
+import os
+import sys
+import time
+
+from reportlab.lib.colors import HexColor, white
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import PageBreak, Paragraph, Spacer, Table, TableStyle
+
+from .build import Edition, build_pdf, load_guide
+from .chrome import BORDER_COLOR
+from .cover import COD_GRAY
+from .fonts import markup
+from .fragments import InternedParagraph
+from .toc import slugify
+
+GUIDES = {
+    'fr': 'guide-collaborateur.py',
+    'en': 'guide-collaborateur-en.py',
+    'zh': 'guide-collaborateur-zh.py',
+}
+# columns of the vehicle_batches table a roster may give for a batch
+BATCH_FIELDS = ('title', 'source_country', 'available_quantity', 'total_quantity', 'status')
+BATCH_COLUMNS = (215, 80, 80, 90)
+LIGHT_BG = HexColor('#F8F8F8')
+# guides handed to a worker at a time
+CHUNK_SIZE = 4
+
+TEXT = {
+    'fr': {
+        'prepared': 'Prepare pour %s',
+        'heading': 'Votre affectation',
+        'batches': 'Vos lots',
+        'columns': ('Lot', 'Origine', 'Disponible', 'Statut'),
+        'no_batches': 'Aucun lot ne vous est attribue pour le moment.',
+        'workflow': 'Workflow des commandes',
+        'status': {'pending': 'En attente', 'approved': 'Approuve', 'rejected': 'Refuse',
+                   'sold_out': 'Epuise'},
+        'country': {'china': 'Chine', 'korea': 'Coree', 'dubai': 'Dubai'},
+    },
+    'en': {
+        'prepared': 'Prepared for %s',
+        'heading': 'Your Assignment',
+        'batches': 'Your batches',
+        'columns': ('Batch', 'Origin', 'Available', 'Status'),
+        'no_batches': 'No batches are assigned to you yet.',
+        'workflow': 'Order workflow',
+        'status': {'pending': 'Pending', 'approved': 'Approved', 'rejected': 'Rejected',
+                   'sold_out': 'Sold out'},
+        'country': {'china': 'China', 'korea': 'Korea', 'dubai': 'Dubai'},
+    },
+    'zh': {
+        'prepared': '\u4e13\u4e3a %s \u51c6\u5907',  # 专为 X 准备
+        'heading': '\u60a8\u7684\u5206\u5de5',  # 您的分工
+        'batches': '\u60a8\u7684\u6279\u6b21',  # 您的批次
+        # 批次, 来源, 可售, 状态
+        'columns': ('\u6279\u6b21', '\u6765\u6e90', '\u53ef\u552e', '\u72b6\u6001'),
+        # 目前没有分配给您的批次。
+        'no_batches': '\u76ee\u524d\u6ca1\u6709\u5206\u914d\u7ed9\u60a8\u7684\u6279\u6b21\u3002',
+        'workflow': '\u8ba2\u5355\u6d41\u7a0b',  # 订单流程
+        # 待审核, 已批准, 已拒绝, 已售罄
+        'status': {'pending': '\u5f85\u5ba1\u6838', 'approved': '\u5df2\u6279\u51c6',
+                   'rejected': '\u5df2\u62d2\u7edd', 'sold_out': '\u5df2\u552e\u7f44'},
+        # 中国, 韩国, 迪拜
+        'country': {'china': '\u4e2d\u56fd', 'korea': '\u97e9\u56fd', 'dubai': '\u8fea\u62dc'},
+    },
+}
+
+
+class PersonalEdition(Edition):
+    """A4 edition whose section map, with the appendix, is kept apart from the guide's."""
+
+    @property
+    def cache_key(self):
+        return super().cache_key + '-personal'
+
+
+EDITION = PersonalEdition('personal')
+
+
+class Collaborator:
+    """One roster entry: who the guide is for and the batches assigned to them.
+
+    ``batches`` are dictionaries of ``BATCH_FIELDS``, only ``title`` is
+    required.
+    """
+
+    def __init__(self, name, role='', language='fr', batches=(), id=None):
+        if language not in GUIDES:
+            raise ValueError('no collaborator guide in %r, use one of %s' % (language, ', '.join(GUIDES)))
+        self.name = name
+        self.role = role
+        self.language = language
+        self.batches = list(batches)
+        self.id = id
+
+    @property
+    def who(self):
+        """Name and role."""
+        return ' - '.join(filter(None, (self.name, self.role)))
+
+    @property
+    def label(self):
+        """The line stamped on the cover and the footers."""
+        return TEXT[self.language]['prepared'] % self.who
+
+
+class RecipientParagraph(Paragraph):
+    """Paragraph of the appendix that only some guides have.
+
+    Neither interned nor line break cached: it would only push the static
+    text out of the caches, and guides with and without it would rewrite
+    the line break cache in turn.
+    """
+
+
+class Failures(list):
+    """The entries left without a PDF, as ``(entry, reason)``, reported as they come."""
+
+    def add(self, entry, reason):
+        print('%s: %s, skipped' % (entry, reason), file=sys.stderr)
+        self.append((entry, reason))
+
+
+def _batch(value):
+    if isinstance(value, str):
+        return {'title': value}
+    return {field: value[field] for field in BATCH_FIELDS if value.get(field) not in (None, '')}
+
+
+def _skip(failures, entry, error):
+    if failures is None:
+        raise ValueError('%s: %s' % (entry, error)) from error
+    failures.add(entry, error)
+
+
+def _read_csv(path, failures):
+    collaborators = {}
+    failed = set()
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            key = row.get('id') or row.get('name')
+            if key in failed:
+                continue  # reported with its first row
+            try:
+                if not key:
+                    raise ValueError('no name')
+                if key not in collaborators:
+                    collaborators[key] = Collaborator(row.get('name') or '', row.get('role') or '',
+                                                      row.get('language') or 'fr', id=row.get('id') or None)
+            except ValueError as e:
+                failed.add(key)
+                _skip(failures, '%s, line %d' % (path, reader.line_num), e)
+                continue
+            batch = _batch({field: row.get('batch_' + field) for field in BATCH_FIELDS})
+            if batch:
+                collaborators[key].batches.append(batch)
+    return list(collaborators.values())
+
+
+def _entry_label(entry, index):
+    if isinstance(entry, dict) and (entry.get('id') or entry.get('name')):
+        return 'collaborator %s' % (entry.get('id') or entry.get('name'))
+    return 'collaborator #%d of the roster' % (index + 1)
+
+
+def _collaborator(entry):
+    if not isinstance(entry, dict):
+        raise ValueError('not a collaborator: %r' % (entry,))
+    if not entry.get('name'):
+        raise ValueError('no name')
+    batches = []
+    for batch in entry.get('batches') or ():
+        if not isinstance(batch, (str, dict)):
+            raise ValueError('not a batch: %r' % (batch,))
+        batches.append(_batch(batch))
+    return Collaborator(str(entry['name']), entry.get('role') or '', entry.get('language') or 'fr',
+                        batches, entry.get('id'))
+
+
+def read_roster(path, failures=None):
+    """Collaborators of the roster at ``path``.
+
+    A ``.json`` roster is a list, or a ``{"collaborators": [...]}``
+    object, of ``{"id", "name", "role", "language", "batches"}`` entries,
+    the batches as titles or objects with the ``vehicle_batches`` columns
+    of ``BATCH_FIELDS``.  A ``.csv`` roster has the columns ``id``,
+    ``name``, ``role`` and ``language`` and those fields prefixed with
+    ``batch_``, one row per batch; a collaborator's rows share their id,
+    or their name without one.  The language defaults to French.  Entries
+    that cannot be built, without a name or in a language with no guide,
+    are added to ``failures`` and skipped; without ``failures`` they raise
+    ``ValueError``.
+    """
+    if path.endswith('.csv'):
+        return _read_csv(path, failures)
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get('collaborators', [])
+    collaborators = []
+    for index, entry in enumerate(entries):
+        try:
+            collaborators.append(_collaborator(entry))
+        except ValueError as e:
+            _skip(failures, _entry_label(entry, index), e)
+    return collaborators
+
+
+def file_names(collaborators):
+    """A unique PDF file name per collaborator, from their name and id."""
+    used = set()
+    names = []
+    for collaborator in collaborators:
+        base = '-'.join(filter(None, (slugify(collaborator.name) or 'collaborator',
+                                      slugify(str(collaborator.id or '')))))
+        name, n = base, 1
+        while name in used:
+            n += 1
+            name = '%s-%d' % (base, n)
+        used.add(name)
+        names.append(name + '.pdf')
+    return names
+
+
+def batch_table(guide, collaborator):
+    """Table of the batches assigned to ``collaborator``."""
+    text = TEXT[collaborator.language]
+    styles = guide.styles
+    title_style = ParagraphStyle('batch_title', parent=styles['body'], fontSize=9, leading=12,
+                                 spaceBefore=0, spaceAfter=0)
+    rows = [list(text['columns'])]
+    for batch in collaborator.batches:
+        available, total = batch.get('available_quantity'), batch.get('total_quantity')
+        rows.append([
+            RecipientParagraph(markup(str(batch['title']), title_style.fontName), title_style),
+            text['country'].get(batch.get('source_country'), batch.get('source_country', '')),
+            ' / '.join(str(quantity) for quantity in (available, total) if quantity is not None),
+            text['status'].get(batch.get('status'), batch.get('status', '')),
+        ])
+    t = Table(rows, colWidths=BATCH_COLUMNS, repeatRows=1)
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), COD_GRAY),
+        ('TEXTCOLOR', (0, 0), (-1, 0), white),
+        ('FONTNAME', (0, 0), (-1, 0), styles['body_bold'].fontName),
+        ('FONTSIZE', (0, 0), (-1, 0), 9),
+        ('FONTNAME', (0, 1), (-1, -1), styles['body'].fontName),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('TEXTCOLOR', (0, 1), (-1, -1), HexColor('#333333')),
+        ('GRID', (0, 0), (-1, -1), 0.5, BORDER_COLOR),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white, LIGHT_BG]),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    return t
+
+
+def appendix(guide, collaborator):
+    """The flowables of the appendix of ``collaborator``, on pages of its own."""
+    text = TEXT[collaborator.language]
+    styles = guide.styles
+    # the name keeps it an outline heading
+    heading = ParagraphStyle('h2', parent=styles['h2'], keepWithNext=1)
+    font = styles['body'].fontName
+    who = markup(collaborator.name, font, bold=True)
+    if collaborator.role:
+        who += ' - %s' % markup(collaborator.role, font)
+    return [
+        PageBreak(),
+        # anchored: the heading has no Latin slug in Chinese
+        InternedParagraph('<a name="assignment"/>%s' % text['heading'], styles['h1']),
+        RecipientParagraph(who, styles['body']),
+        InternedParagraph(text['batches'], heading),
+        batch_table(guide, collaborator) if collaborator.batches
+        else RecipientParagraph(text['no_batches'], styles['body']),
+        Spacer(1, 6),
+        InternedParagraph(text['workflow'], heading),
+        guide.make_status_table(),
+    ]
+
+
+def recipient_canvas(canvasmaker, recipient):
+    """Wrap ``canvasmaker`` so the cover and the footers name ``recipient``."""
+    def make(*args, **kwargs):
+        canv = canvasmaker(*args, **kwargs)
+        canv.recipient = recipient
+        return canv
+    return make
+
+
+def build_personal(collaborator, output):
+    """Build the guide of ``collaborator`` to ``output``, a path or a binary stream."""
+    guide = load_guide(GUIDES[collaborator.language])
+    story = guide.build_story() + appendix(guide, collaborator)
+    return build_pdf(output, story, guide.draw_cover, guide.header_footer,
+                     recipient=collaborator.label, edition=EDITION)
+
+
+def _start_worker(languages):
+    """Load the guides of ``languages`` and parse their static text, once per worker."""
+    for language in languages:
+        load_guide(GUIDES[language]).build_story()
+
+
+def _timed_build(job):
+    """Seconds the guide of ``job`` took, or None and the reason it failed."""
+    collaborator, path = job
+    start = time.perf_counter()
+    try:
+        build_personal(collaborator, path)
+    except Exception as e:  # one collaborator must not stop the run over the whole roster
+        if os.path.exists(path):
+            os.remove(path)
+        return None, '%s: %s' % (type(e).__name__, e)
+    return time.perf_counter() - start, None
+
+
+def build_all(collaborators, directory, workers=None, failures=None):
+    """Build the guides of ``collaborators`` into ``directory``.
+
+    The collaborators whose guide fails are added to ``failures`` and
+    skipped.  Returns the seconds each guide built took, in roster order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    failures = Failures() if failures is None else failures
+    jobs = [(collaborator, os.path.join(directory, name))
+            for collaborator, name in zip(collaborators, file_names(collaborators))]
+    first = {}
+    for index, (collaborator, _) in enumerate(jobs):
+        first.setdefault(collaborator.language, index)
+    # the workers would all miss the shared caches of a cold start at once
+    results = {index: _timed_build(jobs[index]) for index in first.values()}
+    rest = [index for index in range(len(jobs)) if index not in results]
+    if rest:
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=_start_worker,
+                                                    initargs=(sorted(first),)) as pool:
+            results.update(zip(rest, pool.map(_timed_build, [jobs[index] for index in rest],
+                                              chunksize=CHUNK_SIZE)))
+    times = []
+    for index in range(len(jobs)):
+        seconds, error = results[index]
+        if error is None:
+            times.append(seconds)
+        else:
+            collaborator = jobs[index][0]
+            failures.add('collaborator %s' % (collaborator.id or collaborator.name), error)
+    return times
+
+
+def percentile(values, fraction):
+    """The smallest of ``values`` that ``fraction`` of them do not exceed."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build a personal collaborator guide for everyone on a roster.')
+    parser.add_argument('roster', help='JSON list of collaborators, or CSV export with one row per batch')
+    parser.add_argument('--out', required=True,
+                        help='output directory; the guides are confidential, keep it out of public/')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+    failures = Failures()
+    collaborators = read_roster(args.roster, failures)
+    if not collaborators and not failures:
+        parser.error('%s lists no collaborators' % args.roster)
+    start = time.perf_counter()
+    times = build_all(collaborators, args.out, args.workers, failures)
+    elapsed = time.perf_counter() - start
+    if times:
+        print('%d guides in %.1f s: %.1f guides/s, %.0f ms median and %.0f ms p95 per guide' % (
+            len(times), elapsed, len(times) / elapsed, 1000 * percentile(times, 0.5),
+            1000 * percentile(times, 0.95)), file=sys.stderr)
+    if failures:
+        print('%d skipped, see above' % len(failures), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
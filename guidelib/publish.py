@@ -0,0 +1,163 @@
+"""Static serving artifacts: precompressed variants and ``manifest.json``.
+
+Next.js serves ``public/guides`` as plain files.  Next to each guide PDF the
+publish step writes ``.br`` and ``.gz`` variants and records, in
+``manifest.json``, the size, page count and SHA-256 of every guide and of
+its variants, so the guides pages and the CDN can use precomputed ETags and
+encodings instead of hashing and compressing per request.  The manifest
+also keeps the hash of every page (``guidelib.pages``): a guide whose pages
+did not change is not rewritten, even when a build that is not
+reproducible gave it a new date and ``/ID``, and for the others the pages
+that changed are listed.
+
+Brotli needs the ``brotli`` package (``pip install brotli``) and page
+hashes need pikepdf; without them the ``.br`` variants or the page hashes
+are skipped.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+
+try:
+    import brotli
+except ImportError:  # optional, the .br variants are skipped without it
+    brotli = None
+
+from . import pages
+from .optimize import pikepdf
+
+MANIFEST_NAME = 'manifest.json'
+# a page tree node: a dictionary without nested dictionaries
+PAGE_TREE_NODE = re.compile(rb'<<([^<>]*/Type /Pages\b[^<>]*)>>')
+COUNT = re.compile(rb'/Count (\d+)')
+
+
+def page_count(data):
+    """Number of pages of the PDF ``data``.
+
+    The page tree root is read directly in ReportLab output; files whose
+    objects are compressed into object streams are opened with pikepdf.
+    """
+    counts = [int(m.group(1)) for node in PAGE_TREE_NODE.findall(data) for m in COUNT.finditer(node)]
+    if counts:
+        return max(counts)  # the root counts every page below it
+    if pikepdf is None:
+        raise RuntimeError('counting pages of a compressed PDF needs pikepdf: pip install pikepdf')
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def encodings(data):
+    """Precompressed variants of ``data``: content-coding -> (suffix, bytes)."""
+    # mtime=0 keeps the gzip header, and so the file, stable across builds
+    variants = {'gzip': ('.gz', gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants['br'] = ('.br', brotli.compress(data, quality=11))
+    return variants
+
+
+def publish_file(path, data):
+    """Write the guide ``data`` to ``path`` with its variants; return its manifest entry."""
+    with open(path, 'wb') as f:
+        f.write(data)
+    sha256 = digest(data)
+    entry = {
+        'size': len(data),
+        'pages': page_count(data),
+        'sha256': sha256,
+        'etag': '"%s"' % sha256,
+        'encodings': {},
+    }
+    if pikepdf is not None:
+        entry['page_hashes'] = pages.page_hashes(data)
+    variants = encodings(data)
+    written = {suffix for suffix, _ in variants.values()}
+    for suffix in ('.gz', '.br'):
+        # do not leave a variant of an older build behind
+        if suffix not in written and os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    for coding, (suffix, compressed) in sorted(variants.items()):
+        with open(path + suffix, 'wb') as f:
+            f.write(compressed)
+        entry['encodings'][coding] = {
+            'file': os.path.basename(path) + suffix,
+            'size': len(compressed),
+            'sha256': digest(compressed),
+        }
+    return entry
+
+
+def is_published(directory, name, entry, data):
+    """Whether ``data`` is already published as ``name`` with that manifest ``entry``.
+
+    A build that is not reproducible has a new creation date and ``/ID``
+    every time, so ``data`` is also published when its pages hash the same
+    as the entry's, page numbers aside.
+    """
+    if entry is None:
+        return False
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb') as f:
+        if digest(f.read()) != entry['sha256']:
+            return False
+    if entry['sha256'] == digest(data):
+        return True
+    return pikepdf is not None and 'page_hashes' in entry and pages.page_hashes(data) == entry['page_hashes']
+
+
+def read_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {'guides': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(directory, manifest):
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return path
+
+
+def publish(directory, builds):
+    """Publish the guides ``builds`` (name -> PDF bytes) into ``directory``.
+
+    Returns, per guide, None when it was already published unchanged and
+    skipped, otherwise the page changes against the previous manifest entry
+    (``['new guide']`` without one).  Entries of guides not rebuilt this
+    time are kept as they are.
+    """
+    if brotli is None:
+        print('brotli is not installed, skipping .br variants (pip install brotli)', file=sys.stderr)
+    if pikepdf is None:
+        print('pikepdf is not installed, skipping page hashes (pip install pikepdf)', file=sys.stderr)
+    manifest = read_manifest(directory)
+    changes = {}
+    for name, data in builds.items():
+        old = manifest['guides'].get(name)
+        if is_published(directory, name, old, data):
+            changes[name] = None
+            continue
+        entry = publish_file(os.path.join(directory, name), data)
+        if old is None:
+            changes[name] = ['new guide']
+        elif 'page_hashes' in old and 'page_hashes' in entry:
+            changes[name] = pages.diff(old['page_hashes'], entry['page_hashes']) or ['same pages, new bytes']
+        else:
+            changes[name] = ['rebuilt']
+        manifest['guides'][name] = entry
+    write_manifest(directory, manifest)
+    return changes
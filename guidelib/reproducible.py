@@ -0,0 +1,85 @@
+"""Reproducible builds: identical inputs give byte-identical PDFs.
+
+A reproducible build runs ReportLab in invariant mode, which pins the
+creation and modification dates (to ``SOURCE_DATE_EPOCH`` when set,
+otherwise 2000-01-01) and drops the per-object comments, and replaces the
+document ``/ID`` with a digest of the inputs: the guide script, the
+guidelib sources, the ReportLab version and the build options.  Object
+numbering follows the order the story creates objects in, and the qpdf
+rewrites derive their IDs from the content, so nothing else varies.
+
+``check`` builds guides in two fresh interpreters with different hash
+seeds and time zones and compares the bytes:
+
+    python build-guides.py --check-reproducible
+"""
+
+import glob
+import hashlib
+import inspect
+import os
+import subprocess
+import sys
+
+import reportlab
+from reportlab.pdfbase import pdfdoc
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# settings of the two check builds; anything leaking from the process into
+# the output makes them differ
+CHECK_ENVIRONMENTS = (
+    {'PYTHONHASHSEED': '1', 'TZ': 'UTC'},
+    {'PYTHONHASHSEED': '2', 'TZ': 'Asia/Shanghai'},
+)
+
+
+def input_digest(script, **options):
+    """Digest of everything a guide PDF is built from."""
+    digest = hashlib.sha256()
+    digest.update(reportlab.Version.encode('ascii'))
+    for path in [script] + sorted(glob.glob(os.path.join(PACKAGE_DIR, '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    digest.update(repr(sorted(options.items())).encode('utf-8'))
+    return digest.digest()
+
+
+def guide_digest(callback, **options):
+    """Input digest of the guide script that defines the page ``callback``."""
+    return input_digest(inspect.getsourcefile(callback), **options)
+
+
+def pinned_id(canvasmaker, digest):
+    """Wrap ``canvasmaker`` so the document ``/ID`` is derived from ``digest``."""
+    def make(*args, **kwargs):
+        canv = canvasmaker(*args, **kwargs)
+        fingerprint = pdfdoc.PDFText(digest[:16], enc='raw').format(pdfdoc.DummyDoc())
+        canv._doc._ID = b'\n[' + fingerprint + fingerprint + b']\n'
+        return canv
+    return make
+
+
+def check(scripts, build_argv=()):
+    """Build each guide twice in separate processes and compare the bytes.
+
+    Returns the names of the guides whose builds differ.
+    """
+    from .build import ROOT
+
+    differing = []
+    for script in scripts:
+        path = script if os.path.isabs(script) else os.path.join(ROOT, script)
+        outputs = []
+        for environment in CHECK_ENVIRONMENTS:
+            result = subprocess.run(
+                [sys.executable, path, '-o', '-', '--reproducible'] + list(build_argv),
+                env=dict(os.environ, **environment), stdout=subprocess.PIPE, check=True,
+            )
+            outputs.append(result.stdout)
+        same = outputs[0] == outputs[1]
+        print('%s %s %s' % ('OK  ' if same else 'DIFF', hashlib.sha256(outputs[0]).hexdigest()[:16],
+                            os.path.basename(path)))
+        if not same:
+            differing.append(os.path.basename(path))
+    return differing
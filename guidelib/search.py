@@ -0,0 +1,170 @@
+"""Prebuilt full-text search index of a guide.
+
+The text of a guide is taken from its story, not from the PDF, and cut
+into passages at every ``h1`` and ``h2`` heading.  Each passage records
+its named destination, its section and the page it starts on, so a hit
+links straight to ``guide.pdf#<destination>``.  The guides pages load the
+index of one guide and search it without opening the PDF:
+
+    {"guide": "Guide-Collaborateur-Driveby-Africa.pdf",
+     "passages": [["upload-documents", "upload-documents", 8, "6. Uploader des documents"], ...],
+     "terms": {"document": [5, 1, 2], ...}}
+
+``passages`` holds ``[destination, section, page, title]``; ``terms`` maps
+every token to the passages containing it, as the first passage number
+followed by the gaps between consecutive numbers.  Text and queries are
+tokenized the same way: NFKD with accents removed and lower case, Latin
+words of two characters or more and numbers, and overlapping character
+bigrams for Chinese (a lone character stays a unigram).
+
+    python -m guidelib.search public/guides/search/Guide-Admin-Driveby-Africa-ZH.json 车辆
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import unicodedata
+
+from reportlab.platypus import Paragraph, Table
+
+from .chrome import FramedBox, StepBadge
+
+VERSION = 1
+CJK = re.compile('[㐀-䶿一-鿿豈-﫿]+')
+WORD = re.compile('[a-z0-9]+')
+
+
+def search_path(directory, name):
+    """Path of the search index of the guide ``name`` written to ``directory``."""
+    return os.path.join(directory, 'search', os.path.splitext(name)[0] + '.json')
+
+
+def fold(text):
+    """Lower case ``text`` without accents; full-width forms become ASCII."""
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if unicodedata.category(char) != 'Mn').lower()
+
+
+def tokenize(text):
+    """Index tokens of ``text``, in order, repeats included."""
+    text = fold(text)
+    tokens = []
+    position = 0
+    for run in CJK.finditer(text):
+        tokens.extend(_words(text[position:run.start()]))
+        chars = run.group()
+        tokens.extend([chars] if len(chars) == 1 else [chars[i:i + 2] for i in range(len(chars) - 1)])
+        position = run.end()
+    tokens.extend(_words(text[position:]))
+    return tokens
+
+
+def _words(text):
+    return [word for word in WORD.findall(text) if len(word) > 1 or word.isdigit()]
+
+
+def flowable_text(flowable):
+    """Plain text of a story flowable, tables and boxes included."""
+    if isinstance(flowable, str):
+        return flowable
+    if isinstance(flowable, (list, tuple)):
+        return ' '.join(flowable_text(item) for item in flowable)
+    if isinstance(flowable, Paragraph):
+        return flowable.getPlainText()
+    if isinstance(flowable, Table):
+        return '\n'.join(' | '.join(filter(None, (flowable_text(cell) for cell in row)))
+                         for row in flowable._cellvalues)
+    if isinstance(flowable, FramedBox):
+        return flowable_text(flowable.content)
+    if isinstance(flowable, StepBadge):
+        return flowable.number
+    content = getattr(flowable, '_content', None)  # KeepTogether and other containers
+    return flowable_text(content) if content is not None else ''
+
+
+def passages(contents):
+    """``(section, blocks)`` for every heading of a ``guidelib.toc.ContentsLayout``.
+
+    The blocks are the non-empty texts of the flowables from the heading,
+    which is the first block, to the next ``h1`` or ``h2``.
+    """
+    found = []
+    for flowable in contents.flowables[contents.index + 1:]:
+        section = getattr(flowable, '_section', None)
+        if section is not None:
+            found.append((section, []))
+        text = flowable_text(flowable).strip() if found else ''
+        if text:
+            found[-1][1].append(text)
+    return found
+
+
+def build_index(name, contents):
+    """Search index of the guide ``name`` laid out with ``contents``."""
+    entries, terms = [], {}
+    parent = None
+    for number, (section, blocks) in enumerate(passages(contents)):
+        if not section.level:
+            parent = section.key
+        entries.append([section.key, parent, contents.heading_pages.get(section.key), section.label])
+        for token in set(tokenize(' '.join(blocks))):
+            terms.setdefault(token, []).append(number)
+    return {
+        'version': VERSION,
+        'guide': name,
+        'passages': entries,
+        'terms': {token: _gaps(numbers) for token, numbers in terms.items()},
+    }
+
+
+def _gaps(numbers):
+    return [numbers[0]] + [b - a for a, b in zip(numbers, numbers[1:])]
+
+
+def _numbers(gaps):
+    numbers, total = [], 0
+    for gap in gaps:
+        total += gap
+        numbers.append(total)
+    return numbers
+
+
+def write_index(path, contents):
+    """Write the search index to ``path``, named after its guide as ``search_path`` does."""
+    index = build_index(os.path.splitext(os.path.basename(path))[0] + '.pdf', contents)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        # compact: the index is downloaded by the guides pages
+        json.dump(index, f, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+    return index
+
+
+def search(index, query):
+    """Passages of ``index`` that contain every token of ``query``."""
+    tokens = set(tokenize(query))
+    if not tokens:
+        return []
+    matches = None
+    for token in tokens:
+        numbers = set(_numbers(index['terms'].get(token, [])))
+        matches = numbers if matches is None else matches & numbers
+    return [index['passages'][number] for number in sorted(matches)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Search a guide search index.')
+    parser.add_argument('index', help='search index written by build-guides.py --search')
+    parser.add_argument('query', nargs='+')
+    args = parser.parse_args(argv)
+    with open(args.index, encoding='utf-8') as f:
+        index = json.load(f)
+    hits = search(index, ' '.join(args.query))
+    for destination, _, page, title in hits:
+        print('page %-3s %s#%s  %s' % (page, index['guide'], destination, title))
+    return 0 if hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Standalone PDFs of the guide sections and their ``index.json``.
+
+Every ``h1`` section of a guide can also be laid out on its own, so the
+guides pages can open "4. Workflow des 14 etapes" without downloading the
+whole guide.  A section PDF has the header and footer of the guide, keeps
+the page numbers the section has in the guide, and has its own outline and
+named destinations.  The files and an ``index.json`` listing their slugs,
+titles and sizes go into ``sections/<guide>/`` next to the guide:
+
+    python build-guides.py --sections
+"""
+
+import json
+import os
+
+from .publish import page_count
+
+INDEX_NAME = 'index.json'
+
+
+def sections_dir(directory, name):
+    """Directory of the section PDFs of the guide ``name`` written to ``directory``."""
+    return os.path.join(directory, 'sections', os.path.splitext(name)[0])
+
+
+def read_index(directory):
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return {'sections': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_sections(directory, contents, build_section):
+    """Write every section of the ``guidelib.toc.ContentsLayout`` ``contents``.
+
+    ``build_section(section, story, first_page)`` returns the PDF bytes of
+    one section.  Section files of an earlier build that are no longer part
+    of the guide are removed.  Returns the index.
+    """
+    os.makedirs(directory, exist_ok=True)
+    old = read_index(directory)
+    index = {'sections': []}
+    for section, story in contents.section_stories():
+        first_page = contents.pages.get(section.key, 1)
+        data = build_section(section, story, first_page)
+        name = section.key + '.pdf'
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(data)
+        index['sections'].append({
+            'slug': section.key,
+            'number': section.number,
+            'title': section.label,
+            'file': name,
+            'size': len(data),
+            'pages': page_count(data),
+            'first_page': first_page,
+        })
+    written = {entry['file'] for entry in index['sections']}
+    for entry in old['sections']:
+        path = os.path.join(directory, entry['file'])
+        if entry['file'] not in written and os.path.exists(path):
+            os.remove(path)
+    with open(os.path.join(directory, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return index
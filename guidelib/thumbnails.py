@@ -0,0 +1,118 @@
+"""PNG and WebP thumbnails of the cover and the first pages of a guide.
+
+The guides pages show download cards; a thumbnail of the cover and of the
+first content pages lets them preview a guide without loading the PDF.
+The pages are rasterized from the PDF the build has just written, so the
+thumbnails are drawn by the same cover, chrome and story code as the
+guide itself.
+
+Every thumbnail is named after a digest of what its page draws: the page
+content stream, the forms and images it uses, its fonts and the
+thumbnail size.  A page that did not change keeps its file and is not
+rendered again, and the names change with the content, so the files can
+be served with long cache lifetimes.  The files and an ``index.json``
+listing them per page go into ``thumbnails/<guide>/`` next to the guide:
+
+    python build-guides.py --thumbnails
+
+PyMuPDF renders the pages and Pillow encodes WebP:
+``pip install pymupdf pillow``.
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import pymupdf
+except ImportError:  # optional, only needed for thumbnails
+    pymupdf = None
+
+INDEX_NAME = 'index.json'
+# the cover, the table of contents and the first section
+PAGES = 3
+WIDTH = 240
+FORMATS = ('png', 'webp')
+WEBP_QUALITY = 80
+
+
+def require_pymupdf():
+    if pymupdf is None:
+        raise RuntimeError('thumbnails need PyMuPDF: pip install pymupdf pillow')
+
+
+def thumbnails_dir(directory, name):
+    """Directory of the thumbnails of the guide ``name`` written to ``directory``."""
+    return os.path.join(directory, 'thumbnails', os.path.splitext(name)[0])
+
+
+def pdf_data(output):
+    """Bytes of the PDF written to ``output``, a path or an ``io.BytesIO``."""
+    if isinstance(output, str):
+        with open(output, 'rb') as f:
+            return f.read()
+    return output.getvalue()
+
+
+def page_digest(doc, page):
+    """Digest of everything ``page`` of the PyMuPDF ``doc`` draws, at ``WIDTH``."""
+    digest = hashlib.sha256(repr((WIDTH, WEBP_QUALITY, pymupdf.VersionBind, tuple(page.rect))).encode())
+    digest.update(page.read_contents())
+    for xref in sorted({item[0] for item in page.get_xobjects() + page.get_images()}):
+        digest.update(doc.xref_stream(xref) or b'')
+    # type, base font and encoding; object numbers and resource names vary with the build
+    digest.update(repr(sorted((font[2], font[3], font[5]) for font in page.get_fonts())).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def render(page, fmt):
+    """``page`` rasterized ``WIDTH`` pixels wide, encoded as ``fmt``."""
+    zoom = WIDTH / page.rect.width
+    pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+    if fmt == 'webp':
+        return pixmap.pil_tobytes(format='WEBP', quality=WEBP_QUALITY)
+    return pixmap.tobytes(fmt)
+
+
+def read_index(directory):
+    path = os.path.join(directory, INDEX_NAME)
+    if not os.path.exists(path):
+        return {'pages': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_thumbnails(directory, data, pages=PAGES):
+    """Write the thumbnails of the first ``pages`` pages of the PDF ``data``.
+
+    Thumbnails whose file already exists are kept; those of an earlier
+    build that are no longer used are removed.  Returns the index.
+    """
+    require_pymupdf()
+    os.makedirs(directory, exist_ok=True)
+    old = read_index(directory)
+    index = {'pages': []}
+    with pymupdf.open(stream=data, filetype='pdf') as doc:
+        for number in range(min(pages, doc.page_count)):
+            page = doc[number]
+            key = page_digest(doc, page)
+            zoom = WIDTH / page.rect.width
+            entry = {'page': number + 1, 'width': WIDTH, 'height': round(page.rect.height * zoom)}
+            for fmt in FORMATS:
+                name = '%s.%s' % (key, fmt)
+                path = os.path.join(directory, name)
+                if not os.path.exists(path):
+                    with open(path, 'wb') as f:
+                        f.write(render(page, fmt))
+                entry[fmt] = name
+            index['pages'].append(entry)
+    written = {entry[fmt] for entry in index['pages'] for fmt in FORMATS}
+    for entry in old['pages']:
+        for fmt in FORMATS:
+            name = entry.get(fmt)
+            if name and name not in written and os.path.exists(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+    with open(os.path.join(directory, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return index
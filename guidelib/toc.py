@@ -0,0 +1,304 @@
+"""Table of contents, outline and deep links built from the headings.
+
+``Contents`` marks where the table goes in a story.  Before layout the
+``h1`` headings that follow it become its entries and, with the ``h2``
+headings below them, the PDF outline.  Every heading gets a named
+destination, listed in the catalog ``/Dests`` so that viewers resolve
+``guide.pdf#upload-documents`` links.  A heading may set its slug with a
+leading ``<a name="upload-documents"/>``, which keeps it stable across
+editions and title edits; other slugs are derived from the title, ``h2``
+slugs prefixed with the slug of their section.
+
+The page numbers come from the section map of the previous build, kept in
+``.guide-cache``; the layout records where every ``h1`` actually lands
+and only when that differs from the map is the story laid out again.  A
+pass whose page numbers turn out wrong is dropped before its canvas is
+saved, so only correct output is ever written.
+"""
+
+import copy
+import json
+import os
+import re
+import sys
+import unicodedata
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.enums import TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfdoc
+from reportlab.platypus import Flowable, PageBreak, Paragraph, Table, TableStyle
+
+from .chrome import page_number
+from .fragments import InternedParagraph
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.guide-cache')
+# a table whose page numbers move its own sections cannot oscillate for long
+MAX_PASSES = 3
+PAGE_COLUMN = 36
+# room for "10." in bold beside the 10 pt indent and the cell padding
+CONTENTS_NUMBER_WIDTH = 40
+NUMBERED = re.compile(r'^\s*(\d+\.)\s+(.*)$', re.S)
+ANCHOR = re.compile(r'^\s*<a name="([^"]+)"\s*/>', re.I)
+# Latin letters that NFKD does not take apart into an ASCII letter and marks
+TRANSLITERATION = str.maketrans({
+    'Ł': 'L', 'ł': 'l', 'Đ': 'D', 'đ': 'd', 'Ð': 'D', 'ð': 'd', 'Ø': 'O', 'ø': 'o', 'Ħ': 'H', 'ħ': 'h',
+    'ı': 'i', 'ß': 'ss', 'Æ': 'AE', 'æ': 'ae', 'Œ': 'OE', 'œ': 'oe', 'Þ': 'Th', 'þ': 'th',
+})
+
+
+class StaleContents(Exception):
+    """Raised instead of saving a pass whose page numbers are out of date."""
+
+
+def slugify(text):
+    """ASCII slug of a heading, '' when it is not written in Latin script."""
+    text = unicodedata.normalize('NFKD', re.sub(r'<[^>]*>', '', text)).translate(TRANSLITERATION)
+    if any(unicodedata.category(char) == 'Lo' for char in text):
+        return ''
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+
+class Section:
+    """One heading: destination key, outline level, number and title."""
+
+    def __init__(self, key, level, number, title):
+        self.key = key
+        self.level = level
+        self.number = number
+        self.title = title
+
+    @property
+    def label(self):
+        """Plain text of the heading, for the outline."""
+        text = re.sub(r'<[^>]*>', '', ' '.join(filter(None, (self.number, self.title))))
+        return text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+
+
+class PageNumberParagraph(InternedParagraph):
+    """Page number of a contents row, drawn as a page number for the page hashes."""
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        with page_number(canvas):
+            super().drawOn(canvas, x, y, _sW)
+
+
+class ContentsRow(Table):
+    """Table row of the contents, one link to its section over the whole row."""
+
+    def __init__(self, key, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.key = key
+
+    def draw(self):
+        super().draw()
+        self.canv.linkRect('', self.key, (0, 0, self._width, self._height), relative=1)
+
+
+class Contents(Flowable):
+    """Placeholder for the table of contents of a guide.
+
+    Replaced before layout by one row per following heading of the first
+    of ``heading_styles``: the number, the linked title and the page
+    number.  Headings of all ``heading_styles`` go into the outline, one
+    level per style.  ``col_widths`` are the number and title column
+    widths, the page number column is taken from the title column.
+    """
+
+    def __init__(self, style, number_color, col_widths, heading_styles=('h1', 'h2')):
+        super().__init__()
+        self.style = style
+        self.number_color = number_color
+        self.col_widths = col_widths
+        self.heading_styles = heading_styles
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        pass
+
+    def rows(self, sections, pages):
+        number_style = ParagraphStyle('toc_num', parent=self.style, textColor=self.number_color)
+        page_style = ParagraphStyle('toc_page', parent=self.style, alignment=TA_RIGHT, leftIndent=0)
+        number_width, title_width = self.col_widths
+        rows = []
+        for section in sections:
+            if section.level:
+                continue
+            page = pages.get(section.key)
+            table = ContentsRow(section.key, [[
+                InternedParagraph('<b>%s</b>' % section.number, number_style),
+                InternedParagraph(section.title, self.style),
+                PageNumberParagraph(str(page or ''), page_style),
+            ]], colWidths=[number_width, title_width - PAGE_COLUMN, PAGE_COLUMN])
+            table.setStyle(TableStyle([
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+                ('TOPPADDING', (0, 0), (-1, -1), 2),
+                ('LINEBELOW', (0, 0), (-1, -1), 0.3, HexColor('#EEEEEE')),
+            ]))
+            rows.append(table)
+        return rows
+
+
+class ContentsLayout:
+    """Section map bookkeeping for one guide build.
+
+    ``story()`` gives the flowables of a pass with the current page numbers,
+    ``record`` is the document's ``afterFlowable`` hook and ``guard`` wraps
+    the canvas maker so a stale pass is not saved.
+    """
+
+    def __init__(self, story, index, cache_name):
+        self.contents = story[index]
+        self.index = index
+        self.cache_path = os.path.join(CACHE_DIR, cache_name + '.toc.json')
+        self.sections = []
+        self.flowables = list(story)
+        styles = self.contents.heading_styles
+        used = set()
+        parent, ordinal = '', 0
+        for i in range(index + 1, len(story)):
+            flowable = story[i]
+            if not (isinstance(flowable, Paragraph) and flowable.style.name in styles):
+                continue
+            level = styles.index(flowable.style.name)
+            anchor = ANCHOR.match(flowable.text)
+            text = flowable.text[anchor.end():] if anchor else flowable.text
+            match = NUMBERED.match(text)
+            number, title = match.groups() if match else ('', text)
+            ordinal = 0 if level == 0 else ordinal + 1
+            if anchor:
+                key = base = anchor.group(1)
+            elif level == 0:
+                key = base = slugify(title) or 'section-%s' % (number.rstrip('.') or len(self.sections) + 1)
+            else:
+                key = base = '%s-%s' % (parent or 'section', slugify(title) or ordinal)
+            n = 1
+            while key in used:
+                n += 1
+                key = '%s-%d' % (base, n)
+            used.add(key)
+            if level == 0:
+                parent = key
+            self.sections.append(Section(key, level, number, title))
+            heading = InternedParagraph('<a name="%s"/>%s' % (key, text), flowable.style)
+            heading._section = self.sections[-1]
+            self.flowables[i] = heading
+        self.pages = self.load()
+        self.recorded = {}
+        # page of every heading, h2 included, in the last pass
+        self.heading_pages = {}
+        self.passes = 0
+
+    @classmethod
+    def find(cls, story, cache_name):
+        """The layout of the first ``Contents`` in ``story``, or None."""
+        for index, flowable in enumerate(story):
+            if isinstance(flowable, Contents):
+                return cls(story, index, cache_name)
+        return None
+
+    def load(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cached.get('sections') != self.entry_keys():
+            return {}
+        return cached['pages']
+
+    def entry_keys(self):
+        return [s.key for s in self.sections if not s.level]
+
+    def save(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # parallel builds of one guide share the file: never leave it half written
+        partial = '%s.%d' % (self.cache_path, os.getpid())
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({'sections': self.entry_keys(), 'pages': self.pages}, f, indent=1)
+        os.replace(partial, self.cache_path)
+
+    def story(self, fresh=True):
+        """Flowables of the next pass, the table filled with ``self.pages``.
+
+        A laid out flowable keeps state from its pass (split tables among
+        others), so every pass gets flowables of its own unless ``fresh``
+        is false, for a single pass that may use up the story.
+        """
+        self.passes += 1
+        self.recorded = {}
+        self.heading_pages = {}
+        clone = copy.deepcopy if fresh else list
+        flowables = clone(self.flowables[:self.index])
+        flowables += self.contents.rows(self.sections, self.pages)
+        flowables += clone(self.flowables[self.index + 1:])
+        return flowables
+
+    def section_stories(self):
+        """``(section, flowables)`` of every ``h1`` section, for standalone layout.
+
+        A section runs from its heading to the next one; the page breaks
+        that close it are left out.
+        """
+        starts = [i for i, flowable in enumerate(self.flowables)
+                  if getattr(flowable, '_section', None) is not None and not flowable._section.level]
+        for n, start in enumerate(starts):
+            end = starts[n + 1] if n + 1 < len(starts) else len(self.flowables)
+            flowables = self.flowables[start:end]
+            while flowables and isinstance(flowables[-1], PageBreak):
+                flowables = flowables[:-1]
+            yield self.flowables[start]._section, copy.deepcopy(flowables)
+
+    @property
+    def stale(self):
+        return self.recorded != self.pages
+
+    @property
+    def final(self):
+        """Whether this pass must be kept, right or not."""
+        return not self.stale or self.passes >= MAX_PASSES
+
+    def record(self, doc, flowable):
+        """Note the page of a heading and add its outline entry and named destination."""
+        section = getattr(flowable, '_section', None)
+        if section is None:
+            return
+        if not section.level:
+            self.recorded[section.key] = doc.page
+        self.heading_pages[section.key] = doc.page
+        canv = doc.canv
+        canv.addOutlineEntry(section.label, section.key, level=section.level, closed=section.level == 0)
+        catalog = canv._doc.Catalog
+        if getattr(catalog, 'Dests', None) is None:
+            catalog.Dests = pdfdoc.PDFDictionary()
+            canv.showOutline()
+        catalog.Dests[section.key] = canv._bookmarkReference(section.key)
+
+    def next_pass(self):
+        """Adopt the recorded map; True when another pass is needed."""
+        if not self.stale:
+            return False
+        if self.passes >= MAX_PASSES:
+            print('table of contents page numbers did not settle after %d passes' % self.passes,
+                  file=sys.stderr)
+            return False
+        self.pages = self.recorded
+        return True
+
+    def guard(self, canvasmaker):
+        """Wrap ``canvasmaker`` so a stale pass raises ``StaleContents`` instead of saving."""
+        def make(*args, **kwargs):
+            canv = canvasmaker(*args, **kwargs)
+            save = canv.save
+
+            def checked_save():
+                if not self.final:
+                    raise StaleContents()
+                save()
+            canv.save = checked_save
+            return canv
+        return make
@@ -0,0 +1,152 @@
+"""Incremental PDF output: finished pages are written as soon as they close.
+
+ReportLab keeps every page object and content stream in memory until
+``canvas.save()`` formats the whole document.  ``IncrementalCanvas`` writes
+each page, its content stream and its annotations to the output as soon as
+``showPage()`` returns.  Only the page tree, fonts, outlines and other
+document-level objects are kept until the end, where the remaining objects,
+the xref table and the trailer are appended.
+"""
+
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas as canvasmod
+
+# Objects that are complete once the page that created them is closed.
+# Anything else (page tree, font dictionary, catalog, outlines) can still
+# change and is only written when the document is saved.
+STREAMABLE = (
+    pdfdoc.PDFPage,
+    pdfdoc.PDFStream,
+    pdfdoc.PDFFormXObject,
+    pdfdoc.PDFImageXObject,
+    pdfdoc.Annotation,
+)
+
+
+class StreamingPDFDocument(pdfdoc.PDFDocument):
+    """PDFDocument that appends finished objects to a writable binary sink."""
+
+    def __init__(self, sink, **kwargs):
+        super().__init__(**kwargs)
+        if hasattr(sink, 'write'):
+            self._sink, self._owns_sink = sink, False
+        else:
+            self._sink, self._owns_sink = open(sink, 'wb'), True
+        self._offset = None
+        self._scanned = 0
+        self._pending = []
+
+    def _write(self, data):
+        if self._offset is None:
+            header = pdfdoc.PDFFile(self._pdfVersion).format(self)
+            self._sink.write(header)
+            self._offset = len(header)
+        self._sink.write(data)
+        position = self._offset
+        self._offset += len(data)
+        return position
+
+    def _write_object(self, name):
+        obj = self.idToObject[name]
+        try:
+            data = pdfdoc.PDFIndirectObject(name, obj).format(self)
+        except (KeyError, ValueError):
+            # forward reference (e.g. a link to a later bookmark): retry later
+            return False
+        self.idToOffset[name] = self._write(data)
+        if isinstance(obj, (pdfdoc.PDFPage, pdfdoc.PDFStream)):
+            # release the page and its content stream, the page tree only
+            # needs the reference from now on
+            if isinstance(obj, pdfdoc.PDFPage):
+                pages = self.Pages.pages
+                for i in range(len(pages) - 1, -1, -1):
+                    if pages[i] is obj:
+                        pages[i] = pdfdoc.PDFObjectReference(name)
+                        break
+            self.idToObject[name] = None
+        return True
+
+    def flush(self):
+        """Write every finished page-level object registered so far."""
+        progress = True
+        while progress:
+            progress = False
+            # writing a page registers its content stream, so rescan
+            while self._scanned < self.objectcounter:
+                self._scanned += 1
+                name = self.numberToId[self._scanned]
+                if isinstance(self.idToObject[name], STREAMABLE):
+                    self._pending.append(name)
+            pending, self._pending = self._pending, []
+            for name in pending:
+                if self._write_object(name):
+                    progress = True
+                else:
+                    self._pending.append(name)
+
+    def format(self):
+        """Write the remaining objects, the xref table and the trailer."""
+        if self.encrypt.info():
+            raise ValueError('incremental output does not support encryption')
+        self.encrypt.prepare(self)
+        catalog = self.Reference(self.Catalog)
+        info = self.Reference(self.info)
+        counter = 0
+        while counter < self.objectcounter:
+            counter += 1
+            name = self.numberToId[counter]
+            if name not in self.idToOffset:
+                data = pdfdoc.PDFIndirectObject(name, self.idToObject[name]).format(self)
+                self.idToOffset[name] = self._write(data)
+        ids = [self.numberToId[n] for n in range(1, counter + 1)]
+        xref = pdfdoc.PDFCrossReferenceTable()
+        xref.addsection(0, ids)
+        startxref = self._write(xref.format(self))
+        trailer = pdfdoc.PDFTrailer(
+            startxref=startxref, Size=counter + 1, Root=catalog, Info=info, ID=self.ID(),
+        )
+        self._write(trailer.format(self))
+        return b''
+
+    def SaveToFile(self, filename, canvas):
+        self.GetPDFData(canvas)
+        if self._owns_sink:
+            self._sink.close()
+        else:
+            getattr(self._sink, 'flush', lambda: None)()
+
+
+class IncrementalCanvas(canvasmod.Canvas):
+    """Canvas that streams each page to its output when the page closes.
+
+    Use it as the ``canvasmaker`` of ``doc.build``.  ``filename`` may be a
+    path or any object with a binary ``write`` method; the first bytes are
+    written as soon as the first page is finished.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        old = self._doc
+        self._doc = StreamingPDFDocument(
+            filename,
+            compression=old.compression,
+            invariant=old.invariant,
+            pdfVersion=old._pdfVersion,
+            lang=kwargs.get('lang'),
+        )
+        # the preamble registered the initial font on the discarded document
+        self._make_preamble()
+
+    def setEncrypt(self, encrypt):
+        if encrypt:
+            raise ValueError('incremental output does not support encryption')
+        super().setEncrypt(encrypt)
+
+    def showPage(self):
+        super().showPage()
+        self._doc.flush()
+
+    def getpdfdata(self):
+        # the pages are written and released as they close, nothing is left to return
+        raise TypeError('IncrementalCanvas streams the PDF to the file or stream it was made with, '
+                        'read the PDF from there')
@@ -0,0 +1,25 @@
+"""Guides rendered in memory with ``guidelib.render_bytes``."""
+
+import io
+import os
+
+import pikepdf
+
+import guidelib
+
+
+def test_render_bytes_writes_no_pdf(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    guide = guidelib.load_guide('guide-collaborateur-en.py')
+    published = os.path.join(guidelib.OUTPUT_DIR, guide.OUTPUT_NAME)
+    before = os.stat(published).st_mtime_ns if os.path.exists(published) else None
+
+    data = guidelib.render_bytes(guide)
+
+    after = os.stat(published).st_mtime_ns if os.path.exists(published) else None
+    assert after == before
+    assert os.listdir(tmp_path) == []
+    assert data.startswith(b'%PDF-')
+    assert data.rstrip().endswith(b'%%EOF')
+    with pikepdf.open(io.BytesIO(data)) as pdf:
+        assert len(pdf.pages) > 1
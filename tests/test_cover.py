@@ -0,0 +1,19 @@
+"""Text sizes on the cover, see ``guidelib.cover._fit``."""
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from guidelib.cover import _fit
+
+
+def test_short_text_keeps_its_size():
+    assert _fit('Guide', 'Helvetica', 16, 200) == 16
+
+
+def test_long_text_is_made_smaller():
+    size = _fit('Guide du collaborateur', 'Helvetica', 16, 100)
+    assert size < 16
+    assert abs(stringWidth('Guide du collaborateur', 'Helvetica', size) - 100) < 1e-6
+
+
+def test_empty_text():
+    assert _fit('', 'Helvetica', 16, 100) == 16
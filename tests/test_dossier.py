@@ -0,0 +1,58 @@
+"""Reading an order export, see ``guidelib.dossier``."""
+
+import io
+import json
+
+import pytest
+
+from guidelib import dossier
+
+ROWS = [{'order_number': 'DBA-%d' % n, 'status': 'shipping', 'customer_name': 'Client %d' % n}
+        for n in range(5)]
+
+
+@pytest.fixture
+def small_reads(monkeypatch):
+    # every value is split across several reads
+    monkeypatch.setattr(dossier, 'READ_SIZE', 7)
+
+
+def items(text):
+    return list(dossier._stream_items(io.StringIO(text), 'orders.json'))
+
+
+def test_array_split_across_reads(small_reads):
+    assert items(json.dumps(ROWS, indent=2)) == ROWS
+
+
+def test_json_lines_split_across_reads(small_reads):
+    assert items('\n'.join(json.dumps(row) for row in ROWS) + '\n') == ROWS
+
+
+def test_number_split_across_reads(small_reads):
+    assert items('[1234567890, 12]') == [1234567890, 12]
+
+
+def test_empty_export():
+    assert items('') == []
+    assert items('[]') == []
+
+
+def test_unclosed_array(small_reads):
+    with pytest.raises(ValueError, match='not closed'):
+        items(json.dumps(ROWS)[:-1])
+
+
+def test_value_cut_off(small_reads):
+    with pytest.raises(json.JSONDecodeError):
+        items(json.dumps(ROWS)[:-10])
+
+
+def test_bad_rows_are_reported_and_skipped(tmp_path):
+    export = tmp_path / 'orders.json'
+    export.write_text(json.dumps([ROWS[0], {'order_number': 'DBA-9', 'language': 'de'}, 'x', ROWS[1]]),
+                      encoding='utf-8')
+    failures = dossier.Failures()
+    orders = list(dossier.read_orders(str(export), failures=failures))
+    assert [order.number for order in orders] == ['DBA-0', 'DBA-1']
+    assert [entry for entry, _ in failures] == ['order DBA-9', 'order #3 of the export']
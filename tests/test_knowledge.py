@@ -0,0 +1,19 @@
+"""Changes between two knowledge base exports, see ``guidelib.knowledge.delta``."""
+
+from guidelib.knowledge import delta
+
+
+def chunk(key, sha256):
+    return {'id': key, 'sha256': sha256}
+
+
+def test_delta():
+    old = [chunk('login', '1'), chunk('orders', '2'), chunk('quotes', '3')]
+    new = [chunk('login', '1'), chunk('orders', '9'), chunk('batches', '4')]
+    assert delta(old, new) == {'added': ['batches'], 'changed': ['orders'], 'removed': ['quotes'],
+                               'unchanged': 1}
+
+
+def test_first_export_adds_every_chunk():
+    assert delta([], [chunk('login', '1')]) == {'added': ['login'], 'changed': [], 'removed': [],
+                                                'unchanged': 0}
@@ -0,0 +1,28 @@
+"""Table cells whose content runs out of its column, see ``guidelib.lint.cell_overflows``."""
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, Table
+
+from guidelib.lint import cell_overflows
+
+
+def laid_out(rows, widths):
+    table = Table(rows, colWidths=widths)
+    table.wrap(500, 500)
+    return table
+
+
+def test_fitting_cells():
+    assert list(cell_overflows(laid_out([['Etape', 'Documents'], ['1', 'Aucun']], [40, 80]))) == []
+
+
+def test_text_wider_than_its_column():
+    overflows = list(cell_overflows(laid_out([['Etape', 'Documentation'], ['1', 'Aucun']], [40, 40])))
+    assert [(row, column, text) for row, column, text, _ in overflows] == [(0, 1, 'Documentation')]
+    assert overflows[0][3] > 30
+
+
+def test_paragraph_with_a_word_that_cannot_wrap():
+    body = getSampleStyleSheet()['BodyText']
+    table = laid_out([[Paragraph('Voir inspection_sent', body), Paragraph('Aucun document', body)]], [60, 80])
+    assert [(row, column) for row, column, _, _ in cell_overflows(table)] == [(0, 0)]
@@ -0,0 +1,21 @@
+"""The size profile, see ``guidelib.optimize``."""
+
+import io
+
+import pikepdf
+
+import guidelib
+from guidelib.optimize import optimize_size
+
+
+def test_compression_level_is_restored():
+    data = guidelib.render_bytes(guidelib.load_guide('guide-admin.py'))
+    previous = pikepdf.settings.set_flate_compression_level(1)
+    try:
+        optimized = optimize_size(data)
+        assert pikepdf.settings.set_flate_compression_level(previous) == 1
+    finally:
+        pikepdf.settings.set_flate_compression_level(previous)
+    assert len(optimized) < len(data)
+    with pikepdf.open(io.BytesIO(data)) as original, pikepdf.open(io.BytesIO(optimized)) as pdf:
+        assert len(pdf.pages) == len(original.pages)
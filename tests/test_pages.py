@@ -0,0 +1,24 @@
+"""Page changes between two builds, see ``guidelib.pages.diff``."""
+
+from guidelib.pages import diff
+
+
+def test_same_pages():
+    assert diff(['a', 'b', 'c'], ['a', 'b', 'c']) == []
+
+
+def test_changed_page():
+    assert diff(['a', 'b', 'c', 'd'], ['a', 'b', 'x', 'd']) == ['page 3 changed']
+
+
+def test_inserted_page_moves_the_pages_after_it():
+    assert diff(['a', 'b', 'c', 'd'], ['a', 'b', 'x', 'c', 'd']) == [
+        'page 3 inserted', 'pages 3-4 moved to pages 4-5']
+
+
+def test_removed_page_moves_the_pages_after_it():
+    assert diff(['a', 'b', 'c', 'd'], ['a', 'c', 'd']) == ['page 2 removed', 'pages 3-4 moved to pages 2-3']
+
+
+def test_new_pages_in_place_of_others():
+    assert diff(['a', 'b', 'c'], ['a', 'x', 'y', 'z']) == ['pages 2-3 replaced by new pages 2-4']
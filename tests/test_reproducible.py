@@ -0,0 +1,14 @@
+"""The guides build to the same bytes in two fresh interpreters, see ``guidelib.reproducible``.
+
+    python -m pytest tests
+"""
+
+import pytest
+
+import guidelib
+from guidelib.reproducible import check
+
+
+@pytest.mark.parametrize('script', guidelib.GUIDE_SCRIPTS)
+def test_guide_is_reproducible(script):
+    assert check([script]) == []
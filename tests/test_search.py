@@ -0,0 +1,32 @@
+"""Tokens of the full-text search index, see ``guidelib.search``."""
+
+from guidelib.search import search, tokenize
+
+
+def test_latin_words_are_folded():
+    assert tokenize('Crème Brûlée, étape 2 a') == ['creme', 'brulee', 'etape', '2']
+
+
+def test_full_width_forms_become_ascii():
+    assert tokenize('ＡＢＣ１２') == ['abc12']
+
+
+def test_chinese_is_indexed_as_bigrams():
+    # 订单管理 (order management)
+    assert tokenize('订单管理') == ['订单', '单管', '管理']
+
+
+def test_single_chinese_character_and_mixed_scripts():
+    # 订单 Lot A 单
+    assert tokenize('订单 Lot A 单') == ['订单', 'lot', '单']
+
+
+def test_search_needs_every_token():
+    index = {
+        'passages': ['first', 'second'],
+        # the passage numbers of a term are stored as gaps
+        'terms': {'lot': [0, 1], '订单': [1]},
+    }
+    assert search(index, 'Lot') == ['first', 'second']
+    assert search(index, 'lot 订单') == ['second']
+    assert search(index, '') == []